@@ -0,0 +1,165 @@
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.api.doctors import service as doctors_service
+from app.config.imports import (
+    IMPORT_BATCH_SIZE,
+    IMPORT_JOB_STALE_SECONDS,
+    IMPORT_JOB_WORKERS,
+)
+from app.database import SessionLocal
+
+from . import models
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+class ImportCancelled(Exception):
+    """Raised between batches to stop a job whose cancellation was requested."""
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=IMPORT_JOB_WORKERS, thread_name_prefix="import-job"
+            )
+        return _executor
+
+
+def submit_import(
+    db: Session, file_path: str, batch_size: int = IMPORT_BATCH_SIZE
+) -> models.ImportJob:
+    """Record a new import job and start it on the job thread pool."""
+    job = models.ImportJob(
+        id=uuid.uuid4().hex,
+        file_path=file_path,
+        status=PENDING,
+        batch_size=batch_size,
+        errors=[],
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    _get_executor().submit(run_import_job, job.id)
+    return job
+
+
+def request_cancel(db: Session, job: models.ImportJob) -> models.ImportJob:
+    """
+    Ask a job to stop. A running job stops after its current batch; its
+    committed batches are kept and it can be resumed later.
+    """
+    job.cancel_requested = True
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def is_resumable(db: Session, job: models.ImportJob) -> bool:
+    """Whether the job stopped before finishing and can continue."""
+    if job.status in (FAILED, CANCELLED):
+        return True
+    if job.status not in (PENDING, RUNNING):
+        return False
+    # A job left running or pending by a worker that exited. updated_at is
+    # set by the database clock, so it's compared on that clock.
+    stale_before = func.now() - timedelta(seconds=IMPORT_JOB_STALE_SECONDS)  # pylint: disable=not-callable
+    stale = db.scalar(
+        select(models.ImportJob.id).where(
+            models.ImportJob.id == job.id, models.ImportJob.updated_at < stale_before
+        )
+    )
+    return stale is not None
+
+
+def resume(db: Session, job: models.ImportJob) -> models.ImportJob:
+    """Restart a stopped job from its last committed batch."""
+    job.status = PENDING
+    job.cancel_requested = False
+    db.commit()
+    db.refresh(job)
+    _get_executor().submit(run_import_job, job.id)
+    return job
+
+
+def run_import_job(job_id: str) -> None:
+    """
+    Run an import job to completion, checkpointing after every batch.
+
+    Progress is committed right after each batch's data, so a job that dies
+    between the two re-imports at most one batch on resume, which the upsert
+    makes harmless.
+    """
+    db = SessionLocal()
+    try:
+        job = db.get(models.ImportJob, job_id)
+        if job is None:
+            return
+        if job.cancel_requested:
+            job.status = CANCELLED
+            job.finished_at = datetime.utcnow()
+            db.commit()
+            return
+
+        job.status = RUNNING
+        job.started_at = job.started_at or datetime.utcnow()
+        job.finished_at = None
+        db.commit()
+
+        previous_seconds = job.run_seconds
+        run_started = time.perf_counter()
+
+        def on_batch(report: dict) -> None:
+            job.batches_done = report["batch"] + 1
+            job.rows_processed += report["rows"]
+            job.imported += report["imported"]
+            job.updated += report["updated"]
+            job.skipped += report["skipped"]
+            job.run_seconds = previous_seconds + time.perf_counter() - run_started
+            db.commit()
+            if job.cancel_requested:
+                raise ImportCancelled
+
+        try:
+            doctors_service.import_doctors(
+                db=db,
+                file_path=job.file_path,
+                batch_size=job.batch_size,
+                start_batch=job.batches_done,
+                on_batch=on_batch,
+            )
+            job.status = SUCCEEDED
+        except ImportCancelled:
+            job.status = CANCELLED
+        except Exception as e:
+            db.rollback()
+            logger.error("Import job %s failed: %s", job_id, e)
+            job.status = FAILED
+            job.errors = [*job.errors, str(e)]
+
+        job.run_seconds = previous_seconds + time.perf_counter() - run_started
+        job.finished_at = datetime.utcnow()
+        db.commit()
+    except Exception as e:
+        logger.error("Import job %s could not be updated: %s", job_id, e)
+    finally:
+        db.close()
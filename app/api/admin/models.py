@@ -0,0 +1,33 @@
+from sqlalchemy import JSON, Boolean, Column, DateTime, Float, Integer, String
+from sqlalchemy.sql import func  # pylint: disable=no-member
+
+from app.database import Base
+
+
+class ImportJob(Base):
+    __tablename__ = "import_jobs"
+
+    id = Column(String(32), primary_key=True)
+    file_path = Column(String, nullable=False)
+    status = Column(String, nullable=False, index=True)
+    batch_size = Column(Integer, nullable=False)
+    # Checkpoint: batches committed so far, where a resumed job restarts
+    batches_done = Column(Integer, nullable=False, default=0)
+    rows_processed = Column(Integer, nullable=False, default=0)
+    imported = Column(Integer, nullable=False, default=0)
+    updated = Column(Integer, nullable=False, default=0)
+    skipped = Column(Integer, nullable=False, default=0)
+    # Time spent importing, summed over every run of the job
+    run_seconds = Column(Float, nullable=False, default=0.0)
+    errors = Column(JSON, nullable=False, default=list)
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+    created_at = Column(DateTime, default=func.now())  # pylint: disable=not-callable
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())  # pylint: disable=not-callable
+
+    @property
+    def rows_per_second(self) -> float:
+        if not self.run_seconds:
+            return 0.0
+        return round(self.rows_processed / self.run_seconds, 1)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Header, Request
 from sqlalchemy.orm import Session
 
 from app.config.decorators import admin_rate_limit
@@ -9,7 +9,7 @@ from . import schemas, service
 router = APIRouter()
 
 
-@router.post("/import-doctors")
+@router.post("/import-doctors", response_model=schemas.ImportJob, status_code=202)
 @admin_rate_limit()
 def import_doctors(
     request: Request,
@@ -17,14 +17,68 @@ def import_doctors(
     db: Session = Depends(get_db),
 ):
     """
-    Import doctors from the JSON file.
+    Start importing doctors from the JSON file in the background.
 
+    Returns the import job; poll `GET /admin/jobs/{id}` for its progress.
     Requires admin password for authentication.
     """
     return service.import_doctors_from_file(
         db=db,
         file_path="doctor_data/merged_doctors_list_v2.json",
         admin_password=form_data.admin_password,
+        batch_size=form_data.batch_size,
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=schemas.ImportJob)
+@admin_rate_limit()
+def get_import_job(
+    request: Request,
+    job_id: str,
+    x_admin_password: str = Header(...),
+    db: Session = Depends(get_db),
+):
+    """
+    State, rows processed, rows per second and errors of an import job.
+
+    Requires the admin password in the `X-Admin-Password` header.
+    """
+    return service.get_import_job(db=db, job_id=job_id, admin_password=x_admin_password)
+
+
+@router.post("/jobs/{job_id}/cancel", response_model=schemas.ImportJob)
+@admin_rate_limit()
+def cancel_import_job(
+    request: Request,
+    job_id: str,
+    form_data: schemas.ImportJobRequest,
+    db: Session = Depends(get_db),
+):
+    """
+    Cancel an import job. It stops after the batch in progress.
+
+    Requires admin password for authentication.
+    """
+    return service.cancel_import_job(
+        db=db, job_id=job_id, admin_password=form_data.admin_password
+    )
+
+
+@router.post("/jobs/{job_id}/resume", response_model=schemas.ImportJob)
+@admin_rate_limit()
+def resume_import_job(
+    request: Request,
+    job_id: str,
+    form_data: schemas.ImportJobRequest,
+    db: Session = Depends(get_db),
+):
+    """
+    Resume a failed or cancelled import job from its last committed batch.
+
+    Requires admin password for authentication.
+    """
+    return service.resume_import_job(
+        db=db, job_id=job_id, admin_password=form_data.admin_password
     )
 
 
@@ -42,3 +96,64 @@ def reset_database(
     Requires admin password for authentication.
     """
     return service.reset_database_tables(db=db, admin_password=form_data.admin_password)
+
+
+@router.post("/reshuffle-doctors")
+@admin_rate_limit()
+def reshuffle_doctors(
+    request: Request,
+    form_data: schemas.ReshuffleDoctorsRequest,
+    db: Session = Depends(get_db),
+):
+    """
+    Re-roll the random order used by the doctor listing.
+
+    Requires admin password for authentication.
+    """
+    return service.reshuffle_doctors(db=db, admin_password=form_data.admin_password)
+
+
+@router.get("/specialty-cache")
+@admin_rate_limit()
+def get_specialty_cache_stats(request: Request, x_admin_password: str = Header(...)):
+    """
+    Hit/miss counters of the symptom -> specialty cache.
+
+    Requires the admin password in the `X-Admin-Password` header.
+    """
+    return service.get_specialty_cache_stats(admin_password=x_admin_password)
+
+
+@router.get("/db-pool")
+@admin_rate_limit()
+def get_db_pool_stats(request: Request, x_admin_password: str = Header(...)):
+    """
+    Connection pool saturation and checkout wait times, per database.
+
+    Requires the admin password in the `X-Admin-Password` header.
+    """
+    return service.get_db_pool_stats(admin_password=x_admin_password)
+
+
+@router.get("/password-hashing")
+@admin_rate_limit()
+def get_password_hashing_stats(request: Request, x_admin_password: str = Header(...)):
+    """
+    Password hashing pool usage and bcrypt timings, for tuning the cost factor.
+
+    Requires the admin password in the `X-Admin-Password` header.
+    """
+    return service.get_password_hashing_stats(admin_password=x_admin_password)
+
+
+@router.post("/specialty-cache/flush")
+@admin_rate_limit()
+def flush_specialty_cache(
+    request: Request, form_data: schemas.FlushSpecialtyCacheRequest
+):
+    """
+    Empty the symptom -> specialty cache.
+
+    Requires admin password for authentication.
+    """
+    return service.flush_specialty_cache(admin_password=form_data.admin_password)
@@ -1,3 +1,6 @@
+from datetime import datetime
+from typing import List, Optional
+
 from pydantic import BaseModel
 
 
@@ -10,6 +13,43 @@ class AdminAuth(BaseModel):
 class ImportDoctorsRequest(AdminAuth):
     """Request schema for importing doctors."""
 
+    batch_size: Optional[int] = None
+
+
+class ImportJobRequest(AdminAuth):
+    """Request schema for cancelling or resuming an import job."""
+
+
+class ImportJob(BaseModel):
+    """Status and progress of a background import job."""
+
+    id: str
+    status: str
+    file_path: str
+    batch_size: int
+    batches_done: int
+    rows_processed: int
+    imported: int
+    updated: int
+    skipped: int
+    rows_per_second: float
+    errors: List[str]
+    cancel_requested: bool
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
 
 class ResetDatabaseRequest(AdminAuth):
     """Request schema for resetting database."""
+
+
+class FlushSpecialtyCacheRequest(AdminAuth):
+    """Request schema for flushing the specialty match cache."""
+
+
+class ReshuffleDoctorsRequest(AdminAuth):
+    """Request schema for re-rolling the doctors' shuffle order."""
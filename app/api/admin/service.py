@@ -1,10 +1,18 @@
 import os
+from typing import Optional
 
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
-from app.database import Base, engine
+from app.api.auth.passwords import password_hasher
 from app.api.doctors import service as doctors_service
+from app.api.doctors.models import CatalogState
+from app.config.imports import IMPORT_BATCH_SIZE
+from app.database import Base, SessionLocal, engine, pool_status
+from app.response_cache import response_cache
+from app.specialty_cache import specialty_cache
+
+from . import jobs, models
 
 
 def verify_admin_password(password: str):
@@ -30,28 +38,96 @@ def verify_admin_password(password: str):
     return True
 
 
-def import_doctors_from_file(db: Session, file_path: str, admin_password: str):
+def import_doctors_from_file(
+    db: Session, file_path: str, admin_password: str, batch_size: Optional[int] = None
+):
     """
-    Import doctors from a JSON file.
+    Start a background job importing doctors from a JSON file.
 
     Args:
         db: Database session
         file_path: Path to the JSON file containing doctor data
         admin_password: Admin password for authentication
+        batch_size: Records written per batch; IMPORT_BATCH_SIZE when None
 
     Returns:
-        Dictionary with import results
+        The submitted import job
     """
     # Verify admin password
     verify_admin_password(admin_password)
 
+    if batch_size is not None and batch_size < 1:
+        raise HTTPException(status_code=400, detail="batch_size must be positive")
+
     try:
-        result = doctors_service.import_doctors(db=db, file_path=file_path)
-        return {"message": "Import completed successfully", **result}
+        return jobs.submit_import(
+            db=db, file_path=file_path, batch_size=batch_size or IMPORT_BATCH_SIZE
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
+def _get_import_job(db: Session, job_id: str) -> models.ImportJob:
+    job = db.get(models.ImportJob, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
+
+
+def get_import_job(db: Session, job_id: str, admin_password: str):
+    """
+    Report the state and progress of an import job.
+
+    Args:
+        db: Database session
+        job_id: Import job id
+        admin_password: Admin password for authentication
+
+    Returns:
+        The import job
+    """
+    verify_admin_password(admin_password)
+    return _get_import_job(db, job_id)
+
+
+def cancel_import_job(db: Session, job_id: str, admin_password: str):
+    """
+    Cancel an import job after its current batch.
+
+    Args:
+        db: Database session
+        job_id: Import job id
+        admin_password: Admin password for authentication
+
+    Returns:
+        The import job
+    """
+    verify_admin_password(admin_password)
+    job = _get_import_job(db, job_id)
+    if job.status not in (jobs.PENDING, jobs.RUNNING):
+        raise HTTPException(status_code=409, detail=f"Import job is {job.status}")
+    return jobs.request_cancel(db, job)
+
+
+def resume_import_job(db: Session, job_id: str, admin_password: str):
+    """
+    Resume a failed or cancelled import job from its last committed batch.
+
+    Args:
+        db: Database session
+        job_id: Import job id
+        admin_password: Admin password for authentication
+
+    Returns:
+        The import job
+    """
+    verify_admin_password(admin_password)
+    job = _get_import_job(db, job_id)
+    if not jobs.is_resumable(db, job):
+        raise HTTPException(status_code=409, detail=f"Import job is {job.status}")
+    return jobs.resume(db, job)
+
+
 def reset_database_tables(db: Session, admin_password: str):
     """
     Reset the database by dropping and recreating all tables.
@@ -77,10 +153,104 @@ def reset_database_tables(db: Session, admin_password: str):
         # Close the current session
         db.close()
 
-        # Drop and recreate all tables
-        Base.metadata.drop_all(bind=engine)
+        # Drop and recreate all tables. The catalog version survives so that
+        # it keeps increasing and ETags issued before the reset stay invalid.
+        tables = [
+            table
+            for table in Base.metadata.sorted_tables
+            if table.name != CatalogState.__tablename__
+        ]
+        Base.metadata.drop_all(bind=engine, tables=tables)
         Base.metadata.create_all(bind=engine)
 
+        with SessionLocal() as session:
+            doctors_service.bump_catalog_version(session)
+            session.commit()
+        response_cache.invalidate()
+
         return {"message": "Database reset successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
+
+
+def reshuffle_doctors(db: Session, admin_password: str):
+    """
+    Re-roll the persisted random order of the doctor listing.
+
+    Args:
+        db: Database session
+        admin_password: Admin password for authentication
+
+    Returns:
+        Dictionary with operation result
+    """
+    verify_admin_password(admin_password)
+
+    try:
+        reshuffled = doctors_service.reshuffle_doctors(db=db)
+        return {"message": "Doctors reshuffled", "reshuffled": reshuffled}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
+def get_specialty_cache_stats(admin_password: str):
+    """
+    Report hit/miss counters of the specialty match cache.
+
+    Args:
+        admin_password: Admin password for authentication
+
+    Returns:
+        Dictionary with per-tier cache statistics
+    """
+    verify_admin_password(admin_password)
+    return specialty_cache.stats()
+
+
+def get_db_pool_stats(admin_password: str):
+    """
+    Report saturation and checkout wait times of the database connection pools.
+
+    Args:
+        admin_password: Admin password for authentication
+
+    Returns:
+        Dictionary of pool statistics keyed by engine ("primary", "replica",
+        and their "_async" counterparts once used)
+    """
+    verify_admin_password(admin_password)
+    return pool_status()
+
+
+def get_password_hashing_stats(admin_password: str):
+    """
+    Report password hashing queue usage and bcrypt timings.
+
+    Args:
+        admin_password: Admin password for authentication
+
+    Returns:
+        Dictionary with pool size, in-flight and rejected counts, and average
+        and maximum milliseconds per hash and verify
+    """
+    verify_admin_password(admin_password)
+    return password_hasher.stats()
+
+
+def flush_specialty_cache(admin_password: str):
+    """
+    Empty the specialty match cache.
+
+    Args:
+        admin_password: Admin password for authentication
+
+    Returns:
+        Dictionary with operation result
+    """
+    verify_admin_password(admin_password)
+
+    try:
+        deleted = specialty_cache.flush()
+        return {"message": "Specialty cache flushed", "persistent_deleted": deleted}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
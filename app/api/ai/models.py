@@ -0,0 +1,14 @@
+from sqlalchemy import Column, DateTime, String
+from sqlalchemy.sql import func  # pylint: disable=no-member
+
+from app.database import Base
+
+
+class SpecialtyCacheEntry(Base):
+    __tablename__ = "specialty_cache"
+
+    query_key = Column(String(64), primary_key=True)
+    query = Column(String)
+    specialities = Column(String)
+    created_at = Column(DateTime, default=func.now())  # pylint: disable=not-callable
+    expires_at = Column(DateTime, index=True)
@@ -1,7 +1,13 @@
+from typing import Annotated, List
+
 from fastapi import APIRouter, HTTPException, Request
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.config.decorators import ai_rate_limit
+from app.config.specialty_matching import (
+    AI_BATCH_MAX_QUERIES,
+    AI_BATCH_MAX_QUERY_LENGTH,
+)
 
 from . import service
 
@@ -16,17 +22,55 @@ class SpecializationResponse(BaseModel):
     specializations: list[str]
 
 
+class BatchSpecializationRequest(BaseModel):
+    queries: List[
+        Annotated[str, Field(min_length=1, max_length=AI_BATCH_MAX_QUERY_LENGTH)]
+    ] = Field(min_length=1, max_length=AI_BATCH_MAX_QUERIES)
+
+
+class SpecializationMatch(BaseModel):
+    query: str
+    specializations: list[str]
+    # local, cache, shared, llm or fallback
+    source: str
+
+
+class BatchSpecializationResponse(BaseModel):
+    results: list[SpecializationMatch]
+
+
 @router.get("/match-specialization", response_model=SpecializationResponse)
 @ai_rate_limit()
-def get_matching_specialization(request: Request, query: str):
+async def get_matching_specialization(request: Request, query: str):
     """
     Match a user's health query to relevant medical specializations.
     """
     try:
-        specialization_str = service.match_specialization(query)
+        specialization_str = await service.match_specialization(query)
         specializations = [spec.strip() for spec in specialization_str.split(";")]
         return {"specializations": specializations}
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error matching specialization: {str(e)}"
         ) from e
+
+
+@router.post("/match-specialization/batch", response_model=BatchSpecializationResponse)
+@ai_rate_limit()
+async def match_specializations_batch(
+    request: Request, batch: BatchSpecializationRequest
+):
+    """
+    Match many health queries to medical specializations in one request.
+
+    Results are returned in query order. Duplicate queries are matched once,
+    and queries the offline classifier can't answer are sent to the LLM
+    together rather than one call each.
+    """
+    try:
+        results = await service.match_specializations_batch(batch.queries)
+        return {"results": results}
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error matching specialization: {str(e)}"
+        ) from e
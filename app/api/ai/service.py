@@ -1,26 +1,48 @@
-def match_specialization(query: str) -> str:
+from typing import List
+
+from app.symptoms_matcher import (
+    match_specialization_async,
+    match_specializations_batch_async,
+)
+
+
+async def match_specialization(query: str) -> str:
     """
     Match a user query to relevant medical specializations.
-    This is a placeholder implementation - replace with actual AI logic.
+
+    Answered by the offline classifier when it is confident (the same rule
+    as doctor search and the batch endpoint); other queries go through the
+    specialty cache and the LLM, falling back to "Internal Medicine".
 
     Args:
         query: User's health query or symptoms
 
     Returns:
-        Semicolon-separated list of specializations
+        Semicolon-separated list of specializations, best match first
+    """
+    return await match_specialization_async(query)
+
+
+async def match_specializations_batch(queries: List[str]) -> List[dict]:
+    """
+    Match several user queries to medical specializations at once.
+
+    Queries the offline classifier isn't confident about are answered from
+    the specialty cache or by the LLM, many queries per upstream call.
+
+    Args:
+        queries: User health queries; duplicates are matched once
+
+    Returns:
+        One dict per query, in order, with the query, its specializations
+        (best match first) and what answered it
     """
-    # Simple keyword matching for demonstration
-    query = query.lower()
-
-    if any(kw in query for kw in ["heart", "chest pain", "cardiac"]):
-        return "Cardiology"
-    elif any(kw in query for kw in ["skin", "rash", "acne"]):
-        return "Dermatology"
-    elif any(kw in query for kw in ["brain", "headache", "migraine"]):
-        return "Neurology"
-    elif any(kw in query for kw in ["bone", "joint", "fracture"]):
-        return "Orthopedics"
-    elif any(kw in query for kw in ["eye", "vision"]):
-        return "Ophthalmology"
-    else:
-        return "General Medicine"
+    matches = await match_specializations_batch_async(queries)
+    return [
+        {
+            "query": queries[i],
+            "specializations": [spec.strip() for spec in matched.split(";")],
+            "source": source,
+        }
+        for i, (matched, source) in enumerate(matches)
+    ]
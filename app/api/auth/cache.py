@@ -0,0 +1,65 @@
+import hashlib
+import time
+from typing import Optional
+
+from sqlalchemy import event, inspect
+
+from app.cache import LRUCache
+from app.config.auth import (
+    AUTH_TOKEN_CACHE_MAX_SIZE,
+    AUTH_USER_CACHE_MAX_SIZE,
+    AUTH_USER_CACHE_TTL_SECONDS,
+)
+
+from . import models
+
+# token hash -> email of a token whose signature and expiry were verified
+token_cache = LRUCache(maxsize=AUTH_TOKEN_CACHE_MAX_SIZE)
+# email -> detached ``models.User``; treat as read-only
+user_cache = LRUCache(maxsize=AUTH_USER_CACHE_MAX_SIZE, ttl=AUTH_USER_CACHE_TTL_SECONDS)
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def get_token_subject(token: str) -> Optional[str]:
+    """Return the email of a previously verified, unexpired token."""
+    return token_cache.get(_token_key(token))
+
+
+def set_token_subject(token: str, email: str, expires_at: Optional[float]) -> None:
+    """
+    Remember that ``token`` was verified for ``email``.
+
+    Args:
+        token: Encoded JWT
+        email: The token's subject
+        expires_at: The token's ``exp`` as a Unix timestamp; tokens without
+            one are cached for the user cache TTL
+    """
+    ttl = AUTH_USER_CACHE_TTL_SECONDS
+    if expires_at is not None:
+        ttl = expires_at - time.time()
+        if ttl <= 0:
+            return
+    token_cache.set(_token_key(token), email, ttl=ttl)
+
+
+def invalidate_user(email: Optional[str]) -> None:
+    """Drop a cached user so the next request reloads it."""
+    if email:
+        user_cache.delete(email)
+
+
+def _user_changed(mapper, connection, target: models.User) -> None:
+    # Covers the old email too when the update changed it
+    history = inspect(target).attrs.email.history
+    for email in (*history.deleted, target.email):
+        invalidate_user(email)
+
+
+# ORM updates and deletes invalidate at flush; bulk UPDATE statements bypass
+# these events and rely on the TTL
+event.listen(models.User, "after_update", _user_changed)
+event.listen(models.User, "after_delete", _user_changed)
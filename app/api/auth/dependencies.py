@@ -1,38 +1,52 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from slowapi.util import get_remote_address
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_db
-from . import models, schemas, service
+from app.database import get_async_db
+
+from . import cache, models, schemas, service
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
 async def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)
 ):
     """
     Dependency to get the current user from the token.
     This can be used to protect routes that require authentication.
+
+    Verified tokens and their users are cached (see ``cache``), so repeat
+    requests with the same token skip both JWT decoding and the database.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, service.SECRET_KEY, algorithms=[service.ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-        token_data = schemas.TokenData(email=email)
-    except JWTError as err:
-        raise credentials_exception from err
+    email = cache.get_token_subject(token)
+    if email is None:
+        try:
+            payload = jwt.decode(
+                token, service.SECRET_KEY, algorithms=[service.ALGORITHM]
+            )
+            email: str = payload.get("sub")
+            if email is None:
+                raise credentials_exception
+            token_data = schemas.TokenData(email=email)
+        except JWTError as err:
+            raise credentials_exception from err
+        email = token_data.email
+        cache.set_token_subject(token, email, payload.get("exp"))
 
-    user = service.get_user_by_email(db, email=token_data.email)
+    user = cache.user_cache.get(email)
     if user is None:
-        raise credentials_exception
+        user = await service.get_user_by_email_async(db, email=email)
+        if user is None:
+            raise credentials_exception
+        cache.user_cache.set(email, user)
     return user
 
 
@@ -45,3 +59,30 @@ async def get_active_user(current_user: models.User = Depends(get_current_user))
             status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user"
         )
     return current_user
+
+
+def rate_limit_key(request: Request) -> str:
+    """
+    Rate limit key for a request: the user for requests with a valid bearer
+    token, the client address otherwise.
+
+    Only the token's signature and expiry are checked (through the same
+    cache as ``get_current_user``); whether the user still exists or is
+    active is left to the route.
+    """
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        email = cache.get_token_subject(token)
+        if email is None:
+            try:
+                payload = jwt.decode(
+                    token, service.SECRET_KEY, algorithms=[service.ALGORITHM]
+                )
+            except JWTError:
+                payload = {}
+            email = payload.get("sub")
+            if email is not None:
+                cache.set_token_subject(token, email, payload.get("exp"))
+        if email is not None:
+            return f"user:{email}"
+    return get_remote_address(request)
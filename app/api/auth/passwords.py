@@ -0,0 +1,229 @@
+import asyncio
+import functools
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional, Tuple
+
+from app.config.auth import (
+    BCRYPT_ROUNDS,
+    PASSWORD_HASH_MAX_PENDING,
+    PASSWORD_HASH_WORKERS,
+)
+
+
+@functools.lru_cache(maxsize=None)
+def pwd_context():
+    """
+    Return the passlib context, importing passlib on first use.
+
+    Only the pool's processes hash, so the web process never loads it.
+    """
+    from passlib.context import CryptContext
+
+    # Hashes at any other cost factor are reported as needing an update, so a
+    # changed BCRYPT_ROUNDS is applied at each user's next login
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=BCRYPT_ROUNDS,
+        bcrypt__min_rounds=BCRYPT_ROUNDS,
+        bcrypt__max_rounds=BCRYPT_ROUNDS,
+    )
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the password hashing queue is full or its pool broke."""
+
+
+# Run in the pool's processes; they return their own CPU time so the metric
+# excludes time spent queueing
+
+
+def _hash(password: str) -> Tuple[str, float]:
+    started = time.perf_counter()
+    hashed = pwd_context().hash(password)
+    return hashed, time.perf_counter() - started
+
+
+def _verify_and_update(
+    password: str, hashed_password: str
+) -> Tuple[Tuple[bool, Optional[str]], float]:
+    started = time.perf_counter()
+    result = pwd_context().verify_and_update(password, hashed_password)
+    return result, time.perf_counter() - started
+
+
+class PasswordHasher:
+    """
+    Bounded process pool for bcrypt.
+
+    At most ``workers`` hashes run at once and at most ``max_pending`` more
+    wait for a process; further requests raise ``PasswordHasherBusy``
+    immediately instead of queueing. Per-operation timings are kept for
+    tuning the cost factor.
+    """
+
+    def __init__(
+        self,
+        workers: int = PASSWORD_HASH_WORKERS,
+        max_pending: int = PASSWORD_HASH_MAX_PENDING,
+    ):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.rejected = 0
+        self.timings = {
+            "hash": {"count": 0, "seconds": 0.0, "max_seconds": 0.0},
+            "verify": {"count": 0, "seconds": 0.0, "max_seconds": 0.0},
+        }
+
+    def _pool(self) -> ProcessPoolExecutor:
+        """Return the executor, starting one if needed; call under ``_lock``."""
+        if self._executor is None:
+            # spawn: forking a process that runs an event loop and holds
+            # database connections is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _discard(self, executor: ProcessPoolExecutor) -> None:
+        """
+        Drop a broken executor, so the next call starts a fresh pool.
+
+        A worker that dies (OOM kill, segfault) breaks the whole pool and
+        every later submit would fail.
+        """
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, operation: str, fn: Callable, *args) -> Future:
+        with self._lock:
+            if self._in_flight >= self.workers + self.max_pending:
+                self.rejected += 1
+                raise PasswordHasherBusy()
+            self._in_flight += 1
+            executor = self._pool()
+
+        outer: Future = Future()
+
+        def done(future: Future) -> None:
+            with self._lock:
+                self._in_flight -= 1
+            try:
+                result, seconds = future.result()
+            except BrokenProcessPool as e:
+                self._discard(executor)
+                # Not retried: this operation may be what killed the worker
+                if not outer.cancelled():
+                    outer.set_exception(PasswordHasherBusy(str(e)))
+                return
+            except BaseException as e:
+                if not outer.cancelled():
+                    outer.set_exception(e)
+                return
+            self._record(operation, seconds)
+            # The caller may have given up (e.g. the client disconnected)
+            if not outer.cancelled():
+                outer.set_result(result)
+
+        try:
+            try:
+                inner = executor.submit(fn, *args)
+            except BrokenProcessPool:
+                # Broken by an earlier operation; retry once on a fresh pool
+                self._discard(executor)
+                with self._lock:
+                    executor = self._pool()
+                inner = executor.submit(fn, *args)
+        except BrokenProcessPool as e:
+            with self._lock:
+                self._in_flight -= 1
+            self._discard(executor)
+            raise PasswordHasherBusy(str(e)) from e
+        except BaseException:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+        inner.add_done_callback(done)
+        return outer
+
+    def _record(self, operation: str, seconds: float) -> None:
+        with self._lock:
+            timing = self.timings[operation]
+            timing["count"] += 1
+            timing["seconds"] += seconds
+            timing["max_seconds"] = max(timing["max_seconds"], seconds)
+
+    def hash(self, password: str) -> str:
+        """Hash ``password``, blocking until done."""
+        return self._submit("hash", _hash, password).result()
+
+    def verify_and_update(
+        self, password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Verify ``password``, blocking until done.
+
+        Returns:
+            Whether it matches, and a new hash to store when the stored one
+            uses an outdated cost factor (None otherwise)
+        """
+        return self._submit(
+            "verify", _verify_and_update, password, hashed_password
+        ).result()
+
+    async def ahash(self, password: str) -> str:
+        """Async ``hash``; the event loop is free while bcrypt runs."""
+        return await asyncio.wrap_future(self._submit("hash", _hash, password))
+
+    async def averify_and_update(
+        self, password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        """Async ``verify_and_update``."""
+        return await asyncio.wrap_future(
+            self._submit("verify", _verify_and_update, password, hashed_password)
+        )
+
+    def shutdown(self) -> None:
+        """Stop the worker processes; they are restarted on next use."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        """Return queue usage and average/max seconds per operation."""
+        with self._lock:
+            timings = {
+                operation: {
+                    "count": timing["count"],
+                    "avg_ms": round(
+                        1000 * timing["seconds"] / timing["count"]
+                        if timing["count"]
+                        else 0.0,
+                        3,
+                    ),
+                    "max_ms": round(1000 * timing["max_seconds"], 3),
+                }
+                for operation, timing in self.timings.items()
+            }
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "in_flight": self._in_flight,
+                "rejected": self.rejected,
+                "bcrypt_rounds": BCRYPT_ROUNDS,
+                **timings,
+            }
+
+
+password_hasher = PasswordHasher()
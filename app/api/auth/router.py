@@ -2,10 +2,10 @@ from datetime import timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config.decorators import auth_rate_limit
-from app.database import get_db
+from app.database import get_async_db
 
 from . import schemas, service
 
@@ -15,8 +15,8 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 @router.post("/register", response_model=schemas.User, status_code=201)
 @auth_rate_limit()
-def register_user(
-    request: Request, user: schemas.UserCreate, db: Session = Depends(get_db)
+async def register_user(
+    request: Request, user: schemas.UserCreate, db: AsyncSession = Depends(get_async_db)
 ):
     """
     Register a new user.
@@ -25,15 +25,15 @@ def register_user(
     - **username**: Unique username
     - **password**: Password for authentication
     """
-    return service.create_user(db=db, user=user)
+    return await service.create_user_async(db=db, user=user)
 
 
 @router.post("/login", response_model=schemas.Token)
 @auth_rate_limit()
-def login_for_access_token(
+async def login_for_access_token(
     request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     OAuth2 compatible token login, get an access token for future requests.
@@ -41,7 +41,9 @@ def login_for_access_token(
     - **username**: Email address used for authentication
     - **password**: Password for authentication
     """
-    user = service.authenticate_user(db, form_data.username, form_data.password)
+    user = await service.authenticate_user_async(
+        db, form_data.username, form_data.password
+    )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -2,78 +2,83 @@ import os
 from datetime import datetime, timedelta
 from typing import Optional
 
-from dotenv import load_dotenv
 from fastapi import HTTPException
 from jose import jwt
-from passlib.context import CryptContext
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from . import models, schemas
-
-load_dotenv()
+from .passwords import PasswordHasherBusy, password_hasher
 
 # Security settings
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
-def verify_password(plain_password, hashed_password):
-    """Verify that the password matches the hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+BUSY_DETAIL = "Too many password operations in progress, retry shortly"
 
 
-def get_password_hash(password):
-    """Hash the password."""
-    return pwd_context.hash(password)
+def _busy() -> HTTPException:
+    return HTTPException(
+        status_code=503, detail=BUSY_DETAIL, headers={"Retry-After": "1"}
+    )
 
 
-def get_user_by_email(db: Session, email: str):
+async def get_user_by_email_async(db: AsyncSession, email: str):
     """Retrieve a user by email."""
-    return db.query(models.User).filter(models.User.email == email).first()
+    return await db.scalar(select(models.User).where(models.User.email == email))
 
 
-def get_user_by_username(db: Session, username: str):
+async def get_user_by_username_async(db: AsyncSession, username: str):
     """Retrieve a user by username."""
-    return db.query(models.User).filter(models.User.username == username).first()
+    return await db.scalar(select(models.User).where(models.User.username == username))
 
 
-def create_user(db: Session, user: schemas.UserCreate):
+async def create_user_async(db: AsyncSession, user: schemas.UserCreate):
     """Create a new user."""
     try:
         # Check if user with same email already exists
-        if get_user_by_email(db, user.email):
+        if await get_user_by_email_async(db, user.email):
             raise HTTPException(status_code=400, detail="Email already registered")
 
         # Check if user with same username already exists
-        if get_user_by_username(db, user.username):
+        if await get_user_by_username_async(db, user.username):
             raise HTTPException(status_code=400, detail="Username already taken")
 
-        # Create new user
-        hashed_password = get_password_hash(user.password)
+        try:
+            hashed_password = await password_hasher.ahash(user.password)
+        except PasswordHasherBusy as exc:
+            raise _busy() from exc
         db_user = models.User(
             email=user.email, username=user.username, hashed_password=hashed_password
         )
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        await db.commit()
+        await db.refresh(db_user)
         return db_user
     except IntegrityError as exc:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=400, detail="User already exists") from exc
 
 
-def authenticate_user(db: Session, email: str, password: str):
+async def authenticate_user_async(db: AsyncSession, email: str, password: str):
     """Authenticate a user by email and password."""
-    user = get_user_by_email(db, email)
+    user = await get_user_by_email_async(db, email)
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    try:
+        valid, new_hash = await password_hasher.averify_and_update(
+            password, user.hashed_password
+        )
+    except PasswordHasherBusy as exc:
+        raise _busy() from exc
+    if not valid:
         return False
+    if new_hash:
+        # Stored with an outdated cost factor; upgrade it transparently
+        user.hashed_password = new_hash
+        await db.commit()
     return user
 
 
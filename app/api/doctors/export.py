@@ -0,0 +1,96 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import AsyncIterator, Callable, Dict, Sequence
+
+from sqlalchemy.engine import Row
+
+from app.config.exports import EXPORT_CHUNK_BYTES
+
+from .schemas import ExportFormat
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv; charset=utf-8",
+}
+
+# Joins list columns (clinics, chambers) into one CSV field
+CSV_LIST_SEPARATOR = ";"
+
+
+def _plain(value):
+    if isinstance(value, datetime):
+        # Scrape dates are stored as timestamps but published as dates
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def _ndjson_encoder(columns: Sequence[str]) -> Callable[[Row], str]:
+    def encode(row: Row) -> str:
+        record = {name: _plain(row[i]) for i, name in enumerate(columns)}
+        return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+    return encode
+
+
+def _csv_encoder(columns: Sequence[str]) -> Callable[[Row], str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+
+    def encode(row: Row) -> str:
+        writer.writerow(
+            [
+                CSV_LIST_SEPARATOR.join(value)
+                if isinstance(value, list)
+                else _plain(value)
+                for value in row
+            ]
+        )
+        line = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return line
+
+    return encode
+
+
+_ENCODERS: Dict[ExportFormat, Callable[[Sequence[str]], Callable[[Row], str]]] = {
+    ExportFormat.ndjson: _ndjson_encoder,
+    ExportFormat.csv: _csv_encoder,
+}
+
+
+async def encode_rows(
+    rows: AsyncIterator[Row],
+    columns: Sequence[str],
+    export_format: ExportFormat,
+    chunk_bytes: int = EXPORT_CHUNK_BYTES,
+) -> AsyncIterator[bytes]:
+    """
+    Serialize ``rows`` one at a time into chunks of about ``chunk_bytes``.
+
+    The first chunk (the CSV header, or the first NDJSON record) is sent as
+    soon as it is ready, so clients see the response start immediately.
+    """
+    encode = _ENCODERS[export_format](columns)
+    parts = []
+    size = 0
+    first = True
+    if export_format == ExportFormat.csv:
+        parts.append(",".join(columns) + "\n")
+        size = len(parts[0])
+
+    async for row in rows:
+        line = encode(row)
+        parts.append(line)
+        size += len(line)
+        if first or size >= chunk_bytes:
+            yield "".join(parts).encode("utf-8")
+            parts = []
+            size = 0
+            first = False
+    if parts:
+        yield "".join(parts).encode("utf-8")
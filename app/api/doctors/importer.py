@@ -0,0 +1,194 @@
+import json
+from datetime import datetime
+from itertools import islice
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import literal_column
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.config.imports import IMPORT_MAX_ELEMENT_SIZE, IMPORT_READ_SIZE
+
+from . import models
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = "0123456789.eE+-"
+
+# Columns overwritten when an imported doctor already exists
+UPSERT_COLUMNS = (
+    "title",
+    "educational_degree",
+    "description",
+    "location",
+    "data_source",
+    "data_scrapped_at",
+    "clinics",
+    "chambers",
+)
+
+
+def iter_json_array(
+    file: IO[str],
+    read_size: int = IMPORT_READ_SIZE,
+    max_element_size: int = IMPORT_MAX_ELEMENT_SIZE,
+) -> Iterator[Any]:
+    """
+    Yield the elements of a top-level JSON array one at a time.
+
+    Only the element being parsed is held in memory, so the file can be far
+    larger than RAM.
+
+    Raises:
+        ValueError: if the file isn't a JSON array, or an element is
+            malformed or longer than ``max_element_size`` characters; the
+            message gives the character offset in the file
+    """
+    buffer = ""
+    position = 0
+    # Characters of the file before ``buffer``
+    consumed = 0
+    eof = False
+
+    def fill(size: int = read_size) -> bool:
+        """Append at least ``size`` characters, or what is left of the file."""
+        nonlocal buffer, position, consumed, eof
+        if eof:
+            return False
+        chunks = []
+        read = 0
+        while read < size:
+            chunk = file.read(max(size - read, read_size))
+            if not chunk:
+                eof = True
+                break
+            chunks.append(chunk)
+            read += len(chunk)
+        if not chunks:
+            return False
+        consumed += position
+        buffer = buffer[position:] + "".join(chunks)
+        position = 0
+        return True
+
+    def skip_whitespace() -> Optional[str]:
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in _WHITESPACE:
+                position += 1
+            if position < len(buffer):
+                return buffer[position]
+            if not fill():
+                return None
+
+    def error(message: str, offset: int) -> ValueError:
+        return ValueError(f"{message} at offset {consumed + offset}")
+
+    if skip_whitespace() != "[":
+        raise ValueError("Import file must contain a JSON array")
+    position += 1
+
+    expect_element = True
+    after_comma = False
+    while True:
+        char = skip_whitespace()
+        if char is None:
+            raise ValueError("Unexpected end of import file")
+        if char == "]":
+            if after_comma:
+                raise error("Unexpected ']' after ','", position)
+            return
+        if char == ",":
+            if expect_element:
+                raise error("Unexpected ','", position)
+            position += 1
+            expect_element = after_comma = True
+            continue
+        if not expect_element:
+            raise error("Expected ',' or ']'", position)
+
+        while True:
+            try:
+                element, end = _decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as exc:
+                # The element may continue in the next chunk. Reading as much
+                # again as is pending keeps re-decoding linear in its size.
+                pending = len(buffer) - position
+                if pending > max_element_size:
+                    raise error(
+                        f"Malformed or oversized element ({exc.msg})", position
+                    ) from exc
+                if not fill(max(pending, read_size)):
+                    raise error(f"Malformed element ({exc.msg})", exc.pos) from exc
+                continue
+            # A scalar running to the end of the buffer may be cut off ("23"
+            # of "234", "-1." of "-1.5"); read on until a character that
+            # can't continue it, or the end of the file
+            if (
+                isinstance(element, (dict, list, str))
+                or not all(c in _NUMBER_CHARS for c in buffer[end:])
+                or not fill()
+            ):
+                break
+        position = end
+        expect_element = after_comma = False
+        yield element
+
+
+def batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Split ``items`` into lists of at most ``size`` elements."""
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def normalize_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Map a scraped doctor record onto ``doctors`` columns.
+
+    Raises:
+        ValueError: if the record has no name or specialty
+    """
+    if not record.get("name") or not record.get("specialty"):
+        raise ValueError("Doctor record needs a name and a specialty")
+
+    scrapped_at = record.get("dataScrappedAt")
+    return {
+        "name": record["name"],
+        "title": record.get("title"),
+        "speciality": record["specialty"],
+        "educational_degree": record.get("educationalDegree"),
+        "description": record.get("description"),
+        "location": record.get("location"),
+        "data_source": record.get("dataSource"),
+        "data_scrapped_at": datetime.strptime(scrapped_at, "%Y-%m-%d")
+        if scrapped_at
+        else None,
+        "clinics": record.get("clinics") or [],
+        "chambers": record.get("chambers") or [],
+    }
+
+
+def unique_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Collapse rows repeating a (name, speciality) key, last one wins."""
+    return list({(row["name"], row["speciality"]): row for row in rows}.values())
+
+
+def upsert_doctors(db: Session, rows: List[Dict[str, Any]]) -> List[Tuple[int, bool]]:
+    """
+    Insert or update a batch of doctors in one statement, keyed on
+    (name, speciality).
+
+    Rows repeating a key within the batch are collapsed, last one wins, since
+    one statement can't update the same row twice.
+
+    Returns:
+        (doctor id, inserted) for every written row; inserted is False for
+        rows that updated an existing doctor
+    """
+    statement = insert(models.Doctor).values(unique_rows(rows))
+    statement = statement.on_conflict_do_update(
+        constraint="uq_doctors_name_speciality",
+        set_={column: statement.excluded[column] for column in UPSERT_COLUMNS},
+    ).returning(models.Doctor.id, literal_column("xmax = 0"))
+    return [(doctor_id, inserted) for doctor_id, inserted in db.execute(statement)]
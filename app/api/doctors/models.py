@@ -1,10 +1,61 @@
-from sqlalchemy import ARRAY, Column, DateTime, Integer, String
+import random
+
+from sqlalchemy import (
+    ARRAY,
+    BigInteger,
+    Column,
+    Computed,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Table,
+    UniqueConstraint,
+    text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
+from sqlalchemy.sql import func  # pylint: disable=no-member
 
 from app.database import Base
 
+# Weighted so that name hits rank above title, degree and bio hits
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(title, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(educational_degree, '')), 'C') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'D')"
+)
+
+doctor_specialities = Table(
+    "doctor_specialities",
+    Base.metadata,
+    Column(
+        "doctor_id",
+        Integer,
+        ForeignKey("doctors.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "speciality_id",
+        Integer,
+        ForeignKey("specialities.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Index("ix_doctor_specialities_speciality_id", "speciality_id", "doctor_id"),
+)
+
 
 class Doctor(Base):
     __tablename__ = "doctors"
+    __table_args__ = (
+        UniqueConstraint("name", "speciality", name="uq_doctors_name_speciality"),
+        Index("ix_doctors_random_key_id", "random_key", "id"),
+        Index("ix_doctors_name_id", "name", "id"),
+        Index("ix_doctors_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True)
@@ -18,3 +69,68 @@ class Doctor(Base):
     data_source = Column(String)
     clinics = Column(ARRAY(String))
     chambers = Column(ARRAY(String))
+    # Uniform [0, 1) sort key behind the stable shuffled listing
+    random_key = Column(
+        Float, nullable=False, default=random.random, server_default=text("random()")
+    )
+    # Only used for filtering and ranking, so never loaded with the row
+    search_vector = deferred(
+        Column(TSVECTOR, Computed(SEARCH_VECTOR_EXPRESSION, persisted=True))
+    )
+
+
+class Speciality(Base):
+    __tablename__ = "specialities"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, unique=True, nullable=False)
+
+
+class SpecialityAlias(Base):
+    """
+    Lowercase name that resolves to a speciality when filtering.
+
+    Every speciality is reachable by its own name and by any known speciality
+    name it contains, so "gastroenterology" resolves to both "Gastroenterology"
+    and "Gastroenterology & Hepatology".
+    """
+
+    __tablename__ = "speciality_aliases"
+
+    alias = Column(String, primary_key=True)
+    speciality_id = Column(
+        Integer, ForeignKey("specialities.id", ondelete="CASCADE"), primary_key=True
+    )
+
+
+class CatalogState(Base):
+    """
+    Single-row version counter of the doctor catalog.
+
+    Every write to doctors or their specialities bumps ``version`` in the same
+    transaction; cached listing responses are keyed on it.
+    """
+
+    __tablename__ = "catalog_state"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False, server_default=text("1"))
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())  # pylint: disable=not-callable
+
+
+class DoctorFacetCount(Base):
+    """
+    Number of doctors of a speciality having a facet value.
+
+    Kept up to date by every doctor write (see ``service.update_facet_counts``),
+    so facet counts are read without scanning doctors. Facets are
+    "speciality", "location", "clinics" and "chambers"; rows reaching zero
+    doctors are deleted.
+    """
+
+    __tablename__ = "doctor_facet_counts"
+
+    speciality = Column(String, primary_key=True)
+    facet = Column(String, primary_key=True)
+    value = Column(String, primary_key=True)
+    doctors = Column(Integer, nullable=False)
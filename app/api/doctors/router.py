@@ -1,45 +1,277 @@
+import secrets
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Request
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config.decorators import doctor_rate_limit
-from app.database import get_db
-from . import schemas, service
-from app.symptoms_matcher import match_specialization
+from app.database import async_read_session, get_async_db, get_async_read_db
+from app.response_cache import response_cache
+from app.specialty_cache import normalize_symptoms
+from app.symptoms_matcher import match_specialization_async
+
+from . import export, schemas, service
+from .snapshot import catalog_snapshot
 
 router = APIRouter()
 
 
+_doctor_page = TypeAdapter(schemas.DoctorPage)
+_doctor_facets = TypeAdapter(schemas.DoctorFacets)
+
+
+def _cached_response(request: Request, etag: str) -> Optional[Response]:
+    """Answer from the response cache: 304 on a matching ETag, else the body."""
+    headers = {"ETag": etag, "Cache-Control": response_cache.cache_control}
+    if response_cache.matches(etag, request.headers.get("if-none-match")):
+        response_cache.not_modified += 1
+        return Response(status_code=304, headers=headers)
+
+    cached = response_cache.get(etag)
+    if cached is None:
+        return None
+    body, extra_headers = cached
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={**extra_headers, **headers},
+    )
+
+
+def _cache_response(etag: str, body: bytes, extra_headers: dict) -> Response:
+    response_cache.set(etag, body, extra_headers)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={
+            **extra_headers,
+            "ETag": etag,
+            "Cache-Control": response_cache.cache_control,
+        },
+    )
+
+
 @router.get("/", response_model=List[schemas.Doctor])
 @doctor_rate_limit()
-def get_doctors(
+async def get_doctors(
     request: Request,
     skip: int = 0,
     limit: int = 100,
     search: Optional[str] = None,
-    db: Session = Depends(get_db),
+    seed: Optional[int] = None,
+    order: schemas.DoctorOrder = schemas.DoctorOrder.random,
+    cursor: Optional[str] = None,
+    clinic: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db),
 ):
     """
     Retrieve a randomized list of doctors with pagination support.
-    Optional search parameter to filter doctors by matching specializations.
+    Optional search parameter to filter doctors by matching specializations,
+    and `clinic` to keep only doctors practising at that clinic.
+
+    `fields` (comma-separated, e.g. `name,title,speciality`) returns only
+    those fields of each doctor, plus `id`; only their columns are read.
+
+    The order is fixed by `seed`: pass the `X-Shuffle-Seed` header returned
+    with the first page back as `seed` to get consistent, non-overlapping
+    pages. A new seed is generated when none is given. `order=name` or
+    `order=id` list doctors alphabetically or by id instead.
+
+    Full pages carry an `X-Next-Cursor` header; pass it back as `cursor`
+    (with the same `search`) to fetch the next page without `skip`. The
+    cursor carries its order and seed, which override `order` and `seed`;
+    responses echo them in `X-Listing-Order` and `X-Shuffle-Seed` (the
+    latter only for the random order).
+
+    Deterministic requests (a `seed`, `cursor` or non-random `order`) carry
+    an `ETag`; send it back in `If-None-Match` to get a 304 while the
+    catalog is unchanged.
     """
+    if cursor is not None:
+        order, cursor_seed, _ = service.parse_listing_cursor(cursor)
+        seed = cursor_seed
+    deterministic = (
+        seed is not None or cursor is not None or order != schemas.DoctorOrder.random
+    )
+    if seed is None and order == schemas.DoctorOrder.random:
+        seed = secrets.randbelow(2**31)
+    selected = service.parse_fields(fields)
+    listing_headers = {"X-Listing-Order": order.value}
+    if order == schemas.DoctorOrder.random:
+        listing_headers["X-Shuffle-Seed"] = str(seed)
+
+    version = etag = None
+    if deterministic:
+        version = await response_cache.aversion()
+        # A cursor fixes the order, seed and position by itself
+        params = {
+            "limit": limit,
+            "search": normalize_symptoms(search) if search else None,
+            "clinic": clinic,
+            "fields": None if fields is None else list(selected),
+        }
+        if cursor is not None:
+            params["cursor"] = cursor
+        else:
+            params.update(skip=skip, seed=seed, order=order.value)
+        etag = response_cache.etag(version, "/doctors/", params)
+        cached = _cached_response(request, etag)
+        if cached is not None:
+            cached.headers.update(listing_headers)
+            return cached
+
     specializations = None
     if search:
-        specializations = [
-            spec.strip() for spec in match_specialization(search).split(";")
-        ]
+        matched = await match_specialization_async(search)
+        specializations = [spec.strip() for spec in matched.split(";")]
+
+    listing = {
+        "skip": skip,
+        "limit": limit,
+        "specializations": specializations,
+        "seed": seed,
+        "order": order,
+        "cursor": cursor,
+        "clinic": clinic,
+        "fields": selected,
+    }
+    page = None
+    if catalog_snapshot.enabled:
+        if version is None:
+            version = await response_cache.aversion()
+        snapshot = await catalog_snapshot.acurrent(version)
+        if snapshot is not None:
+            page = snapshot.page(**listing)
+
+    if page is not None:
+        body, next_cursor = page
+    else:
+        rows, next_cursor = await service.get_doctors_async(db, **listing)
+        body = service.encode_doctor_rows(rows, selected)
+
+    extra_headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+    if etag is None:
+        listed = Response(
+            content=body, media_type="application/json", headers=extra_headers
+        )
+    else:
+        listed = _cache_response(etag, body, extra_headers)
+    listed.headers.update(listing_headers)
+    return listed
+
+
+@router.get("/search", response_model=schemas.DoctorPage)
+@doctor_rate_limit()
+async def search_doctors(
+    request: Request,
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    specialization: Optional[List[str]] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Full-text search over doctor name, title, degree and description.
 
-    doctors = service.get_doctors(
-        db=db, skip=skip, limit=limit, specializations=specializations
+    Results are ranked by relevance. Pass `next_cursor` back as `cursor` to
+    get the next page; `specialization` (repeatable) narrows the results.
+    Responses carry an `ETag` honoured through `If-None-Match`.
+    """
+    version = await response_cache.aversion()
+    params = {
+        "q": q,
+        "limit": limit,
+        "cursor": cursor,
+        "specialization": sorted(specialization) if specialization else None,
+    }
+    etag = response_cache.etag(version, "/doctors/search", params)
+    cached = _cached_response(request, etag)
+    if cached is not None:
+        return cached
+
+    doctors, next_cursor = await service.search_doctors_async(
+        db, q=q, limit=limit, cursor=cursor, specializations=specialization
+    )
+    page = _doctor_page.validate_python(
+        {"items": doctors, "next_cursor": next_cursor}, from_attributes=True
+    )
+    return _cache_response(etag, _doctor_page.dump_json(page), {})
+
+
+@router.get("/facets", response_model=schemas.DoctorFacets)
+@doctor_rate_limit()
+async def get_facets(
+    request: Request,
+    specialization: Optional[List[str]] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Count doctors per speciality, location, clinic and chamber.
+
+    Each facet lists its values with their number of doctors, most first; a
+    doctor counts towards every clinic and chamber it lists. `specialization`
+    (repeatable) counts only doctors with one of those specialties. Counts
+    are precomputed on every write, so this doesn't scan doctors. Responses
+    carry an `ETag` honoured through `If-None-Match`.
+    """
+    version = await response_cache.aversion()
+    params = {"specialization": sorted(specialization) if specialization else None}
+    etag = response_cache.etag(version, "/doctors/facets", params)
+    cached = _cached_response(request, etag)
+    if cached is not None:
+        return cached
+
+    facets = _doctor_facets.validate_python(
+        await service.get_facets_async(db, specializations=specialization)
+    )
+    return _cache_response(etag, _doctor_facets.dump_json(facets), {})
+
+
+@router.get("/export")
+@doctor_rate_limit()
+async def export_doctors(
+    request: Request,
+    export_format: schemas.ExportFormat = Query(
+        schemas.ExportFormat.ndjson, alias="format"
+    ),
+    specialization: Optional[List[str]] = Query(None),
+):
+    """
+    Stream the whole catalog, ordered by id, as NDJSON or CSV.
+
+    `specialization` (repeatable) keeps only doctors with one of those
+    specialties. Rows are read through a server-side cursor and written as
+    they are read, so any catalog size streams in constant memory. The
+    response is compressed as it streams when the client accepts br or gzip.
+    """
+
+    async def rows():
+        # Its own session: the request's dependencies are closed before the
+        # body is streamed
+        async with async_read_session() as db:
+            async for row in service.stream_doctors_async(
+                db, specializations=specialization
+            ):
+                yield row
+
+    return StreamingResponse(
+        export.encode_rows(rows(), service.EXPORT_COLUMNS, export_format),
+        media_type=export.MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="doctors.{export_format.value}"'
+        },
     )
-    return doctors
 
 
 @router.post("/", response_model=schemas.Doctor, status_code=201)
 @doctor_rate_limit()
-def create_doctor(
-    request: Request, doctor: schemas.DoctorCreate, db: Session = Depends(get_db)
+async def create_doctor(
+    request: Request,
+    doctor: schemas.DoctorCreate,
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Create a new doctor."""
-    return service.create_doctor(db=db, doctor=doctor)
+    return await service.create_doctor_async(db, doctor)
@@ -1,4 +1,5 @@
 from datetime import date
+from enum import Enum
 from typing import List, Optional
 
 from pydantic import BaseModel
@@ -26,3 +27,31 @@ class Doctor(DoctorBase):
 
     class Config:
         from_attributes = True
+
+
+class DoctorPage(BaseModel):
+    items: List[Doctor]
+    next_cursor: Optional[str] = None
+
+
+class DoctorOrder(str, Enum):
+    random = "random"
+    name = "name"
+    id = "id"
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+
+class DoctorFacets(BaseModel):
+    speciality: List[FacetCount]
+    location: List[FacetCount]
+    clinics: List[FacetCount]
+    chambers: List[FacetCount]
@@ -1,11 +1,404 @@
+import base64
+import binascii
 import json
-from datetime import datetime
-from typing import List, Optional
+import random
+import time
+from collections import Counter
+from typing import (
+    AsyncIterator,
+    Callable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from typing import Counter as TypingCounter
 
-from sqlalchemy import func, or_
+import orjson
+from fastapi import HTTPException
+from sqlalchemy import (
+    Date,
+    String,
+    and_,
+    cast,
+    column,
+    delete,
+    func,
+    or_,
+    select,
+    tuple_,
+    union,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION, insert
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from . import models, schemas
+from app.config.exports import EXPORT_BATCH_SIZE
+from app.config.imports import IMPORT_BATCH_SIZE
+from app.response_cache import CATALOG_STATE_ID, response_cache
+from app.symptoms_matcher import speciality_list
+
+from . import importer, models, schemas
+
+# Columns of an exported doctor, in output order
+EXPORT_COLUMNS = ("id", *schemas.DoctorBase.model_fields)
+# Fields of a listed doctor, in ``schemas.Doctor`` order
+DOCTOR_FIELDS = tuple(schemas.Doctor.model_fields)
+# Facets counted by ``get_facets``, in ``schemas.DoctorFacets`` order
+FACETS = tuple(schemas.DoctorFacets.model_fields)
+
+
+def _speciality_ids(specializations: List[str]):
+    """Select the ids of the specialities the given names resolve to."""
+    aliases = [spec.strip().lower() for spec in specializations if spec.strip()]
+    return select(models.SpecialityAlias.speciality_id).where(
+        models.SpecialityAlias.alias.in_(aliases)
+    )
+
+
+def speciality_filter(specializations: List[str]):
+    """
+    Filter doctors by any of the given specialty names.
+
+    Names resolve through ``speciality_aliases``, so a name also matches the
+    specialities containing it, and the lookup is an indexed ``IN`` on
+    ``doctor_specialities`` rather than a ``LIKE`` scan.
+    """
+    doctor_ids = select(models.doctor_specialities.c.doctor_id).where(
+        models.doctor_specialities.c.speciality_id.in_(_speciality_ids(specializations))
+    )
+    return models.Doctor.id.in_(doctor_ids)
+
+
+def sync_specialities(db: Session, doctor_ids: Optional[List[int]] = None) -> None:
+    """
+    Bring the normalized speciality tables in line with ``Doctor.speciality``.
+
+    Creates missing specialities, links doctors to their speciality (dropping
+    links left over from a changed speciality) and adds the aliases of new
+    specialities. Runs in the caller's transaction.
+
+    Args:
+        db: Database session
+        doctor_ids: Only sync these doctors, and only alias the specialities
+            they create; all doctors and every alias when None
+    """
+    Doctor, Speciality = models.Doctor, models.Speciality
+    links = models.doctor_specialities
+
+    doctor_scope = [Doctor.id.in_(doctor_ids)] if doctor_ids is not None else []
+    created = db.execute(
+        insert(Speciality)
+        .from_select(
+            ["name"],
+            select(Doctor.speciality)
+            .where(Doctor.speciality.isnot(None), *doctor_scope)
+            .distinct(),
+        )
+        .on_conflict_do_nothing(index_elements=["name"])
+        .returning(Speciality.id, Speciality.name)
+    ).all()
+
+    db.execute(
+        delete(links).where(
+            links.c.doctor_id == Doctor.id,
+            links.c.speciality_id == Speciality.id,
+            Speciality.name.is_distinct_from(Doctor.speciality),
+            *doctor_scope,
+        )
+    )
+    db.execute(
+        insert(links)
+        .from_select(
+            ["doctor_id", "speciality_id"],
+            select(Doctor.id, Speciality.id)
+            .join(Speciality, Speciality.name == Doctor.speciality)
+            .where(*doctor_scope),
+        )
+        .on_conflict_do_nothing()
+    )
+
+    if doctor_ids is not None and not created:
+        return
+
+    # Every known name aliases each speciality whose name contains it
+    known_names = union(
+        select(Speciality.name),
+        select(
+            values(column("name", String), name="known_names").data(
+                [(name,) for name in speciality_list]
+            )
+        ),
+    ).subquery()
+    alias = func.lower(known_names.c.name)
+    alias_scope = []
+    if doctor_ids is not None:
+        # Only pairs involving a new speciality, as alias or as aliased
+        alias_scope.append(
+            or_(
+                Speciality.id.in_([speciality_id for speciality_id, _ in created]),
+                alias.in_([name.lower() for _, name in created]),
+            )
+        )
+    db.execute(
+        insert(models.SpecialityAlias)
+        .from_select(
+            ["alias", "speciality_id"],
+            select(alias, Speciality.id)
+            .join(Speciality, func.strpos(func.lower(Speciality.name), alias) > 0)
+            .where(*alias_scope)
+            .distinct(),
+        )
+        .on_conflict_do_nothing()
+    )
+
+
+def bump_catalog_version(db: Session) -> None:
+    """
+    Bump the catalog version in the caller's transaction.
+
+    Cached listing responses are keyed on the version, so committing the bump
+    invalidates them; call ``response_cache.invalidate()`` after the commit
+    for this worker to see the new version immediately.
+    """
+    db.execute(
+        insert(models.CatalogState)
+        .values(id=CATALOG_STATE_ID, version=1)
+        .on_conflict_do_update(
+            index_elements=["id"],
+            set_={"version": models.CatalogState.version + 1, "updated_at": func.now()},
+        )
+    )
+
+
+def doctor_facets(doctors: Iterable[Mapping]) -> TypingCounter[Tuple[str, str, str]]:
+    """
+    Count the facet values of doctors given as column mappings.
+
+    Returns:
+        (speciality, facet, value) -> number of doctors; a doctor counts once
+        per distinct clinic and chamber, and blank values are not counted
+    """
+    counts: TypingCounter[Tuple[str, str, str]] = Counter()
+    for doctor in doctors:
+        speciality = doctor["speciality"]
+        counts[speciality, "speciality", speciality] += 1
+        if doctor["location"]:
+            counts[speciality, "location", doctor["location"]] += 1
+        for facet in ("clinics", "chambers"):
+            for value in dict.fromkeys(doctor[facet] or ()):
+                if value:
+                    counts[speciality, facet, value] += 1
+    return counts
+
+
+def locked_doctor_facets(
+    db: Session, keys: Sequence[Tuple[str, str]]
+) -> TypingCounter[Tuple[str, str, str]]:
+    """
+    Facet counts of the stored doctors with these (name, speciality) keys.
+
+    Their rows are locked until the caller's transaction ends, so the counts
+    stay what an upsert of the same keys replaces.
+    """
+    if not keys:
+        return Counter()
+    Doctor = models.Doctor
+    rows = db.execute(
+        select(Doctor.speciality, Doctor.location, Doctor.clinics, Doctor.chambers)
+        .where(tuple_(Doctor.name, Doctor.speciality).in_(keys))
+        .with_for_update()
+    )
+    return doctor_facets(rows.mappings())
+
+
+def update_facet_counts(
+    db: Session,
+    added: TypingCounter[Tuple[str, str, str]],
+    removed: TypingCounter[Tuple[str, str, str]] = None,
+) -> None:
+    """
+    Apply doctors' facet changes to ``doctor_facet_counts``.
+
+    Runs in the caller's transaction. Keys are written in sorted order, so
+    concurrent writers lock counter rows in the same order.
+
+    Args:
+        db: Database session
+        added: Facet counts (see ``doctor_facets``) of written doctors
+        removed: Facet counts the written doctors had before
+    """
+    delta = Counter(added)
+    delta.subtract(removed or {})
+    changes = sorted((key, count) for key, count in delta.items() if count)
+    if not changes:
+        return
+
+    counts = models.DoctorFacetCount
+    statement = insert(counts).values(
+        [
+            {"speciality": speciality, "facet": facet, "value": value, "doctors": n}
+            for (speciality, facet, value), n in changes
+        ]
+    )
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=["speciality", "facet", "value"],
+            set_={"doctors": counts.doctors + statement.excluded.doctors},
+        )
+    )
+    if any(count < 0 for _, count in changes):
+        db.execute(delete(counts).where(counts.doctors <= 0))
+
+
+def get_facets(db: Session, specializations: Optional[List[str]] = None) -> dict:
+    """
+    Count doctors per speciality, location, clinic and chamber.
+
+    Read from ``doctor_facet_counts``, so the cost grows with the number of
+    distinct values, not with the number of doctors.
+
+    Args:
+        db: Database session
+        specializations: Only count doctors with any of these specialities
+
+    Returns:
+        Facet name -> [{"value", "count"}], most doctors first
+    """
+    counts = models.DoctorFacetCount
+    total = func.sum(counts.doctors)
+    query = select(counts.facet, counts.value, total).group_by(
+        counts.facet, counts.value
+    )
+    if specializations:
+        query = query.where(
+            counts.speciality.in_(
+                select(models.Speciality.name).where(
+                    models.Speciality.id.in_(_speciality_ids(specializations))
+                )
+            )
+        )
+
+    facets = {facet: [] for facet in FACETS}
+    for facet, value, count in db.execute(
+        query.order_by(counts.facet, total.desc(), counts.value)
+    ):
+        facets[facet].append({"value": value, "count": count})
+    return facets
+
+
+def encode_cursor(values: list) -> str:
+    """Encode the sort key of the last row of a page as an opaque cursor."""
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    """Decode a cursor produced by ``encode_cursor``."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+    if not isinstance(values, list):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def shuffle_start(seed: int) -> float:
+    """Map a shuffle seed to the point in [0, 1) where its ordering starts."""
+    return random.Random(seed).random()
+
+
+def parse_listing_cursor(
+    cursor: str,
+) -> Tuple[schemas.DoctorOrder, Optional[int], list]:
+    """
+    Decode a ``get_doctors`` cursor.
+
+    Returns:
+        The order and seed the cursor was issued for (the seed is None for
+        non-random orders) and the sort key of the last row. Random-order
+        keys are [segment, random_key, id]; segment 1 is the wrapped-around
+        part of the rotation.
+    """
+    values = decode_cursor(cursor)
+    try:
+        order = schemas.DoctorOrder(values[0])
+        if order != schemas.DoctorOrder.random:
+            after = values[1:]
+            if len(after) != len(_sort_columns(order)):
+                raise ValueError(after)
+            return order, None, after
+        seed, segment = int(values[1]), int(values[2])
+        after = [segment, float(values[3]), int(values[4])]
+        if segment not in (0, 1) or len(values) != 5:
+            raise ValueError(values)
+        return order, seed, after
+    except (IndexError, TypeError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+def parse_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    """
+    Parse a comma-separated sparse fieldset such as ``name,title,speciality``.
+
+    Returns:
+        The fields in ``schemas.Doctor`` order, always including ``id``;
+        every field when ``fields`` is empty
+    """
+    if not fields:
+        return DOCTOR_FIELDS
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested.difference(DOCTOR_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+        )
+    requested.add("id")
+    return tuple(name for name in DOCTOR_FIELDS if name in requested)
+
+
+def _field_column(name: str):
+    column = getattr(models.Doctor, name)
+    if name == "data_scrapped_at":
+        # Stored as a timestamp, listed as a date
+        return cast(column, Date).label(name)
+    return column
+
+
+def encode_doctor_rows(rows: Sequence, fields: Sequence[str]) -> bytes:
+    """
+    Encode ``get_doctors`` rows fetched with ``fields`` as a JSON array.
+
+    Objects are built straight from the row tuples, whose first columns are
+    ``fields``; the output matches ``schemas.Doctor`` restricted to them.
+    """
+    return orjson.dumps(
+        [{name: row[i] for i, name in enumerate(fields)} for row in rows]
+    )
+
+
+def _sort_columns(order: schemas.DoctorOrder) -> tuple:
+    if order == schemas.DoctorOrder.name:
+        return (models.Doctor.name, models.Doctor.id)
+    if order == schemas.DoctorOrder.id:
+        return (models.Doctor.id,)
+    return (models.Doctor.random_key, models.Doctor.id)
+
+
+def _seek(query, columns: tuple, after: Optional[list]):
+    """Order ``query`` by ``columns``, starting after the row keyed ``after``."""
+    if after is not None:
+        query = query.filter(tuple_(*columns) > tuple_(*after))
+    return query.order_by(*columns)
 
 
 def get_doctors(
@@ -13,74 +406,315 @@ def get_doctors(
     skip: int = 0,
     limit: int = 100,
     specializations: Optional[List[str]] = None,
-) -> List[models.Doctor]:
-    query = db.query(models.Doctor)
+    seed: int = 0,
+    order: schemas.DoctorOrder = schemas.DoctorOrder.random,
+    cursor: Optional[str] = None,
+    clinic: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> Tuple[list, Optional[str]]:
+    """
+    List doctors in a deterministic order with offset or keyset pagination.
+
+    The default ``random`` order is a shuffle that is stable for a given
+    seed: doctors are ordered by their persisted ``random_key``, rotated so
+    that the sequence starts at ``shuffle_start(seed)`` and wraps around. Both
+    halves of the rotation are range scans on the (random_key, id) index, so
+    the database never sorts the whole table and pages never overlap.
+
+    Pages after the first are cheapest through ``cursor``: it seeks past the
+    last row of the previous page on the ordering's index instead of skipping
+    ``skip`` rows. The cursor carries the order and seed it was issued for.
+    ``clinic`` keeps only doctors practising at that clinic.
+
+    With ``fields`` (from ``parse_fields``) only those columns are selected,
+    and rows are tuples starting with them (see ``encode_doctor_rows``)
+    instead of ORM objects; heavy columns such as ``description`` are never
+    read unless asked for.
 
+    Returns:
+        The page of doctors and the cursor of the next page (None once a
+        page comes back short)
+    """
+    after = None
+    if cursor:
+        order, cursor_seed, after = parse_listing_cursor(cursor)
+        if cursor_seed is not None:
+            seed = cursor_seed
+
+    columns = _sort_columns(order)
+    if fields is None:
+        query = db.query(models.Doctor)
+    else:
+        # Sort keys ride along after the fields for the next cursor
+        selected = {name: _field_column(name) for name in fields}
+        for column in (*columns, models.Doctor.random_key):
+            selected.setdefault(column.key, column)
+        query = db.query(*selected.values())
     if specializations:
-        specialty_filters = [
-            models.Doctor.speciality.ilike(f"%{spec}%") for spec in specializations
-        ]
-        query = query.filter(or_(*specialty_filters))
+        query = query.filter(speciality_filter(specializations))
+    if clinic:
+        query = query.filter(models.Doctor.clinics.any(clinic))
 
-    query = query.order_by(func.random())
-    return query.offset(skip).limit(limit).all()
+    if order != schemas.DoctorOrder.random:
+        query = _seek(query, columns, after)
+        if after is None:
+            query = query.offset(skip)
+        doctors = query.limit(limit).all()
+        next_cursor = None
+        if doctors and len(doctors) == limit:
+            key = [getattr(doctors[-1], column.key) for column in columns]
+            next_cursor = encode_cursor([order.value, *key])
+        return doctors, next_cursor
 
+    start = shuffle_start(seed)
+    head = query.filter(models.Doctor.random_key >= start)
+    tail = query.filter(models.Doctor.random_key < start)
 
-def create_doctor(db: Session, doctor: schemas.DoctorCreate) -> models.Doctor:
-    db_doctor = models.Doctor(**doctor.dict())
-    db.add(db_doctor)
+    if after is not None:
+        segment, after = after[0], after[1:]
+        if segment == 1:
+            doctors = _seek(tail, columns, after).limit(limit).all()
+        else:
+            doctors = _seek(head, columns, after).limit(limit).all()
+            if len(doctors) < limit:
+                doctors += _seek(tail, columns, None).limit(limit - len(doctors)).all()
+    else:
+        doctors = _seek(head, columns, None).offset(skip).limit(limit).all()
+        if len(doctors) < limit:
+            # The page runs past the end of the key range: continue from key 0
+            wrapped_skip = 0 if doctors else max(skip - head.count(), 0)
+            doctors += (
+                _seek(tail, columns, None)
+                .offset(wrapped_skip)
+                .limit(limit - len(doctors))
+                .all()
+            )
+
+    next_cursor = None
+    if doctors and len(doctors) == limit:
+        last = doctors[-1]
+        segment = 0 if last.random_key >= start else 1
+        next_cursor = encode_cursor(
+            [order.value, seed, segment, last.random_key, last.id]
+        )
+    return doctors, next_cursor
+
+
+def reshuffle_doctors(db: Session) -> int:
+    """
+    Re-roll every doctor's ``random_key``, changing the order of every seed.
+
+    Returns:
+        Number of doctors reshuffled
+    """
+    result = db.execute(update(models.Doctor).values(random_key=func.random()))
+    bump_catalog_version(db)
     db.commit()
-    db.refresh(db_doctor)
-    return db_doctor
+    response_cache.invalidate()
+    return result.rowcount
 
 
-def import_doctors(db: Session, file_path: str) -> dict:
-    with open(file_path, "r") as f:
-        doctors_data = json.load(f)
+def search_doctors(
+    db: Session,
+    q: str,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    specializations: Optional[List[str]] = None,
+) -> Tuple[List[models.Doctor], Optional[str]]:
+    """
+    Full-text search over doctor name, title, degree and description.
+
+    Results are ranked with ``ts_rank`` (best first, ties broken by id) and
+    paginated with a keyset cursor on (rank, id).
+
+    Args:
+        db: Database session
+        q: Search text, in web search syntax ("square hospital -surgery")
+        limit: Maximum number of doctors to return
+        cursor: ``next_cursor`` of the previous page
+        specializations: Only search doctors with any of these specialities
 
-    imported_count = 0
-    updated_count = 0
+    Returns:
+        The page of doctors and the cursor of the next page (None on the last)
+    """
+    ts_query = func.websearch_to_tsquery("english", q)
+    # ts_rank returns a real; compare it as a double so the cursor value read
+    # back from the database round-trips exactly
+    rank = cast(func.ts_rank(models.Doctor.search_vector, ts_query), DOUBLE_PRECISION)
 
-    for doctor in doctors_data:
-        existing_doctor = (
-            db.query(models.Doctor)
-            .filter(
-                models.Doctor.name == doctor["name"],
-                models.Doctor.speciality == doctor["specialty"],
+    query = db.query(models.Doctor, rank).filter(
+        models.Doctor.search_vector.op("@@")(ts_query)
+    )
+    if specializations:
+        query = query.filter(speciality_filter(specializations))
+    if cursor:
+        try:
+            last_rank, last_id = (float(v) for v in decode_cursor(cursor))
+        except (TypeError, ValueError) as exc:
+            raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+        query = query.filter(
+            or_(
+                rank < last_rank,
+                and_(rank == last_rank, models.Doctor.id > last_id),
             )
-            .first()
         )
 
-        if existing_doctor:
-            # Update existing doctor
-            for key, value in doctor.items():
-                if key == "specialty":
-                    existing_doctor.speciality = value
-                elif key == "dataScrappedAt":
-                    existing_doctor.data_scrapped_at = (
-                        datetime.strptime(value, "%Y-%m-%d") if value else None
-                    )
-                else:
-                    setattr(existing_doctor, key, value)
-            updated_count += 1
-        else:
-            # Create new doctor
-            new_doctor = models.Doctor(
-                name=doctor["name"],
-                title=doctor.get("title"),
-                speciality=doctor["specialty"],
-                educational_degree=doctor.get("educationalDegree"),
-                description=doctor.get("description"),
-                location=doctor.get("location"),
-                data_source=doctor.get("dataSource"),
-                data_scrapped_at=datetime.strptime(doctor["dataScrappedAt"], "%Y-%m-%d")
-                if doctor.get("dataScrappedAt")
-                else None,
-                clinics=doctor.get("clinics", []),
-                chambers=doctor.get("chambers", []),
+    rows = query.order_by(rank.desc(), models.Doctor.id).limit(limit + 1).all()
+    doctors = [doctor for doctor, _ in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last_doctor, last_rank = rows[limit - 1]
+        next_cursor = encode_cursor([last_rank, last_doctor.id])
+    return doctors, next_cursor
+
+
+def create_doctor(db: Session, doctor: schemas.DoctorCreate) -> models.Doctor:
+    try:
+        values = doctor.dict()
+        db_doctor = models.Doctor(**values)
+        db.add(db_doctor)
+        db.flush()
+        sync_specialities(db, doctor_ids=[db_doctor.id])
+        update_facet_counts(db, added=doctor_facets([values]))
+        bump_catalog_version(db)
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        raise HTTPException(
+            status_code=400, detail="Doctor with this name and speciality exists"
+        ) from exc
+    response_cache.invalidate()
+    db.refresh(db_doctor)
+    return db_doctor
+
+
+def import_doctors(
+    db: Session,
+    file_path: str,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    start_batch: int = 0,
+    on_batch: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """
+    Bulk import doctors from a JSON array file.
+
+    The file is stream-parsed and written in batches of ``batch_size`` with
+    one ``INSERT ... ON CONFLICT DO UPDATE`` per batch on (name, speciality),
+    committing after each batch together with its specialities and facet
+    counts. Records without a name or specialty are
+    skipped and counted.
+
+    Args:
+        db: Database session
+        file_path: Path to the JSON file containing doctor data
+        batch_size: Number of records written per batch
+        start_batch: Number of leading batches to skip, to resume an import
+        on_batch: Called with each batch's report after it is committed
+
+    Returns:
+        Dictionary with import counts and per-batch timings
+    """
+    report = {"imported": 0, "updated": 0, "skipped": 0, "batches": []}
+    started = time.perf_counter()
+
+    with open(file_path, "r", encoding="utf-8") as f:
+        records = importer.iter_json_array(f)
+        for number, batch in enumerate(importer.batched(records, batch_size)):
+            if number < start_batch:
+                continue
+
+            batch_started = time.perf_counter()
+            rows = []
+            skipped = 0
+            for record in batch:
+                try:
+                    rows.append(importer.normalize_record(record))
+                except (AttributeError, ValueError):
+                    skipped += 1
+
+            rows = importer.unique_rows(rows)
+            # What the upsert overwrites, to take out of the facet counts
+            replaced = locked_doctor_facets(
+                db, [(row["name"], row["speciality"]) for row in rows]
             )
-            db.add(new_doctor)
-            imported_count += 1
+            written = importer.upsert_doctors(db, rows) if rows else []
+            sync_specialities(db, doctor_ids=[doctor_id for doctor_id, _ in written])
+            update_facet_counts(db, added=doctor_facets(rows), removed=replaced)
+            if written:
+                bump_catalog_version(db)
+            db.commit()
+            if written:
+                response_cache.invalidate()
 
-    db.commit()
-    return {"imported": imported_count, "updated": updated_count}
+            inserted = sum(1 for _, is_new in written if is_new)
+            batch_report = {
+                "batch": number,
+                "rows": len(batch),
+                "imported": inserted,
+                "updated": len(written) - inserted,
+                "skipped": skipped,
+                "seconds": round(time.perf_counter() - batch_started, 4),
+            }
+            report["imported"] += batch_report["imported"]
+            report["updated"] += batch_report["updated"]
+            report["skipped"] += skipped
+            report["batches"].append(batch_report)
+            if on_batch is not None:
+                on_batch(batch_report)
+
+    report["seconds"] = round(time.perf_counter() - started, 4)
+    return report
+
+
+# Async variants for routes on ``get_async_db``. The sync implementations run
+# through ``AsyncSession.run_sync``: their queries are awaited on the event
+# loop via the asyncio driver, so no threadpool thread is held per request.
+
+
+async def get_doctors_async(
+    db: AsyncSession, **kwargs
+) -> Tuple[List[models.Doctor], Optional[str]]:
+    """Async ``get_doctors``; takes the same keyword arguments."""
+    return await db.run_sync(get_doctors, **kwargs)
+
+
+async def search_doctors_async(
+    db: AsyncSession, **kwargs
+) -> Tuple[List[models.Doctor], Optional[str]]:
+    """Async ``search_doctors``; takes the same keyword arguments."""
+    return await db.run_sync(search_doctors, **kwargs)
+
+
+async def get_facets_async(db: AsyncSession, **kwargs) -> dict:
+    """Async ``get_facets``; takes the same keyword arguments."""
+    return await db.run_sync(get_facets, **kwargs)
+
+
+async def create_doctor_async(
+    db: AsyncSession, doctor: schemas.DoctorCreate
+) -> models.Doctor:
+    """Async ``create_doctor``."""
+    return await db.run_sync(create_doctor, doctor)
+
+
+async def stream_doctors_async(
+    db: AsyncSession,
+    specializations: Optional[List[str]] = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> AsyncIterator[Row]:
+    """
+    Yield every doctor (optionally only those with ``specializations``) by id.
+
+    Rows are read through a server-side cursor ``batch_size`` at a time, so
+    memory use doesn't grow with the catalog. Only the exported columns are
+    selected; rows are not ORM objects.
+    """
+    query = select(*(getattr(models.Doctor, name) for name in EXPORT_COLUMNS))
+    if specializations:
+        query = query.where(speciality_filter(specializations))
+    query = query.order_by(models.Doctor.id).execution_options(yield_per=batch_size)
+
+    result = await db.stream(query)
+    async for partition in result.partitions():
+        for row in partition:
+            yield row
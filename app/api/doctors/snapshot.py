@@ -0,0 +1,473 @@
+import asyncio
+import fcntl
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import orjson
+from fastapi import HTTPException
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config.catalog import CATALOG_SNAPSHOT_ENABLED, CATALOG_SNAPSHOT_PATH
+from app.database import SessionLocal
+from app.response_cache import CATALOG_STATE_ID
+
+from . import models, schemas, service
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"DFCATLG1"
+# magic, catalog version, metadata length
+HEADER = struct.Struct("<8sqQ")
+_ALIGN = 8
+
+_doctor = TypeAdapter(schemas.Doctor)
+
+
+def _padding(size: int) -> int:
+    return -size % _ALIGN
+
+
+def _bisect(lo: int, hi: int, before: Callable[[int], bool]) -> int:
+    """First index in [lo, hi) for which the monotone ``before`` is False."""
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if before(mid):
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _csr(groups: Sequence[List[int]]) -> Tuple[array, array]:
+    """Pack lists of rows as (offsets, rows) arrays."""
+    offsets, rows = array("q", [0]), array("i")
+    for group in groups:
+        rows.extend(group)
+        offsets.append(len(rows))
+    return offsets, rows
+
+
+def build_snapshot(db: Session, path: str) -> int:
+    """
+    Write a snapshot of the doctor catalog to ``path``.
+
+    The catalog is read in one REPEATABLE READ transaction so that rows,
+    speciality links and the catalog version agree. The file is written
+    beside ``path`` and renamed over it, so readers never see a partial file.
+
+    Args:
+        db: Database session with no transaction in progress
+        path: Snapshot file to replace
+
+    Returns:
+        Catalog version of the snapshot
+    """
+    db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    state = db.get(models.CatalogState, CATALOG_STATE_ID)
+    version = state.version if state is not None else 0
+
+    ids, random_keys, bodies = array("q"), array("d"), []
+    clinic_rows: Dict[str, List[int]] = {}
+    doctors = db.execute(
+        select(models.Doctor)
+        .order_by(models.Doctor.id)
+        .execution_options(yield_per=1000)
+    ).scalars()
+    for row, doctor in enumerate(doctors):
+        ids.append(doctor.id)
+        random_keys.append(doctor.random_key)
+        bodies.append(
+            _doctor.dump_json(_doctor.validate_python(doctor, from_attributes=True))
+        )
+        for clinic in dict.fromkeys(doctor.clinics or ()):
+            clinic_rows.setdefault(sys.intern(clinic), []).append(row)
+    count = len(ids)
+    row_of = {doctor_id: row for row, doctor_id in enumerate(ids)}
+
+    # Name order comes from the database so it follows the column collation
+    name_order = array(
+        "i",
+        (
+            row_of[doctor_id]
+            for doctor_id in db.execute(
+                select(models.Doctor.id).order_by(models.Doctor.name, models.Doctor.id)
+            ).scalars()
+        ),
+    )
+    random_order = array(
+        "i", sorted(range(count), key=lambda row: (random_keys[row], ids[row]))
+    )
+    random_rank, name_rank = array("i", bytes(4 * count)), array("i", bytes(4 * count))
+    for position in range(count):
+        random_rank[random_order[position]] = position
+        name_rank[name_order[position]] = position
+
+    specialities = db.execute(
+        select(models.Speciality.id, models.Speciality.name).order_by(
+            models.Speciality.id
+        )
+    ).all()
+    speciality_index = {
+        speciality_id: i for i, (speciality_id, _) in enumerate(specialities)
+    }
+    speciality_rows: List[List[int]] = [[] for _ in specialities]
+    links = models.doctor_specialities
+    for doctor_id, speciality_id in db.execute(
+        select(links.c.doctor_id, links.c.speciality_id)
+    ):
+        if doctor_id in row_of:
+            speciality_rows[speciality_index[speciality_id]].append(row_of[doctor_id])
+    aliases: Dict[str, List[int]] = {}
+    for alias, speciality_id in db.execute(
+        select(models.SpecialityAlias.alias, models.SpecialityAlias.speciality_id)
+    ):
+        aliases.setdefault(alias, []).append(speciality_index[speciality_id])
+    db.rollback()
+
+    body_offsets = array("q", [0])
+    for body in bodies:
+        body_offsets.append(body_offsets[-1] + len(body))
+    speciality_offsets, speciality_members = _csr([sorted(r) for r in speciality_rows])
+    clinic_names = sorted(clinic_rows)
+    clinic_offsets, clinic_members = _csr([clinic_rows[name] for name in clinic_names])
+
+    sections = [
+        ("ids", ids),
+        ("random_keys", random_keys),
+        ("random_order", random_order),
+        ("random_rank", random_rank),
+        ("name_order", name_order),
+        ("name_rank", name_rank),
+        ("body_offsets", body_offsets),
+        ("speciality_offsets", speciality_offsets),
+        ("speciality_rows", speciality_members),
+        ("clinic_offsets", clinic_offsets),
+        ("clinic_rows", clinic_members),
+        ("bodies", b"".join(bodies)),
+    ]
+    layout, offset = {}, 0
+    for name, data in sections:
+        size = len(data) * data.itemsize if isinstance(data, array) else len(data)
+        typecode = data.typecode if isinstance(data, array) else None
+        layout[name] = [offset, size, typecode]
+        offset += size + _padding(size)
+    meta = json.dumps(
+        {
+            "count": count,
+            "sections": layout,
+            "specialities": [name for _, name in specialities],
+            "aliases": aliases,
+            "clinics": clinic_names,
+        },
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(HEADER.pack(MAGIC, version, len(meta)))
+        f.write(meta)
+        f.write(bytes(_padding(HEADER.size + len(meta))))
+        for _, data in sections:
+            raw = data.tobytes() if isinstance(data, array) else data
+            f.write(raw)
+            f.write(bytes(_padding(len(raw))))
+    os.replace(temporary, path)
+    return version
+
+
+class CatalogSnapshot:
+    """
+    Read-only doctor catalog backed by a memory-mapped snapshot file.
+
+    Rows are stored in id order as pre-serialized ``schemas.Doctor`` JSON,
+    next to column arrays for the sort keys, the random and name orderings
+    with each row's rank in them, and per-speciality and per-clinic row
+    lists. Every worker mapping the same file shares its pages.
+    """
+
+    __slots__ = (
+        "version",
+        "count",
+        "_mmap",
+        "_ids",
+        "_random_keys",
+        "_random_order",
+        "_random_rank",
+        "_name_order",
+        "_name_rank",
+        "_body_offsets",
+        "_bodies",
+        "_speciality_offsets",
+        "_speciality_rows",
+        "_clinic_offsets",
+        "_clinic_rows",
+        "_aliases",
+        "_clinics",
+    )
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.version, meta_size = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a catalog snapshot")
+        meta = json.loads(self._mmap[HEADER.size : HEADER.size + meta_size])
+        self.count = meta["count"]
+
+        base = HEADER.size + meta_size + _padding(HEADER.size + meta_size)
+        view = memoryview(self._mmap)
+        for name, (offset, size, typecode) in meta["sections"].items():
+            section = view[base + offset : base + offset + size]
+            setattr(self, f"_{name}", section.cast(typecode) if typecode else section)
+
+        self._aliases = {
+            sys.intern(alias): tuple(indexes)
+            for alias, indexes in meta["aliases"].items()
+        }
+        self._clinics = {sys.intern(name): i for i, name in enumerate(meta["clinics"])}
+
+    def _body(self, row: int) -> bytes:
+        return bytes(
+            self._bodies[self._body_offsets[row] : self._body_offsets[row + 1]]
+        )
+
+    @staticmethod
+    def _members(offsets, rows, index: int):
+        return rows[offsets[index] : offsets[index + 1]]
+
+    def _filter(
+        self, specializations: Optional[List[str]], clinic: Optional[str]
+    ) -> Optional[Set[int]]:
+        """Rows matching the filters, or None when nothing is filtered."""
+        rows = None
+        if specializations:
+            aliases = [spec.strip().lower() for spec in specializations if spec.strip()]
+            rows = set()
+            for alias in aliases:
+                for index in self._aliases.get(alias, ()):
+                    rows.update(
+                        self._members(
+                            self._speciality_offsets, self._speciality_rows, index
+                        )
+                    )
+        if clinic:
+            index = self._clinics.get(clinic)
+            at_clinic = (
+                set(self._members(self._clinic_offsets, self._clinic_rows, index))
+                if index is not None
+                else set()
+            )
+            rows = at_clinic if rows is None else rows & at_clinic
+        return rows
+
+    def page(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        specializations: Optional[List[str]] = None,
+        seed: int = 0,
+        order: schemas.DoctorOrder = schemas.DoctorOrder.random,
+        cursor: Optional[str] = None,
+        clinic: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Optional[Tuple[bytes, Optional[str]]]:
+        """
+        Serve a ``service.get_doctors`` page from the snapshot.
+
+        Takes the same arguments and yields the same rows and cursor as the
+        database query. Stored rows are complete; a sparse ``fields`` set
+        is cut out of them.
+
+        Returns:
+            The JSON array of the page and the next cursor, or None when the
+            request can't be answered from the snapshot (such as a malformed
+            cursor or one whose row no longer exists)
+        """
+        after = None
+        if cursor:
+            try:
+                order, cursor_seed, after = service.parse_listing_cursor(cursor)
+            except HTTPException:
+                return None
+            if cursor_seed is not None:
+                seed = cursor_seed
+
+        rows = self._filter(specializations, clinic)
+        if order == schemas.DoctorOrder.random:
+            rank = self._random_rank
+            ordered = (
+                self._random_order
+                if rows is None
+                else sorted(rows, key=rank.__getitem__)
+            )
+        elif order == schemas.DoctorOrder.name:
+            rank = self._name_rank
+            ordered = (
+                self._name_order if rows is None else sorted(rows, key=rank.__getitem__)
+            )
+        else:
+            ordered = range(self.count) if rows is None else sorted(rows)
+        total = len(ordered)
+        ids, keys = self._ids, self._random_keys
+
+        # Random order is ``ordered`` rotated to start at the first key at or
+        # after the seed's start; ``split`` is where that key sits
+        split = 0
+        if order == schemas.DoctorOrder.random:
+            start = service.shuffle_start(seed)
+            split = _bisect(0, total, lambda i: keys[ordered[i]] < start)
+
+        if after is None:
+            position = max(skip, 0)
+        elif order == schemas.DoctorOrder.random:
+            segment, key, doctor_id = after
+            lo, hi = (split, total) if segment == 0 else (0, split)
+            index = _bisect(
+                lo,
+                hi,
+                lambda i: (keys[ordered[i]], ids[ordered[i]]) <= (key, doctor_id),
+            )
+            position = index - split if segment == 0 else total - split + index
+        elif order == schemas.DoctorOrder.name:
+            name, doctor_id = after
+            row = self._row_of(doctor_id)
+            if row is None or json.loads(self._body(row))["name"] != name:
+                return None
+            position = _bisect(0, total, lambda i: rank[ordered[i]] <= rank[row])
+        else:
+            if not isinstance(after[0], int):
+                return None
+            position = _bisect(0, total, lambda i: ids[ordered[i]] <= after[0])
+
+        page_rows = [
+            ordered[(split + p) % total]
+            for p in range(position, min(position + max(limit, 0), total))
+        ]
+        if fields is None or tuple(fields) == service.DOCTOR_FIELDS:
+            body = b"[" + b",".join(self._body(row) for row in page_rows) + b"]"
+        else:
+            doctors = [orjson.loads(self._body(row)) for row in page_rows]
+            body = orjson.dumps(
+                [{name: doctor[name] for name in fields} for doctor in doctors]
+            )
+
+        next_cursor = None
+        if page_rows and len(page_rows) == limit:
+            last = page_rows[-1]
+            if order == schemas.DoctorOrder.random:
+                segment = 0 if keys[last] >= start else 1
+                values = [order.value, seed, segment, keys[last], ids[last]]
+            elif order == schemas.DoctorOrder.name:
+                values = [order.value, json.loads(self._body(last))["name"], ids[last]]
+            else:
+                values = [order.value, ids[last]]
+            next_cursor = service.encode_cursor(values)
+        return body, next_cursor
+
+    def _row_of(self, doctor_id) -> Optional[int]:
+        if not isinstance(doctor_id, int):
+            return None
+        ids = self._ids
+        row = _bisect(0, self.count, lambda i: ids[i] < doctor_id)
+        return row if row < self.count and ids[row] == doctor_id else None
+
+
+class SnapshotStore:
+    """
+    Keeps this worker's mapping of the catalog snapshot current.
+
+    A request asks for the snapshot of the catalog version it is serving.
+    When the mapped snapshot is older, the store maps the file again or,
+    when the file is older too, rebuilds it under an exclusive file lock so
+    only one worker on the host pays for the rebuild. Requests that arrive
+    while a refresh is in progress get None and fall back to the database.
+    """
+
+    def __init__(
+        self,
+        path: str = CATALOG_SNAPSHOT_PATH,
+        enabled: bool = CATALOG_SNAPSHOT_ENABLED,
+    ):
+        self.path = path
+        self.enabled = enabled
+        self.snapshot: Optional[CatalogSnapshot] = None
+        self.builds = 0
+        self._lock = threading.Lock()
+
+    def current(self, version: int) -> Optional[CatalogSnapshot]:
+        """Return a snapshot at least as new as ``version``, or None."""
+        snapshot = self.snapshot
+        if snapshot is not None and snapshot.version >= version:
+            return snapshot
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            snapshot = self._open(version) or self._rebuild(version)
+            if snapshot is not None:
+                # The previous mapping is closed once in-flight pages drop it
+                self.snapshot = snapshot
+            return snapshot
+        except Exception as e:
+            logger.error("Catalog snapshot refresh failed: %s", e)
+            return None
+        finally:
+            self._lock.release()
+
+    async def acurrent(self, version: int) -> Optional[CatalogSnapshot]:
+        """Async ``current``; refreshes happen off the event loop."""
+        snapshot = self.snapshot
+        if snapshot is not None and snapshot.version >= version:
+            return snapshot
+        return await asyncio.to_thread(self.current, version)
+
+    def _open(self, version: int) -> Optional[CatalogSnapshot]:
+        try:
+            snapshot = CatalogSnapshot(self.path)
+        except (FileNotFoundError, ValueError, struct.error):
+            return None
+        return snapshot if snapshot.version >= version else None
+
+    def _rebuild(self, version: int) -> Optional[CatalogSnapshot]:
+        with open(f"{self.path}.lock", "w") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                # Another worker is rebuilding it
+                return None
+            try:
+                # It may have finished a rebuild while we waited for the lock
+                snapshot = self._open(version)
+                if snapshot is not None:
+                    return snapshot
+                db = SessionLocal()
+                try:
+                    built = build_snapshot(db, self.path)
+                finally:
+                    db.close()
+                self.builds += 1
+                logger.info("Rebuilt catalog snapshot at version %s", built)
+                return self._open(version)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def stats(self) -> dict:
+        """Return the mapped snapshot's version and size and the rebuild count."""
+        snapshot = self.snapshot
+        return {
+            "enabled": self.enabled,
+            "version": snapshot.version if snapshot is not None else None,
+            "doctors": snapshot.count if snapshot is not None else 0,
+            "builds": self.builds,
+        }
+
+
+catalog_snapshot = SnapshotStore()
@@ -0,0 +1,163 @@
+import asyncio
+import zlib
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+
+from app.config.compression import (
+    COMPRESSION_BROTLI_QUALITY,
+    COMPRESSION_GZIP_LEVEL,
+    COMPRESSION_MINIMUM_SIZE,
+)
+
+try:
+    import brotli
+except ImportError:  # br is optional; gzip is always available
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+# Chunks at least this large are compressed in a worker thread (zlib and
+# brotli release the GIL), so big pages don't stall the event loop
+THREAD_MIN_BYTES = 65536
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the response encoding for an ``Accept-Encoding`` header.
+
+    Returns:
+        "br" (when brotli is installed) or "gzip", whichever the client
+        gives the higher q-value, preferring br on a tie; None to send the
+        body as is
+    """
+    accepted = {}
+    for coding in accept_encoding.split(","):
+        name, *params = coding.split(";")
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    # gzip must beat br outright, so br wins ties
+    for encoding in ("br", "gzip"):
+        if encoding == "br" and brotli is None:
+            continue
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class StreamCompressor:
+    """Incremental br or gzip compressor; every chunk is flushed."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+        else:
+            self._zlib = zlib.compressobj(
+                COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+            )
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        if self.encoding == "br":
+            out = self._brotli.process(data)
+            return out + (self._brotli.finish() if final else self._brotli.flush())
+        mode = zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        return self._zlib.compress(data) + self._zlib.flush(mode)
+
+    async def acompress(self, data: bytes, final: bool) -> bytes:
+        if len(data) >= THREAD_MIN_BYTES:
+            return await asyncio.to_thread(self.compress, data, final)
+        return self.compress(data, final)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses with br or gzip as negotiated.
+
+    Complete bodies under ``minimum_size`` bytes, content types that don't
+    compress well and responses that are already encoded pass through.
+    Streamed responses are compressed chunk by chunk as they are sent.
+    Strong ETags become weak ones, since the bytes now depend on the
+    encoding.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = None
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                encoding = negotiate(value.decode("latin-1"))
+                break
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        compressor: Optional[StreamCompressor] = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                # Held until the first body chunk shows whether to compress
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                headers = MutableHeaders(raw=start["headers"])
+                content_type = headers.get("content-type", "")
+                if (
+                    "content-encoding" in headers
+                    or not content_type.startswith(COMPRESSIBLE_TYPES)
+                    or (not more_body and len(body) < self.minimum_size)
+                ):
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+
+                compressor = StreamCompressor(encoding)
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["ETag"] = f"W/{etag}"
+                del headers["content-length"]
+                if not more_body:
+                    body = await compressor.acompress(body, final=True)
+                    headers["Content-Length"] = str(len(body))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send(start)
+
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": await compressor.acompress(body, final=not more_body),
+                    "more_body": more_body,
+                }
+            )
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,5 @@
+from dotenv import load_dotenv
+
+# Every setting is read from the environment when its module is imported, so
+# .env is loaded once, here, before any of them
+load_dotenv()
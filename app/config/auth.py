@@ -0,0 +1,19 @@
+import os
+
+# Verified access tokens cached per worker, keyed by token hash. Entries never
+# outlive the token's own expiry.
+AUTH_TOKEN_CACHE_MAX_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_MAX_SIZE", "10000"))
+# Authenticated users cached per worker, keyed by email
+AUTH_USER_CACHE_MAX_SIZE = int(os.getenv("AUTH_USER_CACHE_MAX_SIZE", "10000"))
+# Longest a cached user is trusted. Updates made through this worker apply at
+# once; deactivations made elsewhere take effect within this many seconds.
+AUTH_USER_CACHE_TTL_SECONDS = float(os.getenv("AUTH_USER_CACHE_TTL_SECONDS", "60"))
+
+# Password hashing
+# bcrypt cost factor. Changing it rehashes each user's password at next login.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Processes dedicated to bcrypt, so bursts of logins can't starve requests
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+# Hash/verify operations allowed to wait for a free process; beyond this,
+# requests are rejected with 503
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
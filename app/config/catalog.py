@@ -0,0 +1,14 @@
+import os
+import tempfile
+
+# Serve GET /doctors/ from an in-memory catalog snapshot instead of the ORM
+CATALOG_SNAPSHOT_ENABLED = (
+    os.getenv("CATALOG_SNAPSHOT_ENABLED", "false").lower() == "true"
+)
+# Snapshot file memory-mapped by every worker on the host. Workers share its
+# pages through the OS page cache; the first to notice a catalog write rebuilds
+# it.
+CATALOG_SNAPSHOT_PATH = os.getenv(
+    "CATALOG_SNAPSHOT_PATH",
+    os.path.join(tempfile.gettempdir(), "doc_finder_catalog.snapshot"),
+)
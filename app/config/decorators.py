@@ -24,17 +24,21 @@ def rate_limit(limit_string=None):
         limit = limit_string or DEFAULT_RATE_LIMIT
         is_async = inspect.iscoroutinefunction(func)
 
-        @limiter.limit(limit)
-        @wraps(func)
-        async def async_wrapper(request: Request, *args, **kwargs):
-            return await func(request, *args, **kwargs)
+        if is_async:
 
-        @limiter.limit(limit)
-        @wraps(func)
-        def sync_wrapper(request: Request, *args, **kwargs):
-            return func(request, *args, **kwargs)
+            @wraps(func)
+            async def wrapper(request: Request, *args, **kwargs):
+                return await func(request, *args, **kwargs)
 
-        return async_wrapper if is_async else sync_wrapper
+        else:
+
+            @wraps(func)
+            def wrapper(request: Request, *args, **kwargs):
+                return func(request, *args, **kwargs)
+
+        # Registered once per route: slowapi keys limits by function name, so
+        # decorating both variants would count every request twice
+        return limiter.limit(limit)(wrapper)
 
     return decorator
 
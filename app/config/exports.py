@@ -0,0 +1,6 @@
+import os
+
+# Rows fetched per round-trip from the export's server-side cursor
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+# Serialized bytes buffered before they are sent (and compressed)
+EXPORT_CHUNK_BYTES = int(os.getenv("EXPORT_CHUNK_BYTES", "65536"))
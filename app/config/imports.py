@@ -0,0 +1,15 @@
+import os
+
+# Doctors written (and committed) per batch by the bulk import
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+# Bytes read from the import file at a time while stream-parsing it
+IMPORT_READ_SIZE = int(os.getenv("IMPORT_READ_SIZE", "65536"))
+# Longest single record accepted, in characters; past this a record that
+# still doesn't parse fails the import instead of buffering the whole file
+IMPORT_MAX_ELEMENT_SIZE = int(os.getenv("IMPORT_MAX_ELEMENT_SIZE", "1048576"))
+
+# Background import jobs
+IMPORT_JOB_WORKERS = int(os.getenv("IMPORT_JOB_WORKERS", "1"))
+# A running job whose progress hasn't moved for this long is considered dead
+# (its worker exited) and may be resumed
+IMPORT_JOB_STALE_SECONDS = int(os.getenv("IMPORT_JOB_STALE_SECONDS", "300"))
@@ -0,0 +1,6 @@
+import os
+
+# Serve GET /metrics (Prometheus text format) and record request metrics
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+# When set, /metrics requires "Authorization: Bearer <token>"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN") or None
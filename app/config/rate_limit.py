@@ -3,11 +3,35 @@ import os
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
+# Registers the shm:// storage scheme
+import app.rate_limit_storage  # noqa: F401
+from app.api.auth.dependencies import rate_limit_key
+
 # Default rate limits
 DEFAULT_RATE_LIMIT = os.getenv("DEFAULT_RATE_LIMIT", "20/minute")
 AUTH_RATE_LIMIT = os.getenv("AUTH_RATE_LIMIT", "10/minute")
 AI_RATE_LIMIT = os.getenv("AI_RATE_LIMIT", "10/minute")
 ADMIN_RATE_LIMIT = os.getenv("ADMIN_RATE_LIMIT", "10/minute")
 
+# Where counters live. memory:// is per worker; use shm:// to share them
+# between the workers of one host, or redis://host:6379 across hosts.
+RATE_LIMIT_STORAGE_URI = os.getenv("RATE_LIMIT_STORAGE_URI", "memory://")
+# sliding-window-counter, fixed-window or moving-window (memory/redis only)
+RATE_LIMIT_STRATEGY = os.getenv("RATE_LIMIT_STRATEGY", "sliding-window-counter")
+# "ip" limits each client address, "user" each authenticated user (falling
+# back to the address for anonymous requests)
+RATE_LIMIT_KEY = os.getenv("RATE_LIMIT_KEY", "ip")
+# Keep limiting with per-worker counters while a remote storage is down
+RATE_LIMIT_IN_MEMORY_FALLBACK = (
+    os.getenv("RATE_LIMIT_IN_MEMORY_FALLBACK", "true").lower() == "true"
+)
+
 # Initialize limiter with dummy config file to avoid looking for .env file in vercel deployment
-limiter = Limiter(key_func=get_remote_address, config_filename="limitter.env")
+limiter = Limiter(
+    key_func=rate_limit_key if RATE_LIMIT_KEY == "user" else get_remote_address,
+    strategy=RATE_LIMIT_STRATEGY,
+    storage_uri=RATE_LIMIT_STORAGE_URI,
+    storage_options={},
+    in_memory_fallback_enabled=RATE_LIMIT_IN_MEMORY_FALLBACK,
+    config_filename="limitter.env",
+)
@@ -0,0 +1,10 @@
+import os
+
+# Serialized doctor listing responses kept per worker
+RESPONSE_CACHE_MAX_SIZE = int(os.getenv("RESPONSE_CACHE_MAX_SIZE", "1024"))
+# How long a worker trusts its copy of the catalog version. Writes made by
+# this worker are seen at once; writes made by other workers within this
+# many seconds.
+CATALOG_VERSION_TTL_SECONDS = float(os.getenv("CATALOG_VERSION_TTL_SECONDS", "2"))
+# max-age sent in Cache-Control. Clients revalidate with If-None-Match after it.
+RESPONSE_CACHE_MAX_AGE = int(os.getenv("RESPONSE_CACHE_MAX_AGE", "0"))
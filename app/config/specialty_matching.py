@@ -0,0 +1,30 @@
+import os
+
+# Symptom -> specialty result cache
+SPECIALTY_CACHE_MAX_SIZE = int(os.getenv("SPECIALTY_CACHE_MAX_SIZE", "2048"))
+SPECIALTY_CACHE_TTL_SECONDS = int(os.getenv("SPECIALTY_CACHE_TTL_SECONDS", "86400"))
+# Persist cached matches in the database so they survive restarts and are
+# shared between workers
+SPECIALTY_CACHE_PERSISTENT = (
+    os.getenv("SPECIALTY_CACHE_PERSISTENT", "false").lower() == "true"
+)
+
+# Upstream LLM calls
+# Maximum number of OpenAI requests in flight per worker
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+# Give up on a match (and fall back to Internal Medicine) after this long,
+# including time spent waiting for a free concurrency slot
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "10"))
+
+# Local (offline) classifier
+# Skip the LLM when the local classifier's best confidence reaches this value.
+# Set above 1 to always ask the LLM.
+LOCAL_CLASSIFIER_THRESHOLD = float(os.getenv("LOCAL_CLASSIFIER_THRESHOLD", "0.6"))
+
+# Batch matching (POST /ai/match-specialization/batch)
+# Queries accepted per request, and the longest query accepted
+AI_BATCH_MAX_QUERIES = int(os.getenv("AI_BATCH_MAX_QUERIES", "100"))
+AI_BATCH_MAX_QUERY_LENGTH = int(os.getenv("AI_BATCH_MAX_QUERY_LENGTH", "1000"))
+# Queries the LLM classifies per request; larger batches mean fewer calls but
+# longer responses
+LLM_BATCH_SIZE = int(os.getenv("LLM_BATCH_SIZE", "20"))
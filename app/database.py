@@ -1,27 +1,309 @@
+import asyncio
 import os
+import threading
+import time
 
-from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
-load_dotenv()
+from app import metrics
+from app.config.database import (
+    DATABASE_REPLICA_URL,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_STATEMENT_TIMEOUT_MS,
+    DB_WARMUP_CONNECTIONS,
+)
+
+
+def _normalize_url(url: str) -> str:
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql://", 1)
+    return url
 
-SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL")
-if SQLALCHEMY_DATABASE_URL and SQLALCHEMY_DATABASE_URL.startswith("postgres://"):
-    SQLALCHEMY_DATABASE_URL = SQLALCHEMY_DATABASE_URL.replace(
-        "postgres://", "postgresql://", 1
-    )
 
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL")
 if SQLALCHEMY_DATABASE_URL is None:
     raise ValueError("DATABASE_URL is not set")
+SQLALCHEMY_DATABASE_URL = _normalize_url(SQLALCHEMY_DATABASE_URL)
+
+# asyncio drivers for the async engines, by backend
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def async_url(url: str) -> str:
+    """Return ``url`` with its driver swapped for the backend's asyncio driver."""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver for {parsed.get_backend_name()}")
+    return parsed.set(
+        drivername=f"{parsed.get_backend_name()}+{driver}"
+    ).render_as_string(hide_password=False)
+
+
+class PoolStats:
+    """Checkout counters for one connection pool, kept across pool recreation."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Engine label for the checkout wait histogram
+        self.name = "default"
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record(self, wait: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.wait_seconds += wait
+            self.max_wait_seconds = max(self.max_wait_seconds, wait)
+        metrics.db_pool_wait.observe(wait, self.name)
+
+
+class _InstrumentedPool:
+    """Pool mixin that times how long each checkout waits for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except sa_exc.TimeoutError:
+            self.stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.stats.record(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        # Engines recreate their pool after a disconnect; keep the counters
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPool, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPool, AsyncAdaptedQueuePool):
+    pass
+
+
+def _pool_options() -> dict:
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+def _instrument(eng, name: str) -> None:
+    """Label the engine's pool and time its statements for ``app.metrics``."""
+    eng.pool.stats.name = name
+
+    @event.listens_for(eng, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        if context is not None:
+            context.metrics_started = time.perf_counter()
+
+    @event.listens_for(eng, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        started = getattr(context, "metrics_started", None)
+        if started is not None:
+            metrics.record_query(name, time.perf_counter() - started)
+
+
+def _create_engine(url: str, name: str):
+    connect_args = {}
+    if DB_STATEMENT_TIMEOUT_MS > 0 and url.startswith("postgresql"):
+        connect_args["options"] = f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"
+    eng = create_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        connect_args=connect_args,
+        **_pool_options(),
+    )
+    _instrument(eng, name)
+    return eng
+
+
+def _create_async_engine(url: str, name: str):
+    url = async_url(url)
+    connect_args = {}
+    if DB_STATEMENT_TIMEOUT_MS > 0 and url.startswith("postgresql"):
+        connect_args["server_settings"] = {
+            "statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)
+        }
+    eng = create_async_engine(
+        url,
+        poolclass=InstrumentedAsyncQueuePool,
+        connect_args=connect_args,
+        **_pool_options(),
+    )
+    _instrument(eng.sync_engine, name)
+    return eng
+
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+engine = _create_engine(SQLALCHEMY_DATABASE_URL, "primary")
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engines are created on first use so that sync-only processes (import
+# jobs, migrations) don't need the asyncio driver
+async_engine = None
+AsyncSessionLocal = None
+
+if DATABASE_REPLICA_URL:
+    read_engine = _create_engine(_normalize_url(DATABASE_REPLICA_URL), "replica")
+    ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+else:
+    read_engine = engine
+    ReadSessionLocal = SessionLocal
+async_read_engine = None
+AsyncReadSessionLocal = None
+
 Base = declarative_base()
 
 
+def _init_async_engines() -> None:
+    global async_engine, AsyncSessionLocal, async_read_engine, AsyncReadSessionLocal
+
+    if async_engine is not None:
+        return
+    # Objects loaded by an async session must not expire on commit: reloading
+    # an attribute would need implicit (blocking) IO
+    async_engine = _create_async_engine(SQLALCHEMY_DATABASE_URL, "primary_async")
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+    if DATABASE_REPLICA_URL:
+        async_read_engine = _create_async_engine(
+            _normalize_url(DATABASE_REPLICA_URL), "replica_async"
+        )
+        AsyncReadSessionLocal = async_sessionmaker(
+            async_read_engine, autoflush=False, expire_on_commit=False
+        )
+    else:
+        async_read_engine = async_engine
+        AsyncReadSessionLocal = AsyncSessionLocal
+
+
+async def dispose_async_engines() -> None:
+    """
+    Close the async engines' pooled connections.
+
+    Call on shutdown: asyncio connections belong to the event loop that
+    opened them. The engines are recreated on next use.
+    """
+    global async_engine, AsyncSessionLocal, async_read_engine, AsyncReadSessionLocal
+
+    if async_engine is None:
+        return
+    if async_read_engine is not async_engine:
+        await async_read_engine.dispose()
+    await async_engine.dispose()
+    async_engine = AsyncSessionLocal = None
+    async_read_engine = AsyncReadSessionLocal = None
+
+
+async def warm_up_async_engines(connections: int = DB_WARMUP_CONNECTIONS) -> None:
+    """
+    Open ``connections`` connections on each async engine and return them to
+    the pool, so the first requests find them already established.
+
+    Args:
+        connections: Connections per engine; capped at the pool size so none
+            are closed again as overflow
+    """
+    connections = min(connections, DB_POOL_SIZE)
+    if connections <= 0:
+        return
+    _init_async_engines()
+    engines = {async_engine, async_read_engine}
+
+    async def ping(eng):
+        async with eng.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    # Held concurrently, otherwise the pool would hand back the same one
+    await asyncio.gather(*(ping(eng) for eng in engines for _ in range(connections)))
+
+
+def engines() -> dict:
+    """Return the engines created so far, by name."""
+    created = {"primary": engine}
+    if read_engine is not engine:
+        created["replica"] = read_engine
+    if async_engine is not None:
+        created["primary_async"] = async_engine
+        if async_read_engine is not async_engine:
+            created["replica_async"] = async_read_engine
+    return created
+
+
+def pool_status() -> dict:
+    """Return saturation and checkout wait statistics for each engine's pool."""
+    status = {}
+    for name, eng in engines().items():
+        pool = eng.pool
+        stats = pool.stats
+        checked_out = pool.checkedout()
+        capacity = pool.size() + DB_MAX_OVERFLOW
+        status[name] = {
+            "size": pool.size(),
+            "max_overflow": DB_MAX_OVERFLOW,
+            "checked_out": checked_out,
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "saturation": round(checked_out / capacity, 3) if capacity else 0.0,
+            "checkouts": stats.checkouts,
+            "timeouts": stats.timeouts,
+            "avg_wait_ms": round(
+                1000 * stats.wait_seconds / stats.checkouts if stats.checkouts else 0.0,
+                3,
+            ),
+            "max_wait_ms": round(1000 * stats.max_wait_seconds, 3),
+        }
+    return status
+
+
+def async_session():
+    """
+    Open a session on the async primary engine, outside of a request; the
+    caller closes it (``async with``).
+    """
+    _init_async_engines()
+    return AsyncSessionLocal()
+
+
+def async_read_session():
+    """
+    Open a session on the async read engine.
+
+    For work that outlives the request's dependencies, such as streamed
+    responses; the caller closes it (``async with``).
+    """
+    _init_async_engines()
+    return AsyncReadSessionLocal()
+
+
 # Dependency
 def get_db():
     db = SessionLocal()
@@ -29,3 +311,17 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Async dependency; the session runs on the event loop instead of a thread
+async def get_async_db():
+    _init_async_engines()
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Async dependency for read-only routes; bound to the replica when configured
+async def get_async_read_db():
+    _init_async_engines()
+    async with AsyncReadSessionLocal() as db:
+        yield db
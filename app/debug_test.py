@@ -2,13 +2,13 @@
 A simple module to test debugging functionality.
 """
 
+import logging
+
+logger = logging.getLogger(__name__)
+
 
 def test_function(value):
     """A simple function to test debugging."""
     result = value * 2
-    print(f"Value: {value}, Result: {result}")
+    logger.debug("Value: %s, Result: %s", value, result)
     return result
-
-
-# This will be executed when the module is imported
-print("Debug test module loaded!")
@@ -1,32 +1,78 @@
 import os
+import secrets
+from contextlib import asynccontextmanager
 
-from dotenv import load_dotenv
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
 from .api.admin.router import router as admin_router
 from .api.ai.router import router as ai_router
+from .api.auth.passwords import password_hasher
 from .api.auth.router import router as auth_router
+from .api.doctors.router import router as doctors_router
+from .api.doctors.snapshot import catalog_snapshot
+from .compression import CompressionMiddleware
+from .config.compression import COMPRESSION_ENABLED
+from .config.database import AUTO_CREATE_TABLES
 from .config.decorators import rate_limit
+from .config.metrics import METRICS_ENABLED, METRICS_TOKEN
 from .config.rate_limit import limiter
-from .database import Base, engine
-from .debug_test import test_function
-from .api.doctors.router import router as doctors_router
+from .database import (
+    Base,
+    dispose_async_engines,
+    engine,
+    pool_status,
+    warm_up_async_engines,
+)
+from .log import (
+    REQUEST_ID_HEADER,
+    RequestIdMiddleware,
+    configure_logging,
+    log_stats,
+    shutdown_logging,
+)
+from .metrics import (
+    CONTENT_TYPE,
+    MetricsMiddleware,
+    rate_limit_rejections,
+    registry,
+    route_label,
+    stats_collector,
+)
+from .response_cache import response_cache
+from .specialty_cache import specialty_cache
+
 
-load_dotenv()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Prepare logging and the database on startup; release them on shutdown."""
+    configure_logging()
+    if AUTO_CREATE_TABLES:
+        Base.metadata.create_all(bind=engine)
+    await warm_up_async_engines()
+    yield
+    await dispose_async_engines()
+    password_hasher.shutdown()
+    shutdown_logging()
 
-Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title="Doc Finder API",
     description="Backend API for Doc Finder Mobile App",
     version=os.getenv("API_VERSION", "v1"),
+    lifespan=lifespan,
 )
 
+
+def rate_limit_exceeded(request: Request, exc: RateLimitExceeded):
+    rate_limit_rejections.inc(route_label(request.scope))
+    return _rate_limit_exceeded_handler(request, exc)
+
+
 app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)  # type: ignore
+app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded)  # type: ignore
 
 app.add_middleware(
     CORSMiddleware,
@@ -34,7 +80,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        "X-Shuffle-Seed",
+        "X-Listing-Order",
+        "X-Next-Cursor",
+        REQUEST_ID_HEADER,
+    ],
 )
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+app.add_middleware(RequestIdMiddleware)
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
 app.include_router(doctors_router, prefix="/doctors", tags=["doctors"])
 app.include_router(ai_router, prefix="/ai", tags=["ai"])
@@ -46,9 +103,34 @@ app.include_router(auth_router, prefix="/auth", tags=["auth"])
 @rate_limit("10/minute")
 def health_check(request: Request):
     """Health check endpoint"""
-    value = 42
-    result = test_function(value)
-    return {"status": "ok", "debug_value": result}
+    return {"status": "ok"}
+
+
+registry.add_collector(
+    stats_collector(
+        {
+            "db_pool": pool_status,
+            "response_cache": response_cache.stats,
+            "specialty_cache": specialty_cache.stats,
+            "catalog_snapshot": catalog_snapshot.stats,
+            "password_hasher": password_hasher.stats,
+            "logging": log_stats,
+        }
+    )
+)
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics(request: Request):
+    """Prometheus metrics for this worker"""
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if METRICS_TOKEN is not None:
+        expected = f"Bearer {METRICS_TOKEN}"
+        supplied = request.headers.get("Authorization", "")
+        if not secrets.compare_digest(supplied.encode(), expected.encode()):
+            raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return Response(registry.render(), media_type=CONTENT_TYPE)
 
 
 if __name__ == "__main__":
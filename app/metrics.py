@@ -0,0 +1,289 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; covers a cached response through a slow upstream call
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _labels(names: Sequence[str], values: Sequence) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(values[i])}"' for i, n in enumerate(names))
+    return "{" + pairs + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter, one value per label combination."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+
+
+class Histogram:
+    """
+    Bucketed observations, one set of buckets per label combination.
+
+    Buckets are counted non-cumulatively and summed at scrape time, so an
+    observation is a bisect and three additions under a lock.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (last is +Inf), sum]
+        self._values: Dict[Tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = [(labels, list(c), s) for labels, (c, s) in self._values.items()]
+        names = (*self.labelnames, "le")
+        bounds = (*self.buckets, float("inf"))
+        for labels, counts, total in values:
+            cumulative = 0
+            for i, bound in enumerate(bounds):
+                cumulative += counts[i]
+                yield (
+                    f"{self.name}_bucket{_labels(names, (*labels, _number(bound)))}"
+                    f" {cumulative}"
+                )
+            suffix = _labels(self.labelnames, labels)
+            yield f"{self.name}_sum{suffix} {_number(total)}"
+            yield f"{self.name}_count{suffix} {cumulative}"
+
+
+# A collector returns (name, type, help, samples) families computed at scrape
+Collector = Callable[[], Iterable[Tuple[str, str, str, Iterable[str]]]]
+
+
+class Registry:
+    """Metrics rendered together in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: List = []
+        self._collectors: List[Collector] = []
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self, name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS
+    ) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Collector) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        families = [
+            (m.name, m.kind, m.documentation, m.samples()) for m in self._metrics
+        ]
+        for collector in self._collectors:
+            families.extend(collector())
+        lines = []
+        for name, kind, documentation, samples in families:
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.counter(
+    "http_requests_total",
+    "HTTP responses by route and status",
+    ("method", "route", "status"),
+)
+http_latency = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route")
+)
+http_db_queries = registry.histogram(
+    "http_request_db_queries",
+    "SQL statements executed per HTTP request",
+    ("route",),
+    QUERY_COUNT_BUCKETS,
+)
+http_db_time = registry.histogram(
+    "http_request_db_seconds", "Time spent in SQL per HTTP request", ("route",)
+)
+db_queries = registry.histogram(
+    "db_query_duration_seconds", "SQL statement execution time", ("engine",)
+)
+db_pool_wait = registry.histogram(
+    "db_pool_checkout_wait_seconds", "Time waited for a pooled connection", ("engine",)
+)
+rate_limit_rejections = registry.counter(
+    "rate_limit_rejections_total", "Requests rejected by the rate limiter", ("route",)
+)
+specialty_matches = registry.counter(
+    "specialty_matches_total",
+    "Symptom matches by what answered them (local, cache, shared, llm or fallback)",
+    ("source",),
+)
+specialty_fallbacks = registry.counter(
+    "specialty_match_fallbacks_total",
+    'Matches answered with "Internal Medicine" because the LLM failed or was unusable',
+    ("reason",),
+)
+llm_latency = registry.histogram(
+    "llm_request_duration_seconds",
+    "OpenAI request latency by outcome (ok, error or timeout)",
+    ("outcome",),
+)
+
+
+class RequestStats:
+    """SQL statements run on behalf of one request."""
+
+    __slots__ = ("queries", "query_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.query_seconds = 0.0
+
+
+# Stats of the request being handled; shared by reference with the worker
+# threads and greenlets it runs queries in
+request_stats_var: ContextVar[Optional[RequestStats]] = ContextVar(
+    "request_stats", default=None
+)
+
+
+def record_query(engine: str, seconds: float) -> None:
+    """Count a SQL statement towards the engine's and the current request's totals."""
+    db_queries.observe(seconds, engine)
+    stats = request_stats_var.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.query_seconds += seconds
+
+
+def stats_collector(sources: Dict[str, Callable[[], dict]]) -> Collector:
+    """
+    Expose components' ``stats()`` dicts as ``app_stat`` gauges.
+
+    Args:
+        sources: Component name -> function returning its stats. Nested keys
+            are joined with underscores; values that are not numbers are
+            skipped.
+    """
+
+    def flatten(values: dict, prefix: str = ""):
+        for key, value in values.items():
+            if isinstance(value, dict):
+                yield from flatten(value, f"{prefix}{key}_")
+            elif isinstance(value, (int, float)):
+                yield f"{prefix}{key}", int(value) if isinstance(value, bool) else value
+
+    def collect():
+        samples = [
+            f"app_stat{_labels(('component', 'stat'), (component, key))}"
+            f" {_number(value)}"
+            for component, stats in sources.items()
+            for key, value in flatten(stats())
+        ]
+        return [("app_stat", "gauge", "Component statistics", samples)]
+
+    return collect
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency, status and SQL usage per route.
+
+    Routes are labelled by their path template, so path parameters don't
+    create new series; unmatched paths share one label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        stats = RequestStats()
+        token = request_stats_var.set(stats)
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            request_stats_var.reset(token)
+            route = route_label(scope)
+            method = scope["method"]
+            http_latency.observe(elapsed, method, route)
+            http_requests.inc(method, route, status)
+            http_db_queries.observe(stats.queries, route)
+            http_db_time.observe(stats.query_seconds, route)
+
+
+def route_label(scope) -> str:
+    """Return the matched route's path template, or "unmatched"."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
@@ -0,0 +1,218 @@
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from math import floor
+from typing import Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from limits.storage.base import (
+    SlidingWindowCounterSupport,
+    Storage,
+    TimestampedSlidingWindow,
+)
+
+_MAGIC = b"DFRL0001"
+# magic, slot count
+_HEADER = struct.Struct("<8sQ")
+# key digest, expires at (Unix time), count
+_SLOT = struct.Struct("<16sdq")
+_EMPTY_DIGEST = bytes(16)
+
+DEFAULT_PATH = os.path.join(tempfile.gettempdir(), "doc_finder_rate_limit")
+DEFAULT_SLOTS = 65536
+# Slots examined per key before the soonest-expiring one is evicted
+PROBES = 8
+
+
+class SharedMemoryStorage(
+    Storage, SlidingWindowCounterSupport, TimestampedSlidingWindow
+):
+    """
+    Rate limit counters in a memory-mapped file shared by every worker on
+    the host.
+
+    The file is a fixed-size open-addressing hash table of (key digest,
+    expiry, count) slots. Each operation holds a ``lockf`` lock on the file
+    for a few microseconds, so workers see one counter per key instead of
+    one each. When all of a key's candidate slots are taken by live
+    counters, the one closest to expiry is evicted; size the table above
+    the number of distinct clients per window to avoid that.
+
+    URI: ``shm://`` for a file in the temp directory, or
+    ``shm:///path/to/file?slots=65536``.
+    """
+
+    STORAGE_SCHEME = ["shm"]
+
+    def __init__(
+        self, uri: Optional[str] = None, wrap_exceptions: bool = False, **options
+    ):
+        parsed = urlparse(uri or "shm://")
+        query = parse_qs(parsed.query)
+        self.path = parsed.path or DEFAULT_PATH
+        slots = int(options.pop("slots", query.get("slots", [DEFAULT_SLOTS])[0]))
+
+        self._thread_lock = threading.Lock()
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.lockf(self._fd, fcntl.LOCK_EX)
+        try:
+            header = os.pread(self._fd, _HEADER.size, 0)
+            if len(header) == _HEADER.size and header[:8] == _MAGIC:
+                # First worker to create the file decides its size
+                _, slots = _HEADER.unpack(header)
+            else:
+                os.ftruncate(self._fd, _HEADER.size + slots * _SLOT.size)
+                os.pwrite(self._fd, _HEADER.pack(_MAGIC, slots), 0)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN)
+        self.slots = slots
+        self._map = mmap.mmap(self._fd, _HEADER.size + slots * _SLOT.size)
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return (OSError, ValueError)
+
+    @contextmanager
+    def _locked(self):
+        # lockf excludes other processes (including forked ones), the thread
+        # lock other threads of this one
+        with self._thread_lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN)
+
+    def _locate(
+        self, key: str, now: float, create: bool
+    ) -> Tuple[Optional[int], bytes, int, float]:
+        """
+        Find the slot holding ``key``'s live counter.
+
+        Returns:
+            (offset, digest, count, expires_at). If there is no live counter,
+            count and expires_at are 0 and offset is the slot to create one
+            in, or None when ``create`` is false.
+        """
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        start = int.from_bytes(digest[:8], "little")
+        free = victim = None
+        victim_expiry = float("inf")
+        for probe in range(PROBES):
+            offset = _HEADER.size + ((start + probe) % self.slots) * _SLOT.size
+            slot_digest, expires_at, count = _SLOT.unpack_from(self._map, offset)
+            if expires_at <= now or slot_digest == _EMPTY_DIGEST:
+                if free is None:
+                    free = offset
+            elif slot_digest == digest:
+                return offset, digest, count, expires_at
+            elif expires_at < victim_expiry:
+                victim, victim_expiry = offset, expires_at
+        if not create:
+            return None, digest, 0, 0.0
+        return (free if free is not None else victim), digest, 0, 0.0
+
+    def _incr(
+        self, key: str, expiry: float, now: float, elastic_expiry: bool, amount: int
+    ) -> int:
+        offset, digest, count, expires_at = self._locate(key, now, create=True)
+        if not expires_at or elastic_expiry:
+            expires_at = now + expiry
+        count += amount
+        _SLOT.pack_into(self._map, offset, digest, expires_at, count)
+        return count
+
+    def _get(self, key: str, now: float) -> int:
+        return self._locate(key, now, create=False)[2]
+
+    def incr(
+        self, key: str, expiry: float, elastic_expiry: bool = False, amount: int = 1
+    ) -> int:
+        with self._locked():
+            return self._incr(key, expiry, time.time(), elastic_expiry, amount)
+
+    def decr(self, key: str, amount: int = 1) -> int:
+        with self._locked():
+            offset, digest, count, expires_at = self._locate(
+                key, time.time(), create=False
+            )
+            if offset is None:
+                return 0
+            count = max(count - amount, 0)
+            _SLOT.pack_into(self._map, offset, digest, expires_at, count)
+            return count
+
+    def get(self, key: str) -> int:
+        with self._locked():
+            return self._get(key, time.time())
+
+    def get_expiry(self, key: str) -> float:
+        now = time.time()
+        with self._locked():
+            expires_at = self._locate(key, now, create=False)[3]
+        return expires_at or now
+
+    def clear(self, key: str) -> None:
+        with self._locked():
+            offset = self._locate(key, time.time(), create=False)[0]
+            if offset is not None:
+                _SLOT.pack_into(self._map, offset, _EMPTY_DIGEST, 0.0, 0)
+
+    def check(self) -> bool:
+        return not self._map.closed
+
+    def reset(self) -> Optional[int]:
+        now = time.time()
+        cleared = 0
+        with self._locked():
+            for index in range(self.slots):
+                offset = _HEADER.size + index * _SLOT.size
+                if _SLOT.unpack_from(self._map, offset)[1] > now:
+                    cleared += 1
+            self._map[_HEADER.size :] = bytes(self.slots * _SLOT.size)
+        return cleared
+
+    def _sliding_window(
+        self, key: str, expiry: int, now: float
+    ) -> Tuple[str, int, float, int, float]:
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        previous_count = self._get(previous_key, now)
+        current_count = self._get(current_key, now)
+        previous_ttl = 0.0
+        if previous_count:
+            previous_ttl = (1 - (((now - expiry) / expiry) % 1)) * expiry
+        current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
+        return current_key, previous_count, previous_ttl, current_count, current_ttl
+
+    def acquire_sliding_window_entry(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> bool:
+        if amount > limit:
+            return False
+        now = time.time()
+        # Check and increment under one lock, so unlike the networked
+        # storages there is no race to undo
+        with self._locked():
+            current_key, previous_count, previous_ttl, current_count, _ = (
+                self._sliding_window(key, expiry, now)
+            )
+            weighted_count = previous_count * previous_ttl / expiry + current_count
+            if floor(weighted_count) + amount > limit:
+                return False
+            # The current window's counter is also next window's previous one
+            self._incr(current_key, 2 * expiry, now, False, amount)
+            return True
+
+    def get_sliding_window(
+        self, key: str, expiry: int
+    ) -> Tuple[int, float, int, float]:
+        now = time.time()
+        with self._locked():
+            return self._sliding_window(key, expiry, now)[1:]
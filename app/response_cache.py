@@ -0,0 +1,141 @@
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from app.api.doctors import models
+from app.cache import LRUCache
+from app.config.response_cache import (
+    CATALOG_VERSION_TTL_SECONDS,
+    RESPONSE_CACHE_MAX_AGE,
+    RESPONSE_CACHE_MAX_SIZE,
+)
+from app.database import ReadSessionLocal
+
+logger = logging.getLogger(__name__)
+
+CATALOG_STATE_ID = 1
+
+
+class ResponseCache:
+    """
+    Serialized responses of deterministic catalog queries, keyed by ETag.
+
+    An ETag is derived from the catalog version and the normalized query
+    parameters only, so a matching ``If-None-Match`` is answered without
+    touching the database. Bumping the catalog version changes every ETag,
+    which invalidates all cached responses at once.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = RESPONSE_CACHE_MAX_SIZE,
+        version_ttl: float = CATALOG_VERSION_TTL_SECONDS,
+        max_age: int = RESPONSE_CACHE_MAX_AGE,
+    ):
+        self.memory = LRUCache(maxsize=maxsize)
+        self.version_ttl = version_ttl
+        self.cache_control = f"public, max-age={max_age}, must-revalidate"
+        self._version: Optional[int] = None
+        self._version_read_at = 0.0
+        self._lock = threading.Lock()
+        self.not_modified = 0
+
+    def _cached_version(self) -> Optional[int]:
+        with self._lock:
+            if (
+                self._version is not None
+                and time.monotonic() - self._version_read_at < self.version_ttl
+            ):
+                return self._version
+            return None
+
+    def version(self) -> int:
+        """
+        Return the catalog version, re-reading it at most once per TTL.
+
+        Read from the replica the cached bodies are loaded from: a lagging
+        replica then reports the version of the rows it serves, and rows read
+        after the version are never older than it, so pre-write rows aren't
+        cached under a post-write ETag.
+        """
+        version = self._cached_version()
+        if version is not None:
+            return version
+
+        db = ReadSessionLocal()
+        try:
+            state = db.get(models.CatalogState, CATALOG_STATE_ID)
+            version = state.version if state is not None else 0
+        finally:
+            db.close()
+        with self._lock:
+            self._version, self._version_read_at = version, time.monotonic()
+        return version
+
+    async def aversion(self) -> int:
+        """Async ``version``; a stale version is re-read off the event loop."""
+        version = self._cached_version()
+        if version is not None:
+            return version
+        return await asyncio.to_thread(self.version)
+
+    @staticmethod
+    def etag(version: int, path: str, params: Dict[str, Any]) -> str:
+        """
+        Strong ETag of the response to ``path`` with ``params``.
+
+        Parameters that are None are dropped and the rest sorted, so
+        equivalent requests share an ETag regardless of parameter order.
+        """
+        normalized = {k: v for k, v in sorted(params.items()) if v is not None}
+        raw = json.dumps([path, normalized], separators=(",", ":"), default=str)
+        digest = hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+        return f'"{version}-{digest}"'
+
+    @staticmethod
+    def matches(etag: str, if_none_match: Optional[str]) -> bool:
+        """
+        Whether an ``If-None-Match`` header value matches ``etag``.
+
+        Comparison is weak, so the ``W/`` tag of a compressed response
+        matches too.
+        """
+        if not if_none_match:
+            return False
+        candidates = {
+            tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+        }
+        return "*" in candidates or etag in candidates
+
+    def get(self, etag: str) -> Optional[Tuple[bytes, Dict[str, str]]]:
+        """Return the cached (body, headers) for ``etag``, or None on a miss."""
+        return self.memory.get(etag)
+
+    def set(self, etag: str, body: bytes, headers: Dict[str, str]) -> None:
+        """Cache a serialized response body and its extra headers."""
+        self.memory.set(etag, (body, headers))
+
+    def invalidate(self) -> None:
+        """
+        Forget this worker's cached catalog version and responses.
+
+        Call after committing a version bump so the next request sees it.
+        """
+        with self._lock:
+            self._version = None
+        self.memory.clear()
+
+    def stats(self) -> dict:
+        """Return cache counters and the catalog version last seen."""
+        return {
+            **self.memory.stats(),
+            "not_modified": self.not_modified,
+            "catalog_version": self._version,
+        }
+
+
+response_cache = ResponseCache()
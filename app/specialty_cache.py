@@ -0,0 +1,161 @@
+import asyncio
+import hashlib
+import logging
+import re
+import unicodedata
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app.api.ai import models
+from app.cache import LRUCache
+from app.config.specialty_matching import (
+    SPECIALTY_CACHE_MAX_SIZE,
+    SPECIALTY_CACHE_PERSISTENT,
+    SPECIALTY_CACHE_TTL_SECONDS,
+)
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s]+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_symptoms(symptoms: str) -> str:
+    """
+    Fold case, punctuation and whitespace so equivalent queries share a key.
+
+    "Chest  pain!!" and "chest pain" both normalize to "chest pain".
+    """
+    text = unicodedata.normalize("NFKC", symptoms).casefold()
+    text = _PUNCTUATION_RE.sub(" ", text)
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+class SpecialtyCache:
+    """
+    Two-tier cache of symptom text -> semicolon-separated specialties.
+
+    The in-process LRU tier is always on. The optional persistent tier stores
+    entries in the ``specialty_cache`` table so they survive restarts and are
+    shared by every worker pointing at the same database.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = SPECIALTY_CACHE_MAX_SIZE,
+        ttl: int = SPECIALTY_CACHE_TTL_SECONDS,
+        persistent: bool = SPECIALTY_CACHE_PERSISTENT,
+    ):
+        self.ttl = ttl
+        self.persistent = persistent
+        self.memory = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.persistent_hits = 0
+        self.persistent_misses = 0
+
+    @staticmethod
+    def _key(normalized: str) -> str:
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def get(self, symptoms: str) -> Optional[str]:
+        """Return the cached specialties for ``symptoms``, or None on a miss."""
+        normalized = normalize_symptoms(symptoms)
+        cached = self.memory.get(normalized)
+        if cached is not None or not self.persistent:
+            return cached
+
+        cached = self._load(normalized)
+        if cached is None:
+            self.persistent_misses += 1
+            return None
+
+        self.persistent_hits += 1
+        self.memory.set(normalized, cached)
+        return cached
+
+    def set(self, symptoms: str, specialities: str) -> None:
+        """Cache the specialties matched for ``symptoms`` in every tier."""
+        normalized = normalize_symptoms(symptoms)
+        self.memory.set(normalized, specialities)
+        if self.persistent:
+            self._store(normalized, specialities)
+
+    async def aget(self, symptoms: str) -> Optional[str]:
+        """Async ``get``; the persistent tier is read off the event loop."""
+        if not self.persistent:
+            return self.get(symptoms)
+        return await asyncio.to_thread(self.get, symptoms)
+
+    async def aset(self, symptoms: str, specialities: str) -> None:
+        """Async ``set``; the persistent tier is written off the event loop."""
+        if not self.persistent:
+            self.set(symptoms, specialities)
+            return
+        await asyncio.to_thread(self.set, symptoms, specialities)
+
+    def flush(self) -> int:
+        """
+        Empty the cache.
+
+        The memory tier is cleared for this process only; other workers keep
+        their entries until they expire.
+
+        Returns:
+            Number of persistent entries removed
+        """
+        self.memory.clear()
+        if not self.persistent:
+            return 0
+
+        db = SessionLocal()
+        try:
+            deleted = db.query(models.SpecialtyCacheEntry).delete()
+            db.commit()
+            return deleted
+        finally:
+            db.close()
+
+    def stats(self) -> dict:
+        """Return hit/miss counters for both tiers."""
+        return {
+            "memory": self.memory.stats(),
+            "persistent": {
+                "enabled": self.persistent,
+                "hits": self.persistent_hits,
+                "misses": self.persistent_misses,
+            },
+        }
+
+    def _load(self, normalized: str) -> Optional[str]:
+        db = SessionLocal()
+        try:
+            entry = db.get(models.SpecialtyCacheEntry, self._key(normalized))
+            if entry is None or entry.expires_at <= datetime.utcnow():
+                return None
+            return entry.specialities
+        except Exception as e:
+            logger.warning("Specialty cache lookup failed: %s", e)
+            return None
+        finally:
+            db.close()
+
+    def _store(self, normalized: str, specialities: str) -> None:
+        db = SessionLocal()
+        try:
+            db.merge(
+                models.SpecialtyCacheEntry(
+                    query_key=self._key(normalized),
+                    query=normalized,
+                    specialities=specialities,
+                    expires_at=datetime.utcnow() + timedelta(seconds=self.ttl),
+                )
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning("Specialty cache write failed: %s", e)
+        finally:
+            db.close()
+
+
+specialty_cache = SpecialtyCache()
@@ -0,0 +1,750 @@
+import math
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.specialty_cache import normalize_symptoms
+
+# Symptom / synonym phrases for each specialty. Phrases are normalized the
+# same way as queries, so "x-ray" matches "X ray" and "x-ray".
+SYMPTOM_SYNONYMS: Dict[str, Tuple[str, ...]] = {
+    "Accident & Emergency": (
+        "emergency",
+        "accident",
+        "road accident",
+        "injury",
+        "trauma",
+        "unconscious",
+        "poisoning",
+        "collapsed",
+        "heavy bleeding",
+    ),
+    "Anesthesiology": (
+        "anesthesia",
+        "anaesthesia",
+        "anesthetist",
+        "sedation",
+        "pain medicine",
+        "chronic pain",
+        "pain management",
+    ),
+    "Blood Bank": (
+        "blood donation",
+        "donate blood",
+        "blood transfusion",
+        "transfusion",
+    ),
+    "Cardiac Surgery": (
+        "heart surgery",
+        "bypass surgery",
+        "cabg",
+        "valve replacement",
+        "heart valve",
+        "open heart",
+    ),
+    "Cardiology": (
+        "chest pain",
+        "heart",
+        "heart attack",
+        "palpitation",
+        "palpitations",
+        "high blood pressure",
+        "hypertension",
+        "blood pressure",
+        "irregular heartbeat",
+        "arrhythmia",
+        "angina",
+        "ecg",
+        "cholesterol",
+        "cardiac",
+    ),
+    "Cardiothoracic & Vascular Surgery": (
+        "varicose veins",
+        "aneurysm",
+        "vascular",
+        "blocked artery",
+        "lung surgery",
+        "thoracic surgery",
+    ),
+    "Child Development Centre": (
+        "autism",
+        "developmental delay",
+        "speech delay",
+        "adhd",
+        "learning disability",
+        "late walking",
+    ),
+    "Clinical & Aesthetic Dermatology": (
+        "aesthetic",
+        "botox",
+        "laser hair removal",
+        "pigmentation",
+        "melasma",
+        "wrinkles",
+        "dark spots",
+    ),
+    "Clinical Oncology & Radiotherapy": (
+        "radiotherapy",
+        "radiation therapy",
+        "chemotherapy",
+    ),
+    "Clinical Pathology": ("clinical pathology", "pathology report"),
+    "Colorectal & Laparoscopic Surgery": (
+        "piles",
+        "hemorrhoids",
+        "haemorrhoids",
+        "anal fissure",
+        "fissure",
+        "fistula",
+        "rectal bleeding",
+        "colorectal",
+    ),
+    "Counsellor": (
+        "counselling",
+        "counseling",
+        "stress",
+        "relationship problems",
+        "grief",
+    ),
+    "Critical Care": (
+        "icu",
+        "intensive care",
+        "ventilator",
+        "life support",
+        "critical condition",
+    ),
+    "Dental & Maxillofacial Surgery": (
+        "jaw",
+        "jaw pain",
+        "wisdom tooth",
+        "tooth extraction",
+        "facial fracture",
+        "maxillofacial",
+    ),
+    "Dental Surgery & Orthodontics": (
+        "braces",
+        "crooked teeth",
+        "orthodontic",
+        "teeth alignment",
+    ),
+    "Dermatology": (
+        "skin",
+        "rash",
+        "acne",
+        "pimples",
+        "eczema",
+        "itching",
+        "itchy skin",
+        "psoriasis",
+        "hives",
+        "hair loss",
+        "dandruff",
+        "fungal infection",
+        "ringworm",
+    ),
+    "Dermatology & Venereology": (
+        "sexually transmitted",
+        "std",
+        "sti",
+        "genital warts",
+        "genital sores",
+        "syphilis",
+        "gonorrhea",
+    ),
+    "Diabetology & Endocrinology": (
+        "diabetes",
+        "diabetic",
+        "blood sugar",
+        "high sugar",
+        "insulin",
+    ),
+    "Diagnostic & Interventional Radiology": (
+        "x ray",
+        "ct scan",
+        "mri",
+        "ultrasound",
+        "interventional radiology",
+    ),
+    "Dietetics & Nutrition": (
+        "diet",
+        "diet plan",
+        "weight loss",
+        "obesity",
+        "overweight",
+        "nutrition",
+        "weight gain",
+        "malnutrition",
+    ),
+    "ENT": (
+        "ear",
+        "ear pain",
+        "earache",
+        "hearing loss",
+        "nose",
+        "blocked nose",
+        "sinus",
+        "sinusitis",
+        "throat",
+        "sore throat",
+        "tonsils",
+        "tonsillitis",
+        "tinnitus",
+        "nosebleed",
+        "snoring",
+    ),
+    "Endocrinology": (
+        "thyroid",
+        "hormone",
+        "hormonal",
+        "goiter",
+        "hypothyroidism",
+        "hyperthyroidism",
+    ),
+    "Epileptologist & Neuromuscular Disorder Specialist": (
+        "epilepsy",
+        "seizure",
+        "seizures",
+        "fits",
+        "convulsion",
+        "convulsions",
+        "muscle weakness",
+        "neuromuscular",
+        "myasthenia",
+    ),
+    "Fertility Centre": (
+        "infertility",
+        "ivf",
+        "fertility",
+        "cannot conceive",
+        "trying to conceive",
+    ),
+    "Gastroenterology": (
+        "stomach",
+        "stomach pain",
+        "abdominal pain",
+        "tummy pain",
+        "acidity",
+        "gastric",
+        "ulcer",
+        "diarrhea",
+        "diarrhoea",
+        "loose motion",
+        "constipation",
+        "vomiting",
+        "nausea",
+        "bloating",
+        "indigestion",
+        "heartburn",
+        "gerd",
+        "ibs",
+    ),
+    "Gastroenterology & Hepatology": (
+        "jaundice",
+        "liver",
+        "hepatitis",
+        "fatty liver",
+        "endoscopy",
+        "colonoscopy",
+    ),
+    "General & Laparoscopic Surgery": (
+        "gallbladder",
+        "gallstone",
+        "gallstones",
+        "laparoscopic",
+        "hernia",
+        "appendix",
+        "appendicitis",
+    ),
+    "General Surgery": (
+        "lump",
+        "abscess",
+        "hernia",
+        "boil",
+        "cyst",
+        "wound",
+        "surgery",
+    ),
+    "Gynecology": (
+        "period",
+        "periods",
+        "menstrual",
+        "irregular periods",
+        "painful periods",
+        "vaginal discharge",
+        "white discharge",
+        "pcos",
+        "menopause",
+        "ovarian cyst",
+        "uterus",
+        "fibroid",
+        "pelvic pain",
+    ),
+    "Gynecology and Obstetrics": (
+        "pregnancy",
+        "pregnant",
+        "prenatal",
+        "antenatal",
+        "delivery",
+        "miscarriage",
+        "c section",
+        "caesarean",
+    ),
+    "HDU & Internal Medicine": ("hdu", "high dependency"),
+    "Haematology & Stem Cell Transplant": (
+        "bone marrow transplant",
+        "stem cell",
+        "leukemia",
+        "leukaemia",
+        "lymphoma",
+        "thalassemia",
+    ),
+    "Heart Failure & Interventional Cardiology": (
+        "heart failure",
+        "angioplasty",
+        "stent",
+        "angiogram",
+        "angiography",
+    ),
+    "Hematology": (
+        "anemia",
+        "anaemia",
+        "low hemoglobin",
+        "bleeding disorder",
+        "hemophilia",
+        "blood clot",
+        "platelet",
+        "low platelet",
+        "easy bruising",
+    ),
+    "Hepatobiliary Surgery": (
+        "bile duct",
+        "liver surgery",
+        "liver resection",
+        "liver tumor",
+    ),
+    "Hepatology & Gastroenterology": (
+        "liver disease",
+        "cirrhosis",
+        "hepatitis",
+        "jaundice",
+    ),
+    "Hip Centre": ("hip", "hip pain", "hip replacement"),
+    "Internal Medicine": (
+        "fever",
+        "cold",
+        "flu",
+        "fatigue",
+        "weakness",
+        "body ache",
+        "tiredness",
+        "general checkup",
+        "health checkup",
+        "typhoid",
+        "dengue",
+        "viral fever",
+        "infection",
+    ),
+    "Joint Care & Wellness Centre": (
+        "joint pain",
+        "knee pain",
+        "knee replacement",
+        "joint replacement",
+    ),
+    "Lab Medicine": ("blood test", "lab test", "urine test", "laboratory"),
+    "Liver & Pancreatic Diseases": (
+        "pancreatitis",
+        "pancreas",
+        "liver cirrhosis",
+    ),
+    "Microbiology & Infection Control": (
+        "culture test",
+        "infection control",
+        "antibiotic resistance",
+    ),
+    "NICU": ("premature baby", "preterm", "newborn intensive care"),
+    "Neonatology": (
+        "newborn",
+        "neonatal",
+        "neonate",
+        "newborn jaundice",
+    ),
+    "Nephrology": (
+        "kidney",
+        "kidney disease",
+        "kidney failure",
+        "dialysis",
+        "creatinine",
+        "protein in urine",
+    ),
+    "Neuroanesthesiology": ("neuroanesthesia", "neuroanaesthesia"),
+    "Neurology": (
+        "headache",
+        "migraine",
+        "dizziness",
+        "stroke",
+        "paralysis",
+        "numbness",
+        "tingling",
+        "memory loss",
+        "tremor",
+        "parkinson",
+        "brain",
+        "nerve pain",
+        "vertigo",
+        "fainting",
+    ),
+    "Neurosurgery": (
+        "brain tumor",
+        "brain tumour",
+        "spinal cord",
+        "spine surgery",
+        "slipped disc",
+        "disc prolapse",
+        "head injury",
+    ),
+    "Nuclear Medicine": (
+        "pet scan",
+        "bone scan",
+        "thyroid scan",
+        "radioactive iodine",
+    ),
+    "Oncology": (
+        "cancer",
+        "tumor",
+        "tumour",
+        "malignancy",
+        "chemotherapy",
+    ),
+    "Oncosurgery": ("cancer surgery", "tumor removal", "mastectomy"),
+    "Ophthalmology": (
+        "eye",
+        "eyes",
+        "eye pain",
+        "red eye",
+        "itchy eyes",
+        "vision",
+        "blurred vision",
+        "blurry vision",
+        "cataract",
+        "glaucoma",
+        "spectacles",
+    ),
+    "Oral & Dental Surgeon": (
+        "toothache",
+        "tooth pain",
+        "tooth",
+        "teeth",
+        "gum",
+        "gums",
+        "bleeding gums",
+        "cavity",
+        "dental",
+        "root canal",
+        "mouth ulcer",
+    ),
+    "Orthopedics": (
+        "bone",
+        "bones",
+        "fracture",
+        "broken bone",
+        "back pain",
+        "sprain",
+        "ligament",
+        "shoulder pain",
+        "neck pain",
+        "joint",
+    ),
+    "Paediatric Surgery": (
+        "child surgery",
+        "paediatric surgery",
+        "undescended testis",
+        "hypospadias",
+        "circumcision",
+    ),
+    "Pancreatic and Liver Transplant": (
+        "liver transplant",
+        "pancreas transplant",
+    ),
+    "Pathology & Laboratory Medicine": ("biopsy", "histopathology"),
+    "Pathology Laboratory": ("pathology", "biopsy"),
+    "Pediatric Surgery": (
+        "child surgery",
+        "pediatric surgery",
+        "undescended testis",
+        "hypospadias",
+    ),
+    "Pediatrics": (
+        "child",
+        "children",
+        "baby",
+        "kid",
+        "kids",
+        "infant",
+        "toddler",
+        "vaccination",
+        "vaccine",
+    ),
+    "Physical Medicine": (
+        "physiotherapy",
+        "physical therapy",
+        "rehabilitation",
+        "stiffness",
+        "frozen shoulder",
+    ),
+    "Plastic Surgery": (
+        "burn",
+        "burns",
+        "scar",
+        "cleft lip",
+        "cleft palate",
+        "skin graft",
+    ),
+    "Psychiatry": (
+        "depression",
+        "anxiety",
+        "insomnia",
+        "sleeplessness",
+        "panic attack",
+        "bipolar",
+        "schizophrenia",
+        "hallucination",
+        "hallucinations",
+        "suicidal",
+        "addiction",
+        "ocd",
+        "mental health",
+        "feeling sad",
+        "sadness",
+        "cannot sleep",
+        "sleep problem",
+    ),
+    "Psychologist": (
+        "psychotherapy",
+        "behavior problems",
+        "behaviour problems",
+        "talk therapy",
+    ),
+    "Radiology & Imaging": ("imaging", "ultrasonography", "x ray"),
+    "Reconstructive & Cosmetic Surgery": (
+        "cosmetic surgery",
+        "liposuction",
+        "rhinoplasty",
+        "nose job",
+        "breast augmentation",
+        "tummy tuck",
+    ),
+    "Respiratory Medicine": (
+        "cough",
+        "asthma",
+        "breathing difficulty",
+        "difficulty breathing",
+        "shortness of breath",
+        "breathlessness",
+        "wheezing",
+        "tuberculosis",
+        "tb",
+        "pneumonia",
+        "copd",
+        "lung",
+        "lungs",
+        "chest infection",
+    ),
+    "Rheumatology": (
+        "arthritis",
+        "rheumatoid",
+        "lupus",
+        "gout",
+        "joint swelling",
+        "autoimmune",
+        "ankylosing",
+    ),
+    "Urology": (
+        "urine",
+        "urinary",
+        "urinary infection",
+        "uti",
+        "kidney stone",
+        "burning urination",
+        "frequent urination",
+        "blood in urine",
+        "prostate",
+        "bladder",
+        "erectile dysfunction",
+    ),
+}
+
+
+class AhoCorasick:
+    """
+    Multi-pattern matcher that finds every pattern occurrence in one pass.
+
+    Patterns are matched on whole words only, and overlapping hits are
+    resolved leftmost-longest, so "chest pain" wins over "chest".
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for pattern in patterns:
+            self._add(pattern)
+        self._build_failure_links()
+
+    def _add(self, pattern: str) -> None:
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(len(self.patterns))
+        self.patterns.append(pattern)
+
+    def _build_failure_links(self) -> None:
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    def find(self, text: str) -> List[int]:
+        """Return the indexes of the patterns found in ``text``."""
+        hits = []
+        state = 0
+        for end, char in enumerate(text, 1):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for index in self._output[state]:
+                start = end - len(self.patterns[index])
+                if (start == 0 or not text[start - 1].isalnum()) and (
+                    end == len(text) or not text[end].isalnum()
+                ):
+                    hits.append((start, -end, index))
+
+        found = []
+        covered = 0
+        for start, neg_end, index in sorted(hits):
+            if start >= covered:
+                found.append(index)
+                covered = -neg_end
+        return found
+
+
+def _char_ngrams(text: str, n: int = 3) -> Dict[str, int]:
+    grams: Dict[str, int] = defaultdict(int)
+    for word in text.split():
+        padded = f" {word} "
+        for i in range(len(padded) - n + 1):
+            grams[padded[i : i + n]] += 1
+    return grams
+
+
+class SpecialtyClassifier:
+    """
+    Offline symptom -> specialty classifier.
+
+    Scores each specialty by the synonym phrases found in the query plus the
+    TF-IDF cosine similarity of character trigrams between the query and the
+    specialty's name and phrases, which tolerates typos and word forms
+    ("cardiologist", "opthalmology").
+    """
+
+    def __init__(
+        self,
+        specialities: Iterable[str],
+        synonyms: Optional[Dict[str, Tuple[str, ...]]] = None,
+    ):
+        synonyms = SYMPTOM_SYNONYMS if synonyms is None else synonyms
+        self.specialities = list(specialities)
+
+        phrase_specialities: Dict[str, List[int]] = defaultdict(list)
+        documents = []
+        for index, speciality in enumerate(self.specialities):
+            phrases = {normalize_symptoms(speciality)}
+            phrases.update(
+                normalize_symptoms(part)
+                for part in speciality.replace(" and ", " & ").split("&")
+            )
+            phrases.update(normalize_symptoms(p) for p in synonyms.get(speciality, ()))
+            phrases.discard("")
+            for phrase in phrases:
+                phrase_specialities[phrase].append(index)
+            documents.append(" ".join(sorted(phrases)))
+
+        self._phrases = list(phrase_specialities)
+        self._phrase_specialities = [phrase_specialities[p] for p in self._phrases]
+        self._matcher = AhoCorasick(self._phrases)
+
+        # Inverted index of trigram -> [(speciality index, tf-idf weight)]
+        document_grams = [_char_ngrams(document) for document in documents]
+        document_frequency: Dict[str, int] = defaultdict(int)
+        for grams in document_grams:
+            for gram in grams:
+                document_frequency[gram] += 1
+
+        total = len(documents)
+        self._idf = {
+            gram: math.log(total / df) + 1.0 for gram, df in document_frequency.items()
+        }
+        self._max_idf = max(self._idf.values(), default=1.0)
+        self._postings: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+        for index, grams in enumerate(document_grams):
+            weights = {gram: tf * self._idf[gram] for gram, tf in grams.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            for gram, weight in weights.items():
+                self._postings[gram].append((index, weight / norm))
+
+    def _similarities(self, text: str) -> Dict[int, float]:
+        grams = _char_ngrams(text)
+        # Unknown trigrams still count towards the query norm, so long unrelated
+        # text scores low instead of matching on a single shared trigram.
+        weights = {
+            gram: tf * self._idf.get(gram, self._max_idf) for gram, tf in grams.items()
+        }
+        norm = math.sqrt(sum(w * w for w in weights.values()))
+        if not norm:
+            return {}
+
+        scores: Dict[int, float] = defaultdict(float)
+        for gram, weight in weights.items():
+            for index, doc_weight in self._postings.get(gram, ()):
+                scores[index] += weight * doc_weight
+        return {index: score / norm for index, score in scores.items()}
+
+    def classify(self, text: str, top_k: int = 3) -> List[Tuple[str, float]]:
+        """
+        Rank specialties for a free-text symptom description.
+
+        Args:
+            text: User's health query or symptoms
+            top_k: Maximum number of specialties to return
+
+        Returns:
+            List of (specialty, confidence) pairs, best first. Confidence is in
+            [0, 1]; one clear synonym hit scores about 0.7.
+        """
+        normalized = normalize_symptoms(text)
+        if not normalized:
+            return []
+
+        scores = self._similarities(normalized)
+        for phrase_index in self._matcher.find(normalized):
+            for index in self._phrase_specialities[phrase_index]:
+                scores[index] = scores.get(index, 0.0) + 1.0
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return [
+            (self.specialities[index], round(1.0 - math.exp(-score), 4))
+            for index, score in ranked[:top_k]
+            if score > 0
+        ]
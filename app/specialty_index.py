@@ -0,0 +1,109 @@
+from collections import defaultdict
+from difflib import SequenceMatcher
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterable, List, Optional, Union
+
+
+def _trigrams(text: str) -> FrozenSet[str]:
+    padded = f"  {text} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+class SpecialtyIndex:
+    """
+    Immutable lookup index over a specialty vocabulary, built once.
+
+    Exact (case-insensitive) names resolve through a lowercase -> canonical
+    map. Anything else goes through a character-trigram inverted index that
+    narrows the vocabulary to a handful of candidates, which are then scored
+    with the same ``SequenceMatcher`` ratio ``difflib.get_close_matches`` uses.
+    """
+
+    __slots__ = ("specialities", "_canonical", "_exact", "_postings", "_gram_counts")
+
+    def __init__(self, specialities: Iterable[str]):
+        self.specialities = tuple(dict.fromkeys(specialities))
+        self._canonical = frozenset(self.specialities)
+        self._exact = MappingProxyType({s.lower(): s for s in self.specialities})
+
+        postings: Dict[str, List[int]] = defaultdict(list)
+        gram_counts = []
+        for index, specialty in enumerate(self.specialities):
+            grams = _trigrams(specialty.lower())
+            gram_counts.append(len(grams))
+            for gram in grams:
+                postings[gram].append(index)
+        self._postings = MappingProxyType(
+            {gram: tuple(indexes) for gram, indexes in postings.items()}
+        )
+        self._gram_counts = tuple(gram_counts)
+
+    def __contains__(self, specialty: str) -> bool:
+        return specialty in self._canonical
+
+    def closest(
+        self, specialty: str, cutoff: float = 0.6, candidates: int = 5
+    ) -> Optional[str]:
+        """
+        Return the canonical specialty closest to ``specialty``.
+
+        Args:
+            specialty: Possibly misspelled or differently cased specialty name
+            cutoff: Minimum similarity ratio, as in ``get_close_matches``
+            candidates: Number of trigram candidates to score exactly
+
+        Returns:
+            The canonical specialty name, or None if nothing is close enough
+        """
+        name = specialty.strip().lower()
+        exact = self._exact.get(name)
+        if exact is not None:
+            return exact
+
+        grams = _trigrams(name)
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for index in self._postings.get(gram, ()):
+                shared[index] += 1
+        if not shared:
+            return None
+
+        # Dice coefficient on trigram sets picks the few names worth scoring
+        ranked = sorted(
+            shared,
+            key=lambda i: 2 * shared[i] / (len(grams) + self._gram_counts[i]),
+            reverse=True,
+        )[:candidates]
+
+        best, best_ratio = None, 0.0
+        matcher = SequenceMatcher(b=name)
+        for index in ranked:
+            candidate = self.specialities[index]
+            matcher.set_seq1(candidate.lower())
+            ratio = matcher.ratio()
+            if ratio >= cutoff and ratio > best_ratio:
+                best, best_ratio = candidate, ratio
+        return best
+
+    def validate(self, suggestions: Union[str, Iterable[str]]) -> List[str]:
+        """
+        Resolve a list of suggested specialties to canonical names in one pass.
+
+        Args:
+            suggestions: Semicolon-separated string or iterable of names
+
+        Returns:
+            Canonical names in suggestion order, without duplicates; names
+            that match nothing are dropped
+        """
+        if isinstance(suggestions, str):
+            suggestions = suggestions.split(";")
+
+        validated: Dict[str, None] = {}
+        for suggestion in suggestions:
+            if not suggestion.strip():
+                continue
+            specialty = self.closest(suggestion)
+            if specialty is not None:
+                validated[specialty] = None
+        return list(validated)
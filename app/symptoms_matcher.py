@@ -1,13 +1,38 @@
+import asyncio
+import functools
+import json
 import logging
 import os
-from difflib import get_close_matches
+import time
+from typing import Dict, List, Optional, Tuple
 
-import openai
+from app import metrics
+from app.config.specialty_matching import (
+    LLM_BATCH_SIZE,
+    LLM_MAX_CONCURRENCY,
+    LLM_TIMEOUT_SECONDS,
+    LOCAL_CLASSIFIER_THRESHOLD,
+)
+from app.specialty_cache import normalize_symptoms, specialty_cache
+from app.specialty_classifier import SpecialtyClassifier
+from app.specialty_index import SpecialtyIndex
 
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-openai.api_key = os.getenv("OPENAI_API_KEY")
+
+@functools.lru_cache(maxsize=None)
+def _openai():
+    """
+    Import and configure the OpenAI SDK on first use.
+
+    It (with aiohttp and requests) is most of the app's import time, and
+    searches answered by the local classifier or the cache never need it.
+    """
+    import openai
+
+    openai.api_key = os.getenv("OPENAI_API_KEY")
+    return openai
+
 
 speciality_list = [
     "Accident & Emergency",
@@ -81,73 +106,384 @@ speciality_list = [
     "Urology",
 ]
 
+specialty_index = SpecialtyIndex(speciality_list)
+local_classifier = SpecialtyClassifier(speciality_list)
+
 
 def find_closest_specialty(specialty):
     """
     Find the closest matching specialty from our predefined list
     """
-    matches = get_close_matches(
-        specialty.lower(), [s.lower() for s in speciality_list], n=1, cutoff=0.6
-    )
-    if matches:
-        # Return the original casing from speciality_list
-        return next(s for s in speciality_list if s.lower() == matches[0])
-    return None
+    return specialty_index.closest(specialty)
+
+
+def match_specialization_locally(symptoms, threshold=LOCAL_CLASSIFIER_THRESHOLD):
+    """
+    Match symptoms with the offline classifier.
+
+    Returns semicolon-separated specialties scoring at least ``threshold``, or
+    None when the classifier is not confident enough.
+    """
+    ranked = local_classifier.classify(symptoms)
+    if not ranked or ranked[0][1] < threshold:
+        return None
+    return ";".join(specialty for specialty, score in ranked if score >= threshold)
 
 
 def match_specialization(symptoms):
     """
     Use OpenAI's GPT model to analyze symptoms and recommend medical specializations
-    from our predefined list of specialties
+    from our predefined list of specialties.
+
+    Confident local classifier matches skip the model entirely, and model
+    results are memoized in ``specialty_cache`` keyed on the normalized
+    symptom text, so repeated queries skip the OpenAI round-trip.
     """
+    local = match_specialization_locally(symptoms)
+    if local is not None:
+        logger.debug("Local classifier match: %s", local)
+        metrics.specialty_matches.inc("local")
+        return local
+
+    cached = specialty_cache.get(symptoms)
+    if cached is not None:
+        logger.debug("Specialty cache hit: %s", cached)
+        metrics.specialty_matches.inc("cache")
+        return cached
+
+    started = time.perf_counter()
     try:
-        # Craft a detailed prompt for the model
-        available_specialties = ", ".join(speciality_list)
-        prompt = f"""You are a medical expert assistant. Based on the following symptoms, 
-        recommend the most appropriate medical specialization(s) from this list of available specialties:
-        {available_specialties}
-
-        Patient's symptoms: {symptoms}
-
-        Provide only the name of the medical specialization exactly as written in the list above. 
-        If multiple specializations are equally relevant, list them in order of priority, separated by semicolons.
-        Do not include any explanations or additional text. Only use specializations from the provided list."""
-
-        response = openai.ChatCompletion.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a medical expert assistant that recommends appropriate medical specializations based on symptoms.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.7,
-            max_tokens=100,
+        response = _openai().ChatCompletion.create(
+            **_build_request(symptoms), request_timeout=LLM_TIMEOUT_SECONDS
         )
+    except Exception as e:
+        metrics.llm_latency.observe(time.perf_counter() - started, "error")
+        logger.error("Error in match_specialization: %s", e)
+        return _fallback("error")
+    metrics.llm_latency.observe(time.perf_counter() - started, "ok")
+    try:
+        specialities = _parse_response(response)
+    except Exception as e:
+        logger.error("Error in match_specialization: %s", e)
+        return _fallback("error")
+
+    metrics.specialty_matches.inc("llm")
+    specialty_cache.set(symptoms, specialities)
+    return specialities
 
-        suggested_specialties = (
-            response.choices[0].message["content"].strip().split(";")
+
+async def match_specialization_async(symptoms):
+    """
+    Async counterpart of ``match_specialization`` for use from async routes.
+
+    Concurrent calls for the same normalized symptoms share a single upstream
+    request, at most ``LLM_MAX_CONCURRENCY`` requests run at once per worker,
+    and a call that takes longer than ``LLM_TIMEOUT_SECONDS`` (queueing
+    included) falls back to Internal Medicine.
+    """
+    local = match_specialization_locally(symptoms)
+    if local is not None:
+        logger.debug("Local classifier match: %s", local)
+        metrics.specialty_matches.inc("local")
+        return local
+
+    cached = await specialty_cache.aget(symptoms)
+    if cached is not None:
+        logger.debug("Specialty cache hit: %s", cached)
+        metrics.specialty_matches.inc("cache")
+        return cached
+
+    key = normalize_symptoms(symptoms)
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_match_uncached_async(symptoms))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    else:
+        logger.debug("Joining in-flight specialty match for: %s", key)
+        metrics.specialty_matches.inc("shared")
+
+    # Shield the shared task so one disconnected caller can't cancel the others
+    return await asyncio.shield(task)
+
+
+_inflight: dict[str, "asyncio.Future[str]"] = {}
+_llm_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def _get_llm_semaphore() -> asyncio.Semaphore:
+    global _llm_semaphore
+    if _llm_semaphore is None:
+        _llm_semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+    return _llm_semaphore
+
+
+async def _match_uncached_async(symptoms):
+    try:
+        specialities = await asyncio.wait_for(
+            _query_specialization_async(symptoms), timeout=LLM_TIMEOUT_SECONDS
         )
+    except asyncio.TimeoutError:
+        logger.error("Specialty match timed out after %ss", LLM_TIMEOUT_SECONDS)
+        return _fallback("timeout")
+    except Exception as e:
+        logger.error("Error in match_specialization_async: %s", e)
+        return _fallback("error")
+
+    metrics.specialty_matches.inc("llm")
+    await specialty_cache.aset(symptoms, specialities)
+    return specialities
+
+
+async def _query_specialization_async(symptoms):
+    async with _get_llm_semaphore():
+        started = time.perf_counter()
+        # Cancelled by wait_for in _match_uncached_async when it times out
+        outcome = "timeout"
+        try:
+            response = await _openai().ChatCompletion.acreate(
+                **_build_request(symptoms), request_timeout=LLM_TIMEOUT_SECONDS
+            )
+            outcome = "ok"
+        except Exception:
+            outcome = "error"
+            raise
+        finally:
+            metrics.llm_latency.observe(time.perf_counter() - started, outcome)
+    return _parse_response(response)
+
 
-        validated_specialties = []
-        for specialty in suggested_specialties:
-            specialty = specialty.strip()
-            if specialty in speciality_list:
-                validated_specialties.append(specialty)
-            else:
-                closest_match = find_closest_specialty(specialty)
-                if closest_match:
-                    validated_specialties.append(closest_match)
+async def match_specializations_batch_async(
+    queries: List[str],
+) -> List[Tuple[str, str]]:
+    """
+    Match many symptom descriptions, asking the LLM as few times as possible.
+
+    Queries are deduplicated on their normalized text. Each distinct query is
+    answered by the local classifier, the cache or an upstream request already
+    in flight when possible; the rest are classified ``LLM_BATCH_SIZE`` per
+    ChatCompletion call. A call that fails or times out falls back to Internal
+    Medicine for its queries only.
+
+    Args:
+        queries: Symptom descriptions, duplicates allowed
+
+    Returns:
+        (semicolon-separated specialties, source) per query, in order; source
+        is local, cache, shared, llm or fallback
+    """
+    distinct: Dict[str, str] = {}
+    for symptoms in queries:
+        distinct.setdefault(normalize_symptoms(symptoms), symptoms)
 
-        logger.debug(f"Validated specialties: {validated_specialties}")
+    answers: Dict[str, Tuple[str, str]] = {}
+    shared: Dict[str, "asyncio.Future[str]"] = {}
+    pending: Dict[str, str] = {}
+    for key, symptoms in distinct.items():
+        local = match_specialization_locally(symptoms)
+        if local is not None:
+            metrics.specialty_matches.inc("local")
+            answers[key] = (local, "local")
+            continue
+        cached = await specialty_cache.aget(symptoms)
+        if cached is not None:
+            metrics.specialty_matches.inc("cache")
+            answers[key] = (cached, "cache")
+            continue
+        if key in _inflight:
+            metrics.specialty_matches.inc("shared")
+            shared[key] = _inflight[key]
+            continue
+        pending[key] = symptoms
 
-        if not validated_specialties:
-            logger.debug("No valid specialties found, returning Internal Medicine")
-            return "Internal Medicine"
+    loop = asyncio.get_running_loop()
+    keys = list(pending)
+    chunks = []
+    for start in range(0, len(keys), LLM_BATCH_SIZE):
+        chunk = {key: pending[key] for key in keys[start : start + LLM_BATCH_SIZE]}
+        # Single matches of the same symptoms join the batch's request
+        futures = {key: loop.create_future() for key in chunk}
+        for key, future in futures.items():
+            _inflight[key] = future
+            future.add_done_callback(lambda _, key=key: _inflight.pop(key, None))
+        chunks.append(
+            asyncio.ensure_future(_match_batch_uncached_async(chunk, futures))
+        )
+
+    if chunks:
+        # Shielded so one disconnected caller can't cancel requests others joined
+        for chunk_answers in await asyncio.shield(asyncio.gather(*chunks)):
+            answers.update(chunk_answers)
+    for key, task in shared.items():
+        answers[key] = (await asyncio.shield(task), "shared")
+
+    return [answers[normalize_symptoms(symptoms)] for symptoms in queries]
 
-        return ";".join(validated_specialties)
 
+async def _match_batch_uncached_async(
+    chunk: Dict[str, str], futures: Dict[str, "asyncio.Future[str]"]
+) -> Dict[str, Tuple[str, str]]:
+    """Classify ``chunk`` (normalized -> symptoms) in one LLM call."""
+    specialities: List[Optional[str]] = []
+    reason = None
+    try:
+        specialities = await asyncio.wait_for(
+            _query_batch_async(list(chunk.values())), timeout=LLM_TIMEOUT_SECONDS
+        )
+    except asyncio.TimeoutError:
+        logger.error("Batch specialty match timed out after %ss", LLM_TIMEOUT_SECONDS)
+        reason = "timeout"
     except Exception as e:
-        logger.error(f"Error in match_specialization: {str(e)}")
+        logger.error("Error in match_specializations_batch_async: %s", e)
+        reason = "error"
+
+    answers = {}
+    for index, key in enumerate(chunk):
+        if reason is not None:
+            answers[key] = (_fallback(reason), "fallback")
+        elif specialities[index] is None:
+            # The model left this query out
+            answers[key] = (_fallback("invalid_response"), "fallback")
+        else:
+            metrics.specialty_matches.inc("llm")
+            answers[key] = (specialities[index], "llm")
+        futures[key].set_result(answers[key][0])
+
+    for key, (matched, source) in answers.items():
+        if source == "llm":
+            await specialty_cache.aset(chunk[key], matched)
+    return answers
+
+
+async def _query_batch_async(symptoms_list):
+    async with _get_llm_semaphore():
+        started = time.perf_counter()
+        outcome = "timeout"
+        try:
+            response = await _openai().ChatCompletion.acreate(
+                **_build_batch_request(symptoms_list),
+                request_timeout=LLM_TIMEOUT_SECONDS,
+            )
+            outcome = "ok"
+        except Exception:
+            outcome = "error"
+            raise
+        finally:
+            metrics.llm_latency.observe(time.perf_counter() - started, outcome)
+    return _parse_batch_response(response, len(symptoms_list))
+
+
+def _fallback(reason):
+    """Count a match the LLM couldn't answer and return the default specialty."""
+    metrics.specialty_matches.inc("fallback")
+    metrics.specialty_fallbacks.inc(reason)
+    return "Internal Medicine"
+
+
+def _build_request(symptoms):
+    """Build the ChatCompletion arguments asking for the symptoms' specializations."""
+    # Craft a detailed prompt for the model
+    available_specialties = ", ".join(speciality_list)
+    prompt = f"""You are a medical expert assistant. Based on the following symptoms, 
+    recommend the most appropriate medical specialization(s) from this list of available specialties:
+    {available_specialties}
+
+    Patient's symptoms: {symptoms}
+
+    Provide only the name of the medical specialization exactly as written in the list above. 
+    If multiple specializations are equally relevant, list them in order of priority, separated by semicolons.
+    Do not include any explanations or additional text. Only use specializations from the provided list."""
+
+    return {
+        "model": "gpt-4o-mini",
+        "messages": [
+            {
+                "role": "system",
+                "content": "You are a medical expert assistant that recommends appropriate medical specializations based on symptoms.",
+            },
+            {"role": "user", "content": prompt},
+        ],
+        "temperature": 0.7,
+        "max_tokens": 100,
+    }
+
+
+def _build_batch_request(symptoms_list):
+    """Build the ChatCompletion arguments classifying several queries at once."""
+    available_specialties = ", ".join(speciality_list)
+    numbered = "\n".join(
+        f"{number}. {symptoms}" for number, symptoms in enumerate(symptoms_list, 1)
+    )
+    prompt = f"""You are a medical expert assistant. For each numbered patient query below,
+    recommend the most appropriate medical specialization(s) from this list of available specialties:
+    {available_specialties}
+
+    Patient queries:
+    {numbered}
+
+    Respond with a JSON object mapping each query number to a list of specializations
+    written exactly as in the list above, most relevant first, for example
+    {{"1": ["Cardiology"], "2": ["Dermatology", "Internal Medicine"]}}.
+    Do not include any explanations or additional text. Only use specializations from the provided list."""
+
+    return {
+        "model": "gpt-4o-mini",
+        "messages": [
+            {
+                "role": "system",
+                "content": "You are a medical expert assistant that recommends appropriate medical specializations based on symptoms.",
+            },
+            {"role": "user", "content": prompt},
+        ],
+        "temperature": 0.7,
+        # About as much per query as a single match may use
+        "max_tokens": 50 * len(symptoms_list) + 20,
+        "response_format": {"type": "json_object"},
+    }
+
+
+def _parse_batch_response(response, count):
+    """
+    Validate a batch answer against ``speciality_list``.
+
+    Returns:
+        Semicolon-separated specialties per query, or None for queries the
+        model left out
+    """
+    content = response.choices[0].message["content"].strip()
+    if content.startswith("```"):
+        content = content.strip("`").removeprefix("json")
+    answers = json.loads(content)
+    if not isinstance(answers, dict):
+        raise ValueError(f"expected a JSON object, got {type(answers).__name__}")
+
+    specialities = []
+    for number in range(1, count + 1):
+        suggestions = answers.get(str(number))
+        if not isinstance(suggestions, (list, str)):
+            specialities.append(None)
+            continue
+        if isinstance(suggestions, list):
+            suggestions = [s for s in suggestions if isinstance(s, str)]
+        validated = specialty_index.validate(suggestions)
+        if not validated:
+            metrics.specialty_fallbacks.inc("invalid_response")
+            validated = ["Internal Medicine"]
+        specialities.append(";".join(validated))
+    return specialities
+
+
+def _parse_response(response):
+    """Validate the model's suggestions against ``speciality_list``."""
+    validated_specialties = specialty_index.validate(
+        response.choices[0].message["content"].strip()
+    )
+
+    logger.debug("Validated specialties: %s", validated_specialties)
+
+    if not validated_specialties:
+        logger.debug("No valid specialties found, returning Internal Medicine")
+        metrics.specialty_fallbacks.inc("invalid_response")
         return "Internal Medicine"
+
+    return ";".join(validated_specialties)
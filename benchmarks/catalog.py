@@ -0,0 +1,130 @@
+"""
+Synthetic doctor catalogs shaped like doctor_data/merged_doctors_list_v2.json.
+
+Specialties follow the scraped file's frequencies and description lengths are
+drawn from the scraped descriptions, so filters and row sizes behave like
+production at any size.
+
+    python -m benchmarks.catalog --rows 100000 --output /tmp/doctors_100k.json
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+from collections import Counter
+from itertools import accumulate
+from typing import Dict, Iterator, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_PATH = os.path.join(ROOT, "doctor_data", "merged_doctors_list_v2.json")
+
+
+class CatalogShape:
+    """Distributions measured from the scraped catalog."""
+
+    def __init__(self, path: str = SOURCE_PATH):
+        with open(path, encoding="utf-8") as f:
+            records = json.load(f)
+
+        counts = Counter(r["specialty"] for r in records if r.get("specialty"))
+        self.specialties = [s for s, _ in counts.most_common()]
+        self.cumulative_weights = list(accumulate(counts[s] for s in self.specialties))
+
+        self.description_lengths = [len(r.get("description") or "") for r in records]
+        self.sentences = [
+            sentence.strip()
+            for r in records
+            for sentence in re.split(r"(?<=\.)\s+", r.get("description") or "")
+            if sentence.strip()
+        ]
+        names = [r["name"].split() for r in records if r.get("name")]
+        self.honorifics = sorted({n[0] for n in names if n[0].endswith(".")})
+        self.given_names = sorted({n[1] for n in names if len(n) > 2})
+        self.family_names = sorted({n[-1] for n in names if len(n) > 1})
+        self.degrees = [
+            r["educationalDegree"] for r in records if r.get("educationalDegree")
+        ]
+        self.titles = [r["title"].split(",")[0] for r in records if r.get("title")]
+        self.clinics = sorted({c for r in records for c in r.get("clinics") or []})
+        self.sources = sorted({r["dataSource"] for r in records if r.get("dataSource")})
+
+    def description(self, rng: random.Random) -> str:
+        length = rng.choice(self.description_lengths)
+        parts: List[str] = []
+        size = 0
+        while size < length:
+            sentence = rng.choice(self.sentences)
+            parts.append(sentence)
+            size += len(sentence) + 1
+        return " ".join(parts)[:length].rsplit(" ", 1)[0] if length else ""
+
+    def record(self, index: int, rng: random.Random) -> Dict:
+        specialty = rng.choices(self.specialties, cum_weights=self.cumulative_weights)[
+            0
+        ]
+        # The index keeps (name, specialty) unique, as the import requires
+        name = (
+            f"{rng.choice(self.honorifics)} {rng.choice(self.given_names)} "
+            f"{rng.choice(self.family_names)} {index}"
+        )
+        return {
+            "id": index,
+            "name": name,
+            "educationalDegree": rng.choice(self.degrees),
+            "title": f"{rng.choice(self.titles)}, {specialty}",
+            "image": f"{index}.jpg",
+            "description": self.description(rng),
+            "location": "Dhaka",
+            "clinics": [rng.choice(self.clinics)],
+            "chambers": [],
+            "dataScrappedAt": "2025-02-12",
+            "dataSource": rng.choice(self.sources),
+            "specialty": specialty,
+        }
+
+
+def generate(rows: int, seed: int = 0, shape: CatalogShape = None) -> Iterator[Dict]:
+    """Yield ``rows`` synthetic doctor records, the same ones for a given seed."""
+    shape = shape or CatalogShape()
+    rng = random.Random(seed)
+    for index in range(1, rows + 1):
+        yield shape.record(index, rng)
+
+
+def write_catalog(path: str, rows: int, seed: int = 0) -> str:
+    """
+    Write a catalog of ``rows`` records to ``path`` as a JSON array.
+
+    Records are streamed, so memory use doesn't grow with ``rows``. An
+    existing file is reused; the name should encode rows and seed.
+
+    Returns:
+        ``path``
+    """
+    if os.path.exists(path):
+        return path
+    partial = f"{path}.partial"
+    with open(partial, "w", encoding="utf-8") as f:
+        f.write("[")
+        for i, record in enumerate(generate(rows, seed)):
+            if i:
+                f.write(",\n")
+            json.dump(record, f, ensure_ascii=False)
+        f.write("]\n")
+    os.replace(partial, path)
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, required=True)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", required=True)
+    args = parser.parse_args()
+    print(write_catalog(args.output, args.rows, args.seed))
+
+
+if __name__ == "__main__":
+    main()
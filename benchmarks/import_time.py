@@ -0,0 +1,127 @@
+"""
+Import-time budget for the app.
+
+Imports ``app.main`` in fresh interpreters under ``-X importtime`` and
+reports the slowest top-level packages and modules. Exits non-zero when the
+best run exceeds the budget or a module that should load lazily was
+imported, so it can gate CI and serverless cold starts.
+
+    python -m benchmarks.import_time [--budget-ms 2000] [--runs 3]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Heavy clients imported on first use; importing them at startup is a
+# regression
+LAZY_MODULES = ("openai", "passlib")
+BUDGET_MS = 2000
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def measure(module: str) -> List[Tuple[int, int, int, str]]:
+    """
+    Import ``module`` in a new interpreter.
+
+    Returns:
+        (self_us, cumulative_us, depth, name) per imported module
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root)
+    # Importing must not connect, so any well-formed URL will do
+    env.setdefault("DATABASE_URL", "postgresql://localhost/doc_finder_db")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=root,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        sys.exit(f"import {module} failed:\n{result.stderr[-2000:]}")
+    rows = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((int(self_us), int(cumulative_us), len(indent) // 2, name))
+    return rows
+
+
+def _subtree(
+    rows: List[Tuple[int, int, int, str]], module: str
+) -> List[Tuple[int, int, int, str]]:
+    """Keep ``module`` and what it imported, dropping interpreter startup."""
+    end = next(i for i, row in enumerate(rows) if row[3] == module)
+    start = end
+    # Children are reported before their parent
+    while start > 0 and rows[start - 1][2] > 0:
+        start -= 1
+    return rows[start : end + 1]
+
+
+def profile(
+    module: str = "app.main", runs: int = 3
+) -> Tuple[List[Tuple[int, int, int, str]], float]:
+    """
+    Import ``module`` ``runs`` times and keep the fastest run.
+
+    Returns:
+        The run's (self_us, cumulative_us, depth, name) rows, without
+        interpreter startup, and its total import time in milliseconds
+    """
+    # The first run also compiles bytecode
+    measured = [_subtree(measure(module), module) for _ in range(runs)]
+    rows = min(measured, key=lambda r: r[-1][1])
+    return rows, rows[-1][1] / 1000
+
+
+def eager_modules(rows: List[Tuple[int, int, int, str]]) -> List[str]:
+    """Return the ``LAZY_MODULES`` that ``rows`` show were imported."""
+    imported = {name.split(".")[0] for _, _, _, name in rows}
+    return [name for name in LAZY_MODULES if name in imported]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    rows, total_ms = profile(args.module, args.runs)
+
+    packages: Dict[str, int] = {}
+    for _, cumulative_us, depth, name in rows:
+        if depth == 1:
+            packages[name] = packages.get(name, 0) + cumulative_us
+    print(f"{'top-level import':<40} {'ms':>8}")
+    for name, cumulative_us in sorted(packages.items(), key=lambda i: -i[1])[
+        : args.top
+    ]:
+        print(f"{name:<40} {cumulative_us / 1000:>8.1f}")
+
+    print(f"\n{'module (self time)':<40} {'ms':>8}")
+    for self_us, _, _, name in sorted(rows, reverse=True)[: args.top]:
+        print(f"{name:<40} {self_us / 1000:>8.1f}")
+
+    print(f"\nimport {args.module}: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    eager = eager_modules(rows)
+    failed = False
+    if eager:
+        print(f"FAIL: imported at startup: {', '.join(eager)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print("FAIL: over budget")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
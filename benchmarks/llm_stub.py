@@ -0,0 +1,130 @@
+"""
+Local stand-in for the OpenAI chat completions endpoint.
+
+Answers every completion with a fixed specialty after a configurable delay,
+so symptom matching can be benchmarked without network variance or cost.
+Requests for a JSON object (batch matches) get the specialty for every
+numbered query in the prompt.
+
+    python -m benchmarks.llm_stub [--port 8765] [--latency-ms 300]
+
+Point the app at it with ``OPENAI_API_BASE=http://127.0.0.1:8765/v1``.
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+
+_NUMBERED_QUERY = re.compile(r"^\s*(\d+)\. (.*)$", re.MULTILINE)
+
+
+def numbered_queries(body: dict) -> Dict[str, str]:
+    """Return query number -> text of a batch completion request."""
+    return dict(_NUMBERED_QUERY.findall(body["messages"][-1]["content"]))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "LLMStub"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.send_error(404)
+            return
+        time.sleep(self.server.latency)
+        self.server.requests += 1
+        self.server.bodies.append(body)
+        content = self.server.reply
+        if self.server.responder is not None:
+            content = self.server.responder(body)
+        elif body.get("response_format", {}).get("type") == "json_object":
+            content = json.dumps({n: [content] for n in numbered_queries(body)})
+        payload = json.dumps(
+            {
+                "id": f"chatcmpl-stub-{self.server.requests}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "stub"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": 0,
+                    "completion_tokens": 0,
+                    "total_tokens": 0,
+                },
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LLMStub(ThreadingHTTPServer):
+    """
+    Threaded HTTP server answering chat completions after ``latency_ms``.
+
+    Use as a context manager to serve from a background thread; ``api_base``
+    is the value for ``OPENAI_API_BASE``. ``responder``, when given, returns
+    the completion's content for each request body instead, and ``bodies``
+    keeps the request bodies received.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        port: int = 0,
+        latency_ms: float = 300,
+        reply: str = "Internal Medicine",
+        responder: Optional[Callable[[dict], str]] = None,
+    ):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.latency = latency_ms / 1000
+        self.reply = reply
+        self.responder = responder
+        self.requests = 0
+        self.bodies: List[dict] = []
+        self._thread = None
+
+    @property
+    def api_base(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+    def __enter__(self) -> "LLMStub":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=300)
+    parser.add_argument("--reply", default="Internal Medicine")
+    args = parser.parse_args()
+    stub = LLMStub(args.port, args.latency_ms, args.reply)
+    print(f"OPENAI_API_BASE={stub.api_base}")
+    stub.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Rate limiter overhead per request.
+
+Times ``hit`` for each storage/strategy pair, then the same trivial route
+with and without the limiter in front of it, which is what every
+``rate_limit``-decorated route pays.
+
+    python -m benchmarks.rate_limit [--iterations N] [--redis redis://...]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import STRATEGIES
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+
+import app.rate_limit_storage  # noqa: F401
+
+LIMIT = "1000000/minute"
+
+
+def _per_call_us(func, iterations: int, rounds: int = 3) -> float:
+    # Best of a few rounds, so a noisy neighbour doesn't skew one storage
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best / iterations * 1e6
+
+
+def bench_storages(uris, iterations: int) -> None:
+    print(f"{'storage':<10} {'strategy':<24} {'us/hit':>8}")
+    item = parse(LIMIT)
+    for uri in uris:
+        storage = storage_from_string(uri)
+        for strategy in ("fixed-window", "sliding-window-counter", "moving-window"):
+            try:
+                limiter = STRATEGIES[strategy](storage)
+            except NotImplementedError:
+                continue
+            storage.reset()
+            cost = _per_call_us(
+                lambda limiter=limiter: limiter.hit(item, "bench"), iterations
+            )
+            print(f"{uri.split(':')[0]:<10} {strategy:<24} {cost:>8.1f}")
+
+
+def bench_route(uris, iterations: int) -> None:
+    print(f"\n{'storage':<10} {'us/request':>10} {'overhead':>9}")
+    baseline = None
+    for uri in [None, *uris]:
+        app = FastAPI()
+        if uri is None:
+
+            @app.get("/")
+            async def plain(request: Request):
+                return {}
+
+        else:
+            limiter = Limiter(
+                key_func=get_remote_address,
+                strategy="sliding-window-counter",
+                storage_uri=uri,
+                storage_options={},
+                config_filename="limitter.env",
+            )
+            limiter.reset()
+            app.state.limiter = limiter
+
+            @app.get("/")
+            @limiter.limit(LIMIT)
+            async def limited(request: Request):
+                return {}
+
+        with TestClient(app) as client:
+            for _ in range(100):
+                client.get("/")
+            cost = _per_call_us(lambda: client.get("/"), iterations)
+        if baseline is None:
+            baseline = cost
+            print(f"{'none':<10} {cost:>10.1f}")
+        else:
+            scheme = uri.split(":")[0]
+            print(f"{scheme:<10} {cost:>10.1f} {cost - baseline:>+9.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--redis", help="Also benchmark this Redis URI")
+    args = parser.parse_args()
+
+    shm_path = os.path.join(tempfile.mkdtemp(), "rate_limit")
+    uris = ["memory://", f"shm://{shm_path}"]
+    if args.redis:
+        uris.append(args.redis)
+
+    bench_storages(uris, args.iterations)
+    bench_route(uris, max(args.iterations // 10, 100))
+
+
+if __name__ == "__main__":
+    main()
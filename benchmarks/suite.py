@@ -0,0 +1,405 @@
+"""
+End-to-end benchmarks against a synthetic catalog.
+
+For each catalog size, generates a catalog (see ``benchmarks.catalog``),
+imports it into an empty database and times the service layer: listing with
+and without specialty filters, the import itself, specialty lookups, the
+login path and LLM symptom matching, single and batched, against a local
+stub. Results are written as JSON; with ``--compare`` they are checked
+against an earlier run.
+
+    python -m benchmarks.suite --database-url postgresql://localhost/doc_finder_bench \\
+        [--sizes 10000,100000,1000000] [--output results.json] [--compare baseline.json]
+
+The database is emptied and recreated, so its name must contain "bench".
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+from benchmarks.catalog import CatalogShape, write_catalog
+from benchmarks.llm_stub import LLMStub
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_PASSWORD = "benchmark-password"
+
+
+def percentile(sorted_samples: List[float], p: float) -> float:
+    """Nearest-rank percentile of already sorted samples."""
+    index = max(math.ceil(p / 100 * len(sorted_samples)) - 1, 0)
+    return sorted_samples[index]
+
+
+def summarize(
+    scenario: str, rows: int, samples: List[float], total: float, units: int = None
+) -> Dict:
+    """
+    Build a result entry from per-operation latencies in seconds.
+
+    Args:
+        total: Wall time of the whole run, for throughput
+        units: Items processed (defaults to one per sample), e.g. imported rows
+    """
+    ordered = sorted(samples)
+    units = len(samples) if units is None else units
+    return {
+        "scenario": scenario,
+        "rows": rows,
+        "iterations": len(samples),
+        "throughput_per_s": round(units / total, 2) if total else None,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+def report(result: Dict) -> None:
+    print(
+        f"{result['scenario']:<34} {result['rows']:>9}"
+        f" {result['throughput_per_s']:>10.1f}/s"
+        f" p50 {result['p50_ms']:>9.3f} ms  p99 {result['p99_ms']:>9.3f} ms"
+    )
+
+
+def timed(
+    scenario: str, rows: int, func: Callable[[int], None], iterations: int
+) -> Dict:
+    """Call ``func(i)`` ``iterations`` times and summarize the latencies."""
+    # Untimed: the first call pays for lazy imports, pools and connections
+    func(-1)
+    samples = []
+    started = time.perf_counter()
+    for i in range(iterations):
+        call_started = time.perf_counter()
+        func(i)
+        samples.append(time.perf_counter() - call_started)
+    result = summarize(scenario, rows, samples, time.perf_counter() - started)
+    report(result)
+    return result
+
+
+async def atimed(
+    scenario: str, rows: int, func: Callable[[int], Awaitable[None]], iterations: int
+) -> Dict:
+    """Async ``timed``: await ``func(i)`` ``iterations`` times on one event loop."""
+    await func(-1)
+    samples = []
+    started = time.perf_counter()
+    for i in range(iterations):
+        call_started = time.perf_counter()
+        await func(i)
+        samples.append(time.perf_counter() - call_started)
+    result = summarize(scenario, rows, samples, time.perf_counter() - started)
+    report(result)
+    return result
+
+
+def reset_schema() -> None:
+    from app.api.admin import models as admin_models  # noqa: F401
+    from app.api.ai import models as ai_models  # noqa: F401
+    from app.api.auth import models as auth_models  # noqa: F401
+    from app.api.doctors import models as doctor_models  # noqa: F401
+    from app.database import Base, engine
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+
+def bench_catalog(
+    rows: int, shape: CatalogShape, work_dir: str, seed: int, iterations: int
+) -> List[Dict]:
+    """Import a ``rows``-doctor catalog, then time listing it."""
+    from app.api.doctors import service
+    from app.database import SessionLocal
+
+    path = write_catalog(
+        os.path.join(work_dir, f"doctors_{rows}_{seed}.json"), rows, seed
+    )
+    reset_schema()
+    results = []
+    with SessionLocal() as db:
+        # Fresh inserts, then the same file again as updates
+        for scenario in ("import_doctors", "import_doctors_update"):
+            report = service.import_doctors(db, path)
+            result = summarize(
+                scenario,
+                rows,
+                [batch["seconds"] for batch in report["batches"]],
+                report["seconds"],
+                units=rows,
+            )
+            print(
+                f"{scenario:<34} {rows:>9} {result['throughput_per_s']:>10.1f} rows/s"
+                f" in {report['seconds']:.1f} s"
+            )
+            results.append(result)
+
+        filters = {
+            "get_doctors": None,
+            "get_doctors_popular_specialty": [shape.specialties[0]],
+            "get_doctors_rare_specialty": [shape.specialties[-1]],
+        }
+        for scenario, specializations in filters.items():
+            results.append(
+                timed(
+                    scenario,
+                    rows,
+                    # A new seed per call, so each call reads a different page
+                    lambda i, s=specializations: service.get_doctors(
+                        db, specializations=s, seed=i
+                    ),
+                    iterations,
+                )
+            )
+        # What list views request: no description or clinic arrays
+        fields = service.parse_fields("name,title,speciality")
+        results.append(
+            timed(
+                "get_doctors_sparse_fields",
+                rows,
+                lambda i: service.encode_doctor_rows(
+                    service.get_doctors(db, seed=i, fields=fields)[0], fields
+                ),
+                iterations,
+            )
+        )
+    return results
+
+
+def misspell(word: str, rng: random.Random) -> str:
+    """Lowercase ``word`` and drop or swap a character, as users type it."""
+    chars = list(word.lower())
+    position = rng.randrange(len(chars) - 1)
+    if rng.random() < 0.5:
+        del chars[position]
+    else:
+        chars[position], chars[position + 1] = chars[position + 1], chars[position]
+    return "".join(chars)
+
+
+def bench_specialty_lookup(iterations: int, seed: int) -> Dict:
+    from app.symptoms_matcher import find_closest_specialty, speciality_list
+
+    rng = random.Random(seed)
+    queries = [misspell(rng.choice(speciality_list), rng) for _ in range(iterations)]
+    return timed(
+        "find_closest_specialty",
+        0,
+        lambda i: find_closest_specialty(queries[i]),
+        iterations,
+    )
+
+
+def bench_login(iterations: int) -> Dict:
+    """
+    Time ``authenticate_user_async`` plus token creation, as ``/auth/login``
+    does; bcrypt runs in the password hashing pool.
+    """
+    from app.api.auth import schemas, service
+    from app.database import async_session, dispose_async_engines
+
+    email = "bench@example.com"
+
+    async def run_logins():
+        async with async_session() as db:
+            await service.create_user_async(
+                db,
+                schemas.UserCreate(
+                    email=email, username="bench", password=BENCH_PASSWORD
+                ),
+            )
+
+            async def login(_):
+                user = await service.authenticate_user_async(db, email, BENCH_PASSWORD)
+                assert user, "benchmark user failed to authenticate"
+                service.create_access_token({"sub": user.email})
+
+            result = await atimed("login", 0, login, iterations)
+        # Its connections belong to this event loop
+        await dispose_async_engines()
+        return result
+
+    return asyncio.run(run_logins())
+
+
+def bench_llm_match(iterations: int, stub: LLMStub) -> Dict:
+    from app.symptoms_matcher import match_specialization
+
+    # Unique symptoms, so neither the cache nor a previous run answers; the
+    # warm-up's -1 would normalize like 1
+    run = time.time_ns()
+    result = timed(
+        "match_specialization_llm",
+        0,
+        lambda i: match_specialization(f"benchmark symptom {run} {i + 1}"),
+        iterations,
+    )
+    # Plus the warm-up
+    if stub.requests < iterations + 1:
+        sys.exit(f"only {stub.requests} of {iterations + 1} matches reached the stub")
+    return result
+
+
+def bench_llm_batch(iterations: int, batch_size: int, stub: LLMStub) -> Dict:
+    """Time batch matches of ``batch_size`` distinct queries; throughput is per query."""
+    from app.symptoms_matcher import match_specializations_batch_async
+
+    run = time.time_ns()
+
+    async def run_batches():
+        samples = []
+        # The first batch warms up
+        for i in range(iterations + 1):
+            queries = [
+                f"benchmark batch symptom {run} {i} {j}" for j in range(batch_size)
+            ]
+            started = time.perf_counter()
+            await match_specializations_batch_async(queries)
+            if i:
+                samples.append(time.perf_counter() - started)
+        return samples
+
+    requests_before = stub.requests
+    samples = asyncio.run(run_batches())
+    result = summarize(
+        f"match_specializations_batch_{batch_size}",
+        0,
+        samples,
+        sum(samples),
+        units=iterations * batch_size,
+    )
+    print(
+        f"{result['scenario']:<34} {0:>9} {result['throughput_per_s']:>10.1f}/s"
+        f" p50 {result['p50_ms']:>9.3f} ms  p99 {result['p99_ms']:>9.3f} ms"
+        f"  ({stub.requests - requests_before} LLM calls)"
+    )
+    return result
+
+
+def compare(results: List[Dict], baseline: Dict, tolerance: float) -> List[str]:
+    """
+    Find scenarios that got slower than ``baseline`` by more than ``tolerance``.
+
+    Returns:
+        One message per regressed p99 or throughput
+    """
+    previous = {(r["scenario"], r["rows"]): r for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        before = previous.get((result["scenario"], result["rows"]))
+        if before is None:
+            continue
+        name = f"{result['scenario']} ({result['rows']} rows)"
+        if result["p99_ms"] > before["p99_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p99 {before['p99_ms']} -> {result['p99_ms']} ms"
+            )
+        if before["throughput_per_s"] and result["throughput_per_s"] < before[
+            "throughput_per_s"
+        ] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {before['throughput_per_s']}"
+                f" -> {result['throughput_per_s']}/s"
+            )
+    return regressions
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--login-iterations", type=int, default=20)
+    parser.add_argument("--llm-iterations", type=int, default=20)
+    parser.add_argument("--llm-latency-ms", type=float, default=300)
+    parser.add_argument(
+        "--llm-batch-size", type=int, default=20, help="queries per batch match"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--work-dir", default=tempfile.gettempdir())
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--compare", help="results file of an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    if "bench" not in urlparse(args.database_url).path:
+        sys.exit("refusing to empty a database whose name doesn't contain 'bench'")
+
+    stub = LLMStub(latency_ms=args.llm_latency_ms)
+    # Read when the app modules and the OpenAI SDK are first imported
+    os.environ.update(
+        DATABASE_URL=args.database_url,
+        OPENAI_API_BASE=stub.api_base,
+        OPENAI_API_KEY="benchmark",
+        LOCAL_CLASSIFIER_THRESHOLD="2",
+        SPECIALTY_CACHE_PERSISTENT="false",
+    )
+
+    started_at = datetime.now(timezone.utc).isoformat()
+    shape = CatalogShape()
+    results = []
+    print(f"{'scenario':<34} {'rows':>9} {'throughput':>12}")
+    for rows in [int(size) for size in args.sizes.split(",")]:
+        results.extend(
+            bench_catalog(rows, shape, args.work_dir, args.seed, args.iterations)
+        )
+    results.append(bench_specialty_lookup(args.iterations * 10, args.seed))
+    results.append(bench_login(args.login_iterations))
+    with stub:
+        results.append(bench_llm_match(args.llm_iterations, stub))
+        results.append(bench_llm_batch(args.llm_iterations, args.llm_batch_size, stub))
+
+    from app.api.auth.passwords import password_hasher
+
+    password_hasher.shutdown()
+
+    report = {
+        "meta": {
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "started_at": started_at,
+            "args": {k: v for k, v in vars(args).items() if k != "database_url"},
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nwrote {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
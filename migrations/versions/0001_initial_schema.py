@@ -0,0 +1,79 @@
+"""Initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "doctors",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=True),
+        sa.Column("title", sa.String(), nullable=True),
+        sa.Column("speciality", sa.String(), nullable=True),
+        sa.Column("phone_number", sa.String(), nullable=True),
+        sa.Column("location", sa.String(), nullable=True),
+        sa.Column("educational_degree", sa.String(), nullable=True),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("data_scrapped_at", sa.DateTime(), nullable=True),
+        sa.Column("data_source", sa.String(), nullable=True),
+        sa.Column("clinics", sa.ARRAY(sa.String()), nullable=True),
+        sa.Column("chambers", sa.ARRAY(sa.String()), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_doctors_id", "doctors", ["id"])
+    op.create_index("ix_doctors_name", "doctors", ["name"])
+    op.create_index("ix_doctors_speciality", "doctors", ["speciality"])
+
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("email", sa.String(), nullable=True),
+        sa.Column("username", sa.String(), nullable=True),
+        sa.Column("hashed_password", sa.String(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+
+    op.create_table(
+        "specialty_cache",
+        sa.Column("query_key", sa.String(length=64), nullable=False),
+        sa.Column("query", sa.String(), nullable=True),
+        sa.Column("specialities", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("expires_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("query_key"),
+    )
+    op.create_index("ix_specialty_cache_expires_at", "specialty_cache", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_specialty_cache_expires_at", table_name="specialty_cache")
+    op.drop_table("specialty_cache")
+    op.drop_index("ix_users_username", table_name="users")
+    op.drop_index("ix_users_email", table_name="users")
+    op.drop_index("ix_users_id", table_name="users")
+    op.drop_table("users")
+    op.drop_index("ix_doctors_speciality", table_name="doctors")
+    op.drop_index("ix_doctors_name", table_name="doctors")
+    op.drop_index("ix_doctors_id", table_name="doctors")
+    op.drop_table("doctors")
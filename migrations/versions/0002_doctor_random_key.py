@@ -0,0 +1,37 @@
+"""Persisted random sort key for doctors
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The server default gives every existing row its own random() value
+    op.add_column(
+        "doctors",
+        sa.Column(
+            "random_key",
+            sa.Float(),
+            server_default=sa.text("random()"),
+            nullable=False,
+        ),
+    )
+    op.create_index("ix_doctors_random_key_id", "doctors", ["random_key", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_doctors_random_key_id", table_name="doctors")
+    op.drop_column("doctors", "random_key")
@@ -0,0 +1,91 @@
+"""Normalized specialities with alias map
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.symptoms_matcher import speciality_list
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "specialities",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.create_table(
+        "doctor_specialities",
+        sa.Column("doctor_id", sa.Integer(), nullable=False),
+        sa.Column("speciality_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["doctor_id"], ["doctors.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(
+            ["speciality_id"], ["specialities.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("doctor_id", "speciality_id"),
+    )
+    op.create_index(
+        "ix_doctor_specialities_speciality_id",
+        "doctor_specialities",
+        ["speciality_id", "doctor_id"],
+    )
+    op.create_table(
+        "speciality_aliases",
+        sa.Column("alias", sa.String(), nullable=False),
+        sa.Column("speciality_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["speciality_id"], ["specialities.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("alias", "speciality_id"),
+    )
+
+    # Backfill from the existing doctors
+    op.execute(
+        """
+        INSERT INTO specialities (name)
+        SELECT DISTINCT speciality FROM doctors WHERE speciality IS NOT NULL
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO doctor_specialities (doctor_id, speciality_id)
+        SELECT d.id, s.id FROM doctors d JOIN specialities s ON s.name = d.speciality
+        """
+    )
+    op.get_bind().execute(
+        sa.text(
+            """
+            INSERT INTO speciality_aliases (alias, speciality_id)
+            SELECT DISTINCT lower(k.name), s.id
+            FROM (
+                SELECT name FROM specialities
+                UNION SELECT unnest(CAST(:names AS varchar[]))
+            ) AS k
+            JOIN specialities s ON strpos(lower(s.name), lower(k.name)) > 0
+            """
+        ),
+        {"names": list(speciality_list)},
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("speciality_aliases")
+    op.drop_index(
+        "ix_doctor_specialities_speciality_id", table_name="doctor_specialities"
+    )
+    op.drop_table("doctor_specialities")
+    op.drop_table("specialities")
@@ -0,0 +1,25 @@
+"""Keyset pagination index on doctor name
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_doctors_name_id", "doctors", ["name", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_doctors_name_id", table_name="doctors")
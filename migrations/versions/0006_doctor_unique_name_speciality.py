@@ -0,0 +1,35 @@
+"""Unique (name, speciality) key for doctor upserts
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 11:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Earlier imports could insert the same doctor twice; keep the newest row
+    op.execute(
+        """
+        DELETE FROM doctors a
+        USING doctors b
+        WHERE a.name = b.name AND a.speciality = b.speciality AND a.id < b.id
+        """
+    )
+    op.create_unique_constraint(
+        "uq_doctors_name_speciality", "doctors", ["name", "speciality"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_doctors_name_speciality", "doctors", type_="unique")
@@ -0,0 +1,60 @@
+"""Precomputed doctor facet counts
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "doctor_facet_counts",
+        sa.Column("speciality", sa.String(), nullable=False),
+        sa.Column("facet", sa.String(), nullable=False),
+        sa.Column("value", sa.String(), nullable=False),
+        sa.Column("doctors", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("speciality", "facet", "value"),
+    )
+    # A doctor counts once per distinct clinic and chamber; blanks don't count
+    op.execute(
+        """
+        INSERT INTO doctor_facet_counts (speciality, facet, value, doctors)
+        SELECT speciality, facet, value, count(*)
+        FROM (
+            SELECT speciality, 'speciality' AS facet, speciality AS value
+            FROM doctors
+            UNION ALL
+            SELECT speciality, 'location', location
+            FROM doctors
+            WHERE location <> ''
+            UNION ALL
+            SELECT d.speciality, 'clinics', c.value
+            FROM doctors d
+            CROSS JOIN LATERAL (SELECT DISTINCT unnest(d.clinics) AS value) c
+            WHERE c.value <> ''
+            UNION ALL
+            SELECT d.speciality, 'chambers', c.value
+            FROM doctors d
+            CROSS JOIN LATERAL (SELECT DISTINCT unnest(d.chambers) AS value) c
+            WHERE c.value <> ''
+        ) AS facets
+        WHERE speciality IS NOT NULL
+        GROUP BY speciality, facet, value
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("doctor_facet_counts")
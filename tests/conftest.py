@@ -0,0 +1,41 @@
+import os
+from urllib.parse import urlparse
+
+import pytest
+
+# app.database reads DATABASE_URL at import; tests that need a database use
+# TEST_DATABASE_URL and skip without one, the rest never connect
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/doc_finder_test")
+
+
+@pytest.fixture(scope="module")
+def db_engine():
+    """Engine on an emptied TEST_DATABASE_URL database with the app's tables."""
+    url = os.getenv("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    if "test" not in urlparse(url).path:
+        pytest.skip("refusing to empty a database whose name doesn't contain 'test'")
+
+    from sqlalchemy import create_engine
+
+    from app.api.admin import models as admin_models  # noqa: F401
+    from app.api.ai import models as ai_models  # noqa: F401
+    from app.api.auth import models as auth_models  # noqa: F401
+    from app.api.doctors import models as doctor_models  # noqa: F401
+    from app.database import Base
+
+    engine = create_engine(url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def db(db_engine):
+    from sqlalchemy.orm import Session
+
+    with Session(bind=db_engine) as session:
+        yield session
@@ -0,0 +1,156 @@
+import asyncio
+import json
+
+import pytest
+
+from app import symptoms_matcher
+from app.api.ai import service as ai_service
+from app.specialty_cache import specialty_cache
+from benchmarks.llm_stub import LLMStub, numbered_queries
+
+# Below LOCAL_CLASSIFIER_THRESHOLD, so only the LLM can answer them
+UNKNOWN = [f"qqzx wvvk {word}" for word in ("alpha", "bravo", "delta", "kilo", "lima")]
+
+
+@pytest.fixture(scope="module")
+def llm_server():
+    with LLMStub(latency_ms=50, reply="Neurology") as server:
+        yield server
+
+
+@pytest.fixture
+def stub(llm_server, monkeypatch):
+    llm_server.requests = 0
+    llm_server.bodies = []
+    llm_server.responder = None
+    openai = symptoms_matcher._openai()
+    monkeypatch.setattr(openai, "api_base", llm_server.api_base)
+    monkeypatch.setattr(openai, "api_key", "test")
+    # Bound to the event loop of the test that first waits on it
+    monkeypatch.setattr(symptoms_matcher, "_llm_semaphore", None)
+    specialty_cache.memory.clear()
+    yield llm_server
+    specialty_cache.memory.clear()
+
+
+def batch(queries):
+    return asyncio.run(symptoms_matcher.match_specializations_batch_async(queries))
+
+
+def test_local_matches_skip_the_llm(stub):
+    assert batch(["chest pain"]) == [("Cardiology", "local")]
+    assert stub.requests == 0
+
+
+def test_queries_are_split_into_llm_batches(stub, monkeypatch):
+    monkeypatch.setattr(symptoms_matcher, "LLM_BATCH_SIZE", 2)
+    assert batch(UNKNOWN) == [("Neurology", "llm")] * len(UNKNOWN)
+    sizes = sorted(len(numbered_queries(body)) for body in stub.bodies)
+    assert sizes == [1, 2, 2]
+
+
+def test_duplicate_queries_are_matched_once(stub):
+    queries = [UNKNOWN[0], UNKNOWN[0].upper() + "!", UNKNOWN[1], UNKNOWN[0]]
+    assert batch(queries) == [("Neurology", "llm")] * 4
+    assert stub.requests == 1
+    assert sorted(numbered_queries(stub.bodies[0]).values()) == sorted(UNKNOWN[:2])
+
+
+def test_answers_are_cached(stub):
+    batch(UNKNOWN[:2])
+    assert batch(UNKNOWN[:2]) == [("Neurology", "cache")] * 2
+    assert stub.requests == 1
+
+
+def test_batch_joins_single_match_in_flight(stub):
+    async def run():
+        single = asyncio.ensure_future(
+            symptoms_matcher.match_specialization_async(UNKNOWN[0])
+        )
+        await asyncio.sleep(0.01)
+        matches = await symptoms_matcher.match_specializations_batch_async(
+            [UNKNOWN[0], UNKNOWN[1]]
+        )
+        return await single, matches
+
+    single, matches = asyncio.run(run())
+    assert single == "Neurology"
+    assert matches == [("Neurology", "shared"), ("Neurology", "llm")]
+    assert stub.requests == 2
+
+
+def test_single_match_joins_batch_in_flight(stub):
+    async def run():
+        matches = asyncio.ensure_future(
+            symptoms_matcher.match_specializations_batch_async(UNKNOWN[:3])
+        )
+        await asyncio.sleep(0.01)
+        return await symptoms_matcher.match_specialization_async(UNKNOWN[2]), (
+            await matches
+        )
+
+    single, matches = asyncio.run(run())
+    assert single == "Neurology"
+    assert matches == [("Neurology", "llm")] * 3
+    assert stub.requests == 1
+
+
+def test_malformed_reply_falls_back(stub):
+    stub.responder = lambda body: "Cardiology, probably"
+    assert batch(UNKNOWN[:2]) == [("Internal Medicine", "fallback")] * 2
+    # Fallbacks aren't cached
+    stub.responder = None
+    assert batch(UNKNOWN[:2]) == [("Neurology", "llm")] * 2
+
+
+def test_non_object_reply_falls_back(stub):
+    stub.responder = lambda body: json.dumps(["Cardiology"])
+    assert batch(UNKNOWN[:1]) == [("Internal Medicine", "fallback")]
+
+
+def test_missing_indices_fall_back_per_query(stub):
+    stub.responder = lambda body: json.dumps(
+        {n: ["Cardiology"] for n, text in numbered_queries(body).items() if n != "2"}
+    )
+    matches = batch(UNKNOWN[:3])
+    by_query = dict(zip(UNKNOWN[:3], matches, strict=False))
+    missing = numbered_queries(stub.bodies[0])["2"]
+    assert by_query.pop(missing) == ("Internal Medicine", "fallback")
+    assert list(by_query.values()) == [("Cardiology", "llm")] * 2
+
+
+def test_unknown_specialties_are_dropped(stub):
+    replies = {
+        UNKNOWN[0]: ["Plumbing", "Dermatology"],
+        UNKNOWN[1]: ["Plumbing"],
+        UNKNOWN[2]: "Cardiology",
+        UNKNOWN[3]: [42, None],
+    }
+    stub.responder = lambda body: json.dumps(
+        {n: replies[text] for n, text in numbered_queries(body).items()}
+    )
+    assert batch(UNKNOWN[:4]) == [
+        ("Dermatology", "llm"),
+        ("Internal Medicine", "llm"),
+        ("Cardiology", "llm"),
+        ("Internal Medicine", "llm"),
+    ]
+
+
+def test_single_and_batch_endpoints_agree(stub):
+    queries = [
+        "fever and kidney stone",
+        "chest pain and cough",
+        "headache with rash",
+        "back pain and diabetes",
+        UNKNOWN[0],
+    ]
+
+    async def run():
+        singles = [await ai_service.match_specialization(q) for q in queries]
+        specialty_cache.memory.clear()
+        matches = await ai_service.match_specializations_batch(queries)
+        return singles, [";".join(m["specializations"]) for m in matches]
+
+    singles, batched = asyncio.run(run())
+    assert singles == batched
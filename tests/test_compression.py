@@ -0,0 +1,55 @@
+import gzip
+
+import brotli
+import pytest
+
+from app import compression
+from app.compression import StreamCompressor, negotiate
+
+
+@pytest.mark.parametrize(
+    "accept_encoding,expected",
+    [
+        ("gzip, deflate, br", "br"),
+        ("br", "br"),
+        ("gzip", "gzip"),
+        ("GZIP", "gzip"),
+        ("gzip;q=1, br;q=0.1", "gzip"),
+        ("gzip;q=0.5, br;q=0.8", "br"),
+        ("gzip;q=0.5, br;q=0.5", "br"),
+        ("br;q=0.5, gzip", "gzip"),
+        ("gzip ; Q=0.9, br;level=1;q=0.2", "gzip"),
+        ("br;q=0, gzip;q=0.1", "gzip"),
+        ("br;q=0, gzip;q=0", None),
+        ("*", "br"),
+        ("*;q=0.5, br;q=0.1", "gzip"),
+        ("br;q=0, *", "gzip"),
+        ("gzip;q=bogus, br;q=0.1", "br"),
+        ("deflate, identity", None),
+        ("", None),
+    ],
+)
+def test_negotiate(accept_encoding, expected):
+    assert negotiate(accept_encoding) == expected
+
+
+@pytest.mark.parametrize(
+    "accept_encoding,expected",
+    [("br", None), ("br, gzip;q=0.1", "gzip"), ("*", "gzip")],
+)
+def test_negotiate_without_brotli(monkeypatch, accept_encoding, expected):
+    monkeypatch.setattr(compression, "brotli", None)
+    assert negotiate(accept_encoding) == expected
+
+
+@pytest.mark.parametrize(
+    "encoding,decompress", [("br", brotli.decompress), ("gzip", gzip.decompress)]
+)
+def test_stream_compressor_round_trips_chunks(encoding, decompress):
+    chunks = [b'[{"name": "Dr. A"}', b', {"name": "Dr. B"}', b"]"]
+    compressor = StreamCompressor(encoding)
+    body = b"".join(
+        compressor.compress(chunk, final=i == len(chunks) - 1)
+        for i, chunk in enumerate(chunks)
+    )
+    assert decompress(body) == b"".join(chunks)
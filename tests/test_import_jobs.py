@@ -0,0 +1,71 @@
+import uuid
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import func, text, update
+
+from app.api.admin import jobs, models
+from app.config.imports import IMPORT_JOB_STALE_SECONDS
+
+
+@pytest.fixture
+def job(db):
+    job = models.ImportJob(
+        id=uuid.uuid4().hex,
+        file_path="doctors.json",
+        status=jobs.RUNNING,
+        batch_size=100,
+        errors=[],
+    )
+    db.add(job)
+    db.commit()
+    return job
+
+
+def age(db, job, seconds: float) -> None:
+    """Make the job's last update ``seconds`` old on the database clock."""
+    db.execute(
+        update(models.ImportJob)
+        .where(models.ImportJob.id == job.id)
+        .values(updated_at=func.now() - timedelta(seconds=seconds))  # pylint: disable=not-callable
+    )
+    db.commit()
+    db.refresh(job)
+
+
+@pytest.mark.parametrize("status", [jobs.FAILED, jobs.CANCELLED])
+def test_stopped_jobs_are_resumable(db, job, status):
+    job.status = status
+    db.commit()
+    assert jobs.is_resumable(db, job)
+
+
+def test_finished_jobs_are_not_resumable(db, job):
+    job.status = jobs.SUCCEEDED
+    db.commit()
+    age(db, job, IMPORT_JOB_STALE_SECONDS + 60)
+    assert not jobs.is_resumable(db, job)
+
+
+@pytest.mark.parametrize("status", [jobs.PENDING, jobs.RUNNING])
+def test_active_jobs_are_resumable_once_stale(db, job, status):
+    job.status = status
+    db.commit()
+    assert not jobs.is_resumable(db, job)
+    age(db, job, IMPORT_JOB_STALE_SECONDS - 60)
+    assert not jobs.is_resumable(db, job)
+    age(db, job, IMPORT_JOB_STALE_SECONDS + 60)
+    assert jobs.is_resumable(db, job)
+
+
+@pytest.mark.parametrize("zone", ["Asia/Dhaka", "America/Los_Angeles"])
+def test_staleness_ignores_the_session_time_zone(db, job, zone):
+    # updated_at is stored in the session's local time, not UTC
+    db.execute(text(f"SET TIME ZONE '{zone}'"))
+    try:
+        age(db, job, IMPORT_JOB_STALE_SECONDS - 60)
+        assert not jobs.is_resumable(db, job)
+        age(db, job, IMPORT_JOB_STALE_SECONDS + 60)
+        assert jobs.is_resumable(db, job)
+    finally:
+        db.execute(text("RESET TIME ZONE"))
@@ -0,0 +1,19 @@
+"""Import-time budget of ``app.main`` (see ``benchmarks.import_time``)."""
+
+import pytest
+
+from benchmarks.import_time import BUDGET_MS, eager_modules, profile
+
+
+def test_app_defers_lazy_clients():
+    rows, _ = profile("app.main", runs=1)
+
+    assert eager_modules(rows) == []
+
+
+@pytest.mark.benchmark
+def test_app_imports_within_budget():
+    # Wall-clock, so it depends on the machine's load; run with -m benchmark
+    _, total_ms = profile("app.main")
+
+    assert total_ms <= BUDGET_MS, f"import app.main took {total_ms:.1f} ms"
@@ -0,0 +1,74 @@
+import io
+import json
+import random
+
+import pytest
+
+from app.api.doctors.importer import batched, iter_json_array
+
+READ_SIZES = [1, 2, 3, 7, 64, 65536]
+
+DOCUMENTS = [
+    "[]",
+    " [ ] ",
+    "[1, 23, 456]",
+    '[true, false, null, -1.5e3, 0, 1E+2, "ab\\"c", "é ☃"]',
+    '[{"a": [1, {"b": null}]}, [], {}, [[2]], "x"]',
+    '\n[\n  {"name": "Dr. A", "clinics": ["X", "Y"]},\n  {"name": "Dr. B"}\n]\n',
+]
+
+
+def parse(text: str, read_size: int, **kwargs) -> list:
+    return list(iter_json_array(io.StringIO(text), read_size, **kwargs))
+
+
+@pytest.mark.parametrize("read_size", READ_SIZES)
+@pytest.mark.parametrize("text", DOCUMENTS)
+def test_matches_json_loads(text, read_size):
+    assert parse(text, read_size) == json.loads(text)
+
+
+@pytest.mark.parametrize("read_size", READ_SIZES)
+def test_matches_json_loads_on_generated_records(read_size):
+    rng = random.Random(read_size)
+    records = [
+        {
+            "id": i,
+            "score": rng.uniform(-1e6, 1e6),
+            "name": "".join(rng.choice('ab "\\é') for _ in range(rng.randrange(9))),
+            "tags": [rng.randrange(1000) for _ in range(rng.randrange(4))],
+        }
+        for i in range(200)
+    ]
+    records += [rng.randrange(-(10**12), 10**12) for _ in range(50)]
+    text = json.dumps(records, indent=rng.choice([None, 2]))
+    assert parse(text, read_size) == json.loads(text)
+
+
+@pytest.mark.parametrize("read_size", READ_SIZES)
+@pytest.mark.parametrize(
+    "text",
+    ["{}", "1", "[{},]", "[1,]", "[,1]", "[1 2]", "[1", "[12", "[1-2]", "[1x]", "[{]"],
+)
+def test_rejects_malformed_arrays(text, read_size):
+    with pytest.raises(ValueError):
+        parse(text, read_size)
+
+
+def test_errors_report_offset_in_file():
+    text = "[" + ", ".join(["1"] * 50) + ", 2 3]"
+    with pytest.raises(ValueError, match=f"at offset {text.index(' 3') + 1}$"):
+        parse(text, read_size=4)
+
+
+def test_malformed_element_fails_without_reading_the_rest_of_the_file():
+    rest = ", ".join(['{"name": "Dr. X"}'] * 100_000)
+    file = io.StringIO('[{"name": "Dr. A", oops}, ' + rest + "]")
+    with pytest.raises(ValueError, match="Malformed or oversized element"):
+        list(iter_json_array(file, read_size=64, max_element_size=1024))
+    assert file.tell() < 4096
+
+
+def test_batched():
+    assert list(batched(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(batched([], 3)) == []
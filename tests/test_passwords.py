@@ -0,0 +1,106 @@
+import asyncio
+import os
+import time
+
+import pytest
+from fastapi import HTTPException
+from passlib.hash import bcrypt
+
+from app.api.auth import passwords
+from app.api.auth import service as auth_service
+from app.api.auth.passwords import PasswordHasher, PasswordHasherBusy
+
+
+@pytest.fixture
+def hasher(monkeypatch):
+    # Read by the spawned workers when they import the config
+    monkeypatch.setenv("BCRYPT_ROUNDS", "4")
+    hasher = PasswordHasher(workers=1, max_pending=1)
+    yield hasher
+    hasher.shutdown()
+
+
+@pytest.fixture
+def rounds(monkeypatch):
+    monkeypatch.setattr(passwords, "BCRYPT_ROUNDS", 5)
+    passwords.pwd_context.cache_clear()
+    yield 5
+    passwords.pwd_context.cache_clear()
+
+
+def rounds_of(hashed: str) -> int:
+    return bcrypt.from_string(hashed).rounds
+
+
+def test_hashes_in_pool(hasher):
+    hashed = hasher.hash("secret")
+    assert rounds_of(hashed) == 4
+    assert hasher.verify_and_update("secret", hashed) == (True, None)
+    assert hasher.verify_and_update("wrong", hashed) == (False, None)
+    stats = hasher.stats()
+    assert (stats["hash"]["count"], stats["verify"]["count"]) == (1, 2)
+    assert stats["in_flight"] == 0
+
+
+def test_full_queue_rejects_until_drained(hasher):
+    # One running and one waiting fill a pool of one worker and one pending
+    running = [hasher._submit("hash", time.sleep, 0.2) for _ in range(2)]
+    with pytest.raises(PasswordHasherBusy):
+        hasher.hash("secret")
+    assert hasher.stats()["rejected"] == 1
+
+    for future in running:
+        # time.sleep returns no timing
+        with pytest.raises(TypeError):
+            future.result()
+    assert rounds_of(hasher.hash("secret")) == 4
+    assert hasher.stats()["in_flight"] == 0
+
+
+def test_full_queue_answers_503(hasher, monkeypatch):
+    class User:
+        hashed_password = bcrypt.using(rounds=4).hash("secret")
+
+    class Session:
+        async def scalar(self, statement):
+            return User()
+
+    monkeypatch.setattr(auth_service, "password_hasher", hasher)
+    running = [hasher._submit("hash", time.sleep, 0.2) for _ in range(2)]
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(
+            auth_service.authenticate_user_async(Session(), "a@example.com", "secret")
+        )
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers == {"Retry-After": "1"}
+    for future in running:
+        future.exception()
+
+
+def test_pool_recovers_after_worker_dies(hasher):
+    hashed = hasher.hash("secret")
+    with pytest.raises(PasswordHasherBusy):
+        # Kills the worker process, breaking the pool
+        hasher._submit("hash", os._exit, 1).result()
+    assert hasher.verify_and_update("secret", hashed) == (True, None)
+    assert hasher.stats()["in_flight"] == 0
+
+
+@pytest.mark.parametrize("stored_rounds", [4, 6])
+def test_other_cost_factors_are_rehashed(rounds, stored_rounds):
+    stored = bcrypt.using(rounds=stored_rounds).hash("secret")
+    (valid, new_hash), _ = passwords._verify_and_update("secret", stored)
+    assert valid
+    assert rounds_of(new_hash) == rounds
+    assert passwords._verify_and_update("secret", new_hash)[0] == (True, None)
+
+
+def test_wrong_password_is_not_rehashed(rounds):
+    stored = bcrypt.using(rounds=4).hash("secret")
+    assert passwords._verify_and_update("wrong", stored)[0] == (False, None)
+
+
+def test_configured_cost_factor_is_kept(rounds):
+    hashed, _ = passwords._hash("secret")
+    assert rounds_of(hashed) == rounds
+    assert passwords._verify_and_update("secret", hashed)[0] == (True, None)
@@ -0,0 +1,161 @@
+import multiprocessing
+
+import pytest
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import SlidingWindowCounterRateLimiter
+
+from app import rate_limit_storage
+from app.rate_limit_storage import SharedMemoryStorage
+
+
+class Clock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # 20s into a one-minute window
+    clock = Clock(60 * 16667 + 20.0)
+    monkeypatch.setattr(rate_limit_storage, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "rate_limit")
+
+
+def test_uri_selects_file_and_size(path):
+    storage = storage_from_string(f"shm://{path}?slots=16")
+    assert isinstance(storage, SharedMemoryStorage)
+    assert (storage.path, storage.slots) == (path, 16)
+    # The first storage to create the file fixes its size
+    assert SharedMemoryStorage(f"shm://{path}?slots=64").slots == 16
+
+
+def test_incr_and_get(path, clock):
+    storage = SharedMemoryStorage(f"shm://{path}")
+    assert storage.get("a") == 0
+    assert storage.incr("a", 60) == 1
+    assert storage.incr("a", 60, amount=3) == 4
+    assert storage.incr("b", 60) == 1
+    assert (storage.get("a"), storage.get("b")) == (4, 1)
+    assert storage.decr("a", 2) == 2
+    assert storage.decr("a", 5) == 0
+    storage.clear("b")
+    assert storage.get("b") == 0
+
+
+def test_counters_expire(path, clock):
+    storage = SharedMemoryStorage(f"shm://{path}")
+    storage.incr("a", 60)
+    clock.now += 30
+    # Without elastic expiry later hits keep the first one's expiry
+    assert storage.incr("a", 60) == 2
+    assert storage.get_expiry("a") == clock.now + 30
+    clock.now += 30
+    assert storage.get("a") == 0
+    assert storage.get_expiry("a") == clock.now
+    assert storage.incr("a", 60) == 1
+
+
+def test_elastic_expiry_extends_counter(path, clock):
+    storage = SharedMemoryStorage(f"shm://{path}")
+    storage.incr("a", 60, elastic_expiry=True)
+    clock.now += 50
+    storage.incr("a", 60, elastic_expiry=True)
+    clock.now += 50
+    assert storage.get("a") == 2
+
+
+def test_full_table_evicts_soonest_expiring(path, clock):
+    # As many slots as probes, so every key competes for all of them
+    slots = rate_limit_storage.PROBES
+    storage = SharedMemoryStorage(f"shm://{path}?slots={slots}")
+    keys = [f"key{i}" for i in range(slots)]
+    for i, key in enumerate(keys):
+        storage.incr(key, 60 + i)
+    storage.incr("new", 60)
+    assert storage.get("new") == 1
+    assert [storage.get(key) for key in keys] == [0] + [1] * (slots - 1)
+
+
+def test_reset_counts_live_counters(path, clock):
+    storage = SharedMemoryStorage(f"shm://{path}")
+    storage.incr("a", 10)
+    storage.incr("b", 60)
+    clock.now += 30
+    assert storage.reset() == 1
+    assert storage.get("b") == 0
+
+
+def test_sliding_window_weights_previous_window(path, clock):
+    storage = SharedMemoryStorage(f"shm://{path}")
+    for _ in range(10):
+        assert storage.acquire_sliding_window_entry("a", 10, 60)
+    assert not storage.acquire_sliding_window_entry("a", 10, 60)
+    assert storage.get_sliding_window("a", 60) == pytest.approx((0, 0.0, 10, 100.0))
+
+    # A quarter into the next window 3/4 of the previous count still applies
+    clock.now += 55
+    assert storage.get_sliding_window("a", 60) == pytest.approx((10, 45.0, 0, 105.0))
+    acquired = [storage.acquire_sliding_window_entry("a", 10, 60) for _ in range(4)]
+    assert acquired == [True, True, True, False]
+    assert storage.get_sliding_window("a", 60) == pytest.approx((10, 45.0, 3, 105.0))
+
+    # Two windows on nothing is left of the first
+    clock.now += 60
+    assert storage.get_sliding_window("a", 60) == pytest.approx((3, 45.0, 0, 105.0))
+    clock.now += 60
+    assert storage.get_sliding_window("a", 60) == pytest.approx((0, 0.0, 0, 105.0))
+
+
+def test_sliding_window_rejects_more_than_limit(path, clock):
+    storage = SharedMemoryStorage(f"shm://{path}")
+    assert not storage.acquire_sliding_window_entry("a", 5, 60, amount=6)
+    assert storage.acquire_sliding_window_entry("a", 5, 60, amount=5)
+    assert not storage.acquire_sliding_window_entry("a", 5, 60)
+
+
+def test_sliding_window_limiter(path, clock):
+    limiter = SlidingWindowCounterRateLimiter(SharedMemoryStorage(f"shm://{path}"))
+    limit = parse("3/minute")
+    assert [limiter.hit(limit, "client") for _ in range(4)] == [True] * 3 + [False]
+    assert limiter.test(limit, "other")
+    assert limiter.get_window_stats(limit, "client").remaining == 0
+
+
+def _incr_many(path: str, hits: int) -> int:
+    storage = SharedMemoryStorage(f"shm://{path}")
+    for _ in range(hits):
+        storage.incr("shared", 60)
+    return storage.get("shared")
+
+
+def _acquire_many(path: str, attempts: int) -> int:
+    storage = SharedMemoryStorage(f"shm://{path}")
+    return sum(
+        storage.acquire_sliding_window_entry("shared", 300, 60) for _ in range(attempts)
+    )
+
+
+def test_processes_share_counters(path, clock):
+    # Forked workers open their own storage on the file and inherit the clock
+    with multiprocessing.get_context("fork").Pool(2) as pool:
+        pool.starmap(_incr_many, [(path, 500)] * 2)
+    assert SharedMemoryStorage(f"shm://{path}").get("shared") == 1000
+
+
+def test_processes_share_sliding_window(path, clock):
+    with multiprocessing.get_context("fork").Pool(2) as pool:
+        acquired = pool.starmap(_acquire_many, [(path, 200)] * 2)
+    # Checked and incremented under one lock, so no process overshoots
+    assert sum(acquired) == 300
+    assert (
+        SharedMemoryStorage(f"shm://{path}").get_sliding_window("shared", 60)[2] == 300
+    )
@@ -0,0 +1,76 @@
+import pytest
+
+from app.response_cache import ResponseCache
+
+PARAMS = {"limit": 20, "seed": 7, "order": "random", "search": None}
+
+
+def test_etag_is_a_quoted_versioned_tag():
+    etag = ResponseCache.etag(3, "/doctors/", PARAMS)
+    assert etag.startswith('"3-') and etag.endswith('"')
+
+
+def test_etag_ignores_parameter_order_and_none():
+    etag = ResponseCache.etag(3, "/doctors/", PARAMS)
+    reordered = dict(reversed(list(PARAMS.items())))
+    assert ResponseCache.etag(3, "/doctors/", reordered) == etag
+    without_none = {k: v for k, v in PARAMS.items() if v is not None}
+    assert ResponseCache.etag(3, "/doctors/", without_none) == etag
+
+
+@pytest.mark.parametrize(
+    "version,path,params",
+    [
+        (4, "/doctors/", PARAMS),
+        (3, "/doctors/search", PARAMS),
+        (3, "/doctors/", {**PARAMS, "seed": 8}),
+        (3, "/doctors/", {**PARAMS, "search": "cardiology"}),
+        (3, "/doctors/", {**PARAMS, "fields": ["name"]}),
+    ],
+)
+def test_etag_differs_per_response(version, path, params):
+    assert ResponseCache.etag(version, path, params) != ResponseCache.etag(
+        3, "/doctors/", PARAMS
+    )
+
+
+ETAG = '"3-0123456789abcdef"'
+
+
+@pytest.mark.parametrize(
+    "if_none_match",
+    [
+        ETAG,
+        f"W/{ETAG}",
+        f'"3-other", {ETAG}',
+        f'"3-other",W/{ETAG} , "4-other"',
+        "*",
+        '"3-other", *',
+    ],
+)
+def test_matches(if_none_match):
+    assert ResponseCache.matches(ETAG, if_none_match)
+
+
+@pytest.mark.parametrize(
+    "if_none_match",
+    [
+        None,
+        "",
+        '"4-0123456789abcdef"',
+        "3-0123456789abcdef",
+        # The weak indicator is case-sensitive
+        f"w/{ETAG}",
+        '"3-other", "4-other"',
+    ],
+)
+def test_does_not_match(if_none_match):
+    assert not ResponseCache.matches(ETAG, if_none_match)
+
+
+def test_cached_bodies_are_dropped_on_invalidate():
+    cache = ResponseCache(maxsize=2)
+    cache.set(ETAG, b"[]", {"X-Next-Cursor": "abc"})
+    assert cache.get(ETAG) == (b"[]", {"X-Next-Cursor": "abc"})
+    cache.invalidate()
+    assert cache.get(ETAG) is None
@@ -0,0 +1,122 @@
+import itertools
+import random
+from datetime import datetime
+
+import orjson
+import pytest
+
+from app.api.doctors import models, service
+from app.api.doctors.schemas import DoctorOrder
+from app.api.doctors.snapshot import CatalogSnapshot, build_snapshot
+
+SPECIALITIES = [
+    "Cardiology",
+    "ENT",
+    "Gastroenterology",
+    "Gastroenterology & Hepatology",
+    "Neurology",
+]
+CLINICS = ["Square Hospital", "Evercare Hospital", "Labaid"]
+ORDERS = list(DoctorOrder)
+FILTERS = [
+    (None, None),
+    (["gastroenterology"], None),
+    (["Cardiology", "ENT"], None),
+    (["Unknown"], None),
+    (None, "Labaid"),
+    (["neurology"], "Square Hospital"),
+    (None, "Nowhere"),
+]
+FIELDS = [None, "name,speciality", "clinics,data_scrapped_at"]
+
+
+@pytest.fixture(scope="module")
+def snapshot(db_engine, tmp_path_factory):
+    from sqlalchemy.orm import Session
+
+    rng = random.Random(0)
+    with Session(bind=db_engine) as db:
+        for i in range(60):
+            db.add(
+                models.Doctor(
+                    # Each name recurs across specialities, exercising the
+                    # (name, id) tie-break
+                    name=f"Dr. {chr(ord('A') + i // len(SPECIALITIES))}",
+                    speciality=SPECIALITIES[i % len(SPECIALITIES)],
+                    title=f"Title {i}",
+                    location=rng.choice(["Dhaka", None]),
+                    data_scrapped_at=datetime(2025, 1, 1 + i % 28),
+                    clinics=rng.sample(CLINICS, rng.randrange(3)),
+                    chambers=[],
+                    random_key=rng.random(),
+                )
+            )
+        db.flush()
+        service.sync_specialities(db)
+        db.commit()
+        path = str(tmp_path_factory.mktemp("snapshot") / "catalog.snapshot")
+        build_snapshot(db, path)
+    return CatalogSnapshot(path)
+
+
+def db_page(db, **listing):
+    rows, next_cursor = service.get_doctors(db, **listing)
+    return orjson.loads(
+        service.encode_doctor_rows(rows, listing["fields"])
+    ), next_cursor
+
+
+def snapshot_page(snapshot, **listing):
+    body, next_cursor = snapshot.page(**listing)
+    return orjson.loads(body), next_cursor
+
+
+@pytest.mark.parametrize("order", ORDERS)
+@pytest.mark.parametrize("specializations,clinic", FILTERS)
+@pytest.mark.parametrize("fields", FIELDS)
+def test_offset_pages_match_database(
+    db, snapshot, order, specializations, clinic, fields
+):
+    for seed, skip, limit in itertools.product((0, 7), (0, 3, 55, 200), (1, 4, 100)):
+        listing = {
+            "skip": skip,
+            "limit": limit,
+            "specializations": specializations,
+            "seed": seed,
+            "order": order,
+            "clinic": clinic,
+            "fields": service.parse_fields(fields),
+        }
+        assert snapshot_page(snapshot, **listing) == db_page(db, **listing), listing
+
+
+@pytest.mark.parametrize("order", ORDERS)
+@pytest.mark.parametrize("specializations,clinic", FILTERS)
+def test_cursor_walks_match_database(db, snapshot, order, specializations, clinic):
+    listing = {
+        "limit": 7,
+        "specializations": specializations,
+        "seed": 11,
+        "order": order,
+        "clinic": clinic,
+        "fields": service.parse_fields("name"),
+    }
+    seen = []
+    cursor = None
+    while True:
+        expected = db_page(db, cursor=cursor, **listing)
+        # The snapshot continues from cursors the database issued
+        assert snapshot_page(snapshot, cursor=cursor, **listing) == expected
+        page, cursor = expected
+        seen += [doctor["id"] for doctor in page]
+        if cursor is None:
+            break
+    # Every matching doctor once
+    everything = db_page(db, skip=0, **{**listing, "limit": 1000})[0]
+    assert sorted(seen) == sorted(doctor["id"] for doctor in everything)
+
+
+def test_unusable_cursors_fall_back_to_database(snapshot):
+    assert snapshot.page(cursor="not-a-cursor") is None
+    missing = service.encode_cursor([DoctorOrder.name.value, "Dr. Z", 10_000])
+    assert snapshot.page(cursor=missing) is None
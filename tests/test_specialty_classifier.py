@@ -0,0 +1,86 @@
+import pytest
+
+from app.config.specialty_matching import LOCAL_CLASSIFIER_THRESHOLD
+from app.specialty_classifier import AhoCorasick, SpecialtyClassifier
+from app.symptoms_matcher import local_classifier, match_specialization_locally
+
+
+def found(matcher: AhoCorasick, text: str):
+    return [matcher.patterns[i] for i in matcher.find(text)]
+
+
+def test_matcher_prefers_longest_of_overlapping_patterns():
+    matcher = AhoCorasick(["chest", "chest pain", "pain"])
+    assert found(matcher, "chest pain") == ["chest pain"]
+    assert found(matcher, "chest and pain") == ["chest", "pain"]
+
+
+def test_matcher_resolves_overlaps_leftmost_first():
+    matcher = AhoCorasick(["cd ef", "ab cd"])
+    assert found(matcher, "ab cd ef") == ["ab cd"]
+
+
+def test_matcher_shares_suffixes_through_failure_links():
+    matcher = AhoCorasick(["he", "she", "hers", "his"])
+    assert found(matcher, "she his hers") == ["she", "his", "hers"]
+
+
+@pytest.mark.parametrize("text", ["ushers", "heal", "the", "this", "ahe"])
+def test_matcher_matches_whole_words_only(text):
+    matcher = AhoCorasick(["he", "hers", "his"])
+    assert found(matcher, text) == []
+
+
+def test_matcher_accepts_punctuation_as_word_boundary():
+    matcher = AhoCorasick(["ear"])
+    assert found(matcher, "ear, nose") == ["ear"]
+    assert found(matcher, "nearby") == []
+
+
+@pytest.mark.parametrize("text", ["", "   ", "!!!"])
+def test_empty_queries_match_nothing(text):
+    assert local_classifier.classify(text) == []
+    assert match_specialization_locally(text) is None
+
+
+@pytest.mark.parametrize("text", ["the", "of and the", "asdkjasd", "qwzx vbnm"])
+def test_stop_words_and_gibberish_are_not_confident(text):
+    assert all(
+        score < LOCAL_CLASSIFIER_THRESHOLD
+        for _, score in local_classifier.classify(text)
+    )
+    assert match_specialization_locally(text) is None
+
+
+def test_synonym_hit_is_confident():
+    ranked = local_classifier.classify("I have chest pain")
+    assert ranked[0][0] == "Cardiology"
+    assert ranked[0][1] >= LOCAL_CLASSIFIER_THRESHOLD
+    assert match_specialization_locally("I have chest pain") == "Cardiology"
+
+
+def test_results_are_ordered_by_confidence():
+    ranked = local_classifier.classify("fever and kidney stone", top_k=5)
+    scores = [score for _, score in ranked]
+    assert scores == sorted(scores, reverse=True)
+    assert all(0 < score <= 1 for score in scores)
+    assert {name for name, _ in ranked[:2]} == {"Internal Medicine", "Urology"}
+
+
+def test_more_synonym_hits_score_higher():
+    classifier = SpecialtyClassifier(
+        ["Cardiology", "Neurology"],
+        {"Cardiology": ("chest pain", "palpitations"), "Neurology": ("headache",)},
+    )
+    ranked = classifier.classify("chest pain with palpitations and a headache")
+    assert [name for name, _ in ranked] == ["Cardiology", "Neurology"]
+    assert ranked[0][1] > ranked[1][1]
+
+
+def test_trigrams_tolerate_typos():
+    ranked = local_classifier.classify("opthalmology")
+    assert ranked[0][0] == "Ophthalmology"
+
+
+def test_top_k_limits_results():
+    assert len(local_classifier.classify("chest pain and cough", top_k=1)) == 1